@@ -0,0 +1,79 @@
+"""
+Description file write benchmark
+Saves N descriptions with C concurrent writers through FileService in each
+FILE_WRITE_MODE, plus a per-file durable baseline (fsync file, rename,
+fsync directory for every save), into a temp directory on the target disk
+
+    python benchmarks/bench_file_writes.py --count 2000 --concurrency 64 --dir /var/tmp
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.abspath(os.path.join(BENCH_DIR, "..", "src")))
+
+from services import file_service
+from services.file_service import FileService
+
+
+CONTENT = "Role Overview\n" + "Responsible for building and operating backend services. " * 40
+
+
+async def per_file_durable(service: FileService, job_id: str, content: str) -> None:
+    """What durable writes cost without group commit"""
+    path = service._get_file_path(job_id)
+    loop = asyncio.get_running_loop()
+    executor = file_service._write_executor()
+    await loop.run_in_executor(executor, file_service._write_replace, path, content.encode("utf-8"), True)
+    await loop.run_in_executor(executor, file_service._fsync_dir, service.base_dir)
+
+
+async def run(mode: str, base_dir: str, count: int, concurrency: int) -> dict:
+    service = FileService(base_dir)
+    if mode != "per-file-durable":
+        os.environ["FILE_WRITE_MODE"] = mode
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def save(i: int) -> None:
+        async with semaphore:
+            if mode == "per-file-durable":
+                await per_file_durable(service, f"job-{i}", CONTENT)
+            else:
+                await service.save_job_description(f"job-{i}", CONTENT)
+
+    started = time.perf_counter()
+    await asyncio.gather(*[save(i) for i in range(count)])
+    elapsed = time.perf_counter() - started
+    return {"mode": mode, "count": count, "seconds": round(elapsed, 3), "writes_per_s": round(count / elapsed)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark FileService write modes")
+    parser.add_argument("--count", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--modes", default="direct,atomic,durable,per-file-durable")
+    parser.add_argument("--dir", default=None, help="Parent directory for the temp dirs (pick the disk to test)")
+    parser.add_argument("--json", help="Write the JSON report to this path")
+    args = parser.parse_args()
+
+    results = []
+    for mode in [m.strip() for m in args.modes.split(",") if m.strip()]:
+        with tempfile.TemporaryDirectory(dir=args.dir) as base_dir:
+            results.append(asyncio.run(run(mode, base_dir, args.count, args.concurrency)))
+
+    print(f"{'mode':<18}{'writes':>8}{'seconds':>10}{'writes/s':>12}")
+    for r in results:
+        print(f"{r['mode']:<18}{r['count']:>8}{r['seconds']:>10.3f}{r['writes_per_s']:>12,}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"schema": "file-write-bench/v1", "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
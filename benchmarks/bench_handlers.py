@@ -0,0 +1,337 @@
+"""
+Per-handler micro-benchmarks
+Runs every step handler against the in-memory FakeContext at several state
+sizes and reports per-call cost in pytest-benchmark style (min/max/mean/
+stddev/median/iqr/ops), as a table or JSON
+
+    python benchmarks/bench_handlers.py --sizes 0,100,1000,10000 --json handlers.json
+    python benchmarks/bench_handlers.py -k list_jobs --state-latency-us 200
+"""
+import argparse
+import asyncio
+import importlib.util
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Optional
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+SRC_DIR = os.path.abspath(os.path.join(BENCH_DIR, "..", "src"))
+sys.path.insert(0, BENCH_DIR)
+sys.path.insert(0, SRC_DIR)
+
+from fake_context import FakeContext, FakeState, make_job, make_todo
+from models.records import Job, Todo
+from services.gemini_service import GenerationResult
+
+
+VALID_JOB = {
+    "role": "Senior Software Engineer",
+    "description": "Looking for an experienced backend developer to build scalable microservices using Node.js and TypeScript with AWS.",
+    "yoe": 5,
+    "comp": "$120k - $150k"
+}
+
+
+# --legacy-records seeds state with the pre-record dict values (before/after runs)
+LEGACY_RECORDS = False
+
+
+def job_value(job: dict):
+    return job if LEGACY_RECORDS else Job.from_state(job).to_state()
+
+
+def todo_value(todo: dict):
+    return todo if LEGACY_RECORDS else Todo.from_state(todo).to_state()
+
+
+class FakeGemini:
+    """Instant generation so the benchmark measures the handler, not the model"""
+
+    async def generate_job_description(self, role, description, yoe, comp=None, deadline_at=None):
+        text = f"Role Overview:\nWe are hiring a {role} with {yoe}+ years of experience.\n" * 20
+        return GenerationResult(text=text, model="fake", attempts=["fake"])
+
+
+def load_step(relative_path: str):
+    """Import a step module from src/ by path (step files are not packages)"""
+    path = os.path.join(SRC_DIR, relative_path)
+    name = "bench_" + relative_path.replace(os.sep, "_").replace("/", "_")[:-3]
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def seed_jobs(state: FakeState, size: int) -> None:
+    rng = random.Random(size)
+    state.seed("jobs", {job["job_id"]: job_value(job) for job in (make_job(i, rng=rng) for i in range(size))})
+    try:
+        from services.job_index_service import INDEX_GROUP, job_to_row
+        state.seed(INDEX_GROUP, {k: job_to_row(Job.from_state(v)) for k, v in state.groups["jobs"].items()})
+    except ImportError:
+        pass
+
+
+def seed_todos(state: FakeState, size: int) -> None:
+    state.seed("todos", {todo["id"]: todo_value(todo) for todo in (make_todo(i) for i in range(size))})
+
+
+def seed_pending_job(state: FakeState, size: int) -> None:
+    seed_jobs(state, size)
+    job = make_job(size, status="pending")
+    job["job_id"] = "bench-job"
+    state.seed("jobs", {"bench-job": job_value(job)})
+
+
+def _reset_job_index():
+    try:
+        import services.job_index_service as job_index_service
+        job_index_service._index = None
+    except ImportError:
+        pass
+
+
+def _generate_setup(ctx: FakeContext, module) -> dict:
+    job = make_job(0, status="pending")
+    job["job_id"] = "bench-job"
+    ctx.state.groups.setdefault("jobs", {})["bench-job"] = job_value(job)
+    return {"job_id": "bench-job", **VALID_JOB}
+
+
+def _generate_check(ctx: FakeContext, module) -> None:
+    """Fail loudly instead of timing the error path"""
+    status = Job.from_state(ctx.state.groups["jobs"]["bench-job"]).status
+    if status != "completed":
+        raise AssertionError(f"generate_description left bench-job {status}")
+
+
+CASES: List[dict] = [
+    {
+        "name": "create_job",
+        "path": "jobs/create_job_step.py",
+        "seed": seed_jobs,
+        "args": lambda ctx, module: ({"body": dict(VALID_JOB)},),
+    },
+    {
+        "name": "create_job_invalid",
+        "path": "jobs/create_job_step.py",
+        "seed": seed_jobs,
+        "args": lambda ctx, module: ({"body": {"role": "x", "description": "too short", "yoe": -1}},),
+    },
+    {
+        "name": "list_jobs",
+        "path": "jobs/list_jobs_step.py",
+        "seed": seed_jobs,
+        "args": lambda ctx, module: ({"queryParams": {}},),
+    },
+    {
+        "name": "list_jobs_filtered",
+        "path": "jobs/list_jobs_step.py",
+        "seed": seed_jobs,
+        "args": lambda ctx, module: ({"queryParams": {"status": "completed", "yoe_min": "3", "role_prefix": "senior"}},),
+    },
+    {
+        "name": "get_job",
+        "path": "jobs/get_job_step.py",
+        "seed": seed_pending_job,
+        "args": lambda ctx, module: ({"pathParams": {"id": "bench-job"}, "queryParams": {}, "headers": {}},),
+    },
+    {
+        "name": "generate_description",
+        "path": "jobs/generate_description_step.py",
+        "seed": seed_jobs,
+        "patch": lambda module: setattr(module, "create_gemini_service", lambda: FakeGemini()),
+        "args": lambda ctx, module: (_generate_setup(ctx, module),),
+        "check": _generate_check,
+    },
+    {
+        "name": "create_todo",
+        "path": "todos/create_todo_step.py",
+        "seed": seed_todos,
+        "args": lambda ctx, module: ({"body": {"title": "Benchmark", "description": "x"}},),
+    },
+    {
+        "name": "get_todos",
+        "path": "todos/get_todos_step.py",
+        "seed": seed_todos,
+        "args": lambda ctx, module: ({"queryParams": {}},),
+    },
+    {
+        "name": "get_todo",
+        "path": "todos/get_todo_step.py",
+        "seed": lambda state, size: (seed_todos(state, size), state.seed("todos", {"t": todo_value(make_todo(0))})),
+        "args": lambda ctx, module: ({"pathParams": {"id": "t"}},),
+    },
+    {
+        "name": "update_todo",
+        "path": "todos/update_todo_step.py",
+        "seed": lambda state, size: (seed_todos(state, size), state.seed("todos", {"t": todo_value(make_todo(0))})),
+        "args": lambda ctx, module: ({"pathParams": {"id": "t"}, "body": {"completed": True}},),
+    },
+    {
+        "name": "delete_todo",
+        "path": "todos/delete_todo_step.py",
+        "seed": seed_todos,
+        "args": lambda ctx, module: (
+            ctx.state.groups.setdefault("todos", {}).update({"t": todo_value(make_todo(0))}) or {"pathParams": {"id": "t"}},
+        ),
+    },
+    {
+        "name": "hello_api",
+        "path": "hello/hello_api_step.py",
+        "seed": None,
+        "args": lambda ctx, module: ({"queryParams": {}, "headers": {}},),
+    },
+    {
+        "name": "post_greeting",
+        "path": "hello/post_api_step.py",
+        "seed": None,
+        "args": lambda ctx, module: ({"body": {"name": "bench"}},),
+    },
+    {
+        "name": "process_greeting",
+        "path": "hello/process_greeting_step.py",
+        "seed": None,
+        "args": lambda ctx, module: ({
+            "timestamp": "2025-01-01T00:00:00+00:00",
+            "appName": "Bench",
+            "greetingPrefix": "Hello",
+            "requestId": "bench01"
+        },),
+    },
+]
+
+
+def summarize(samples_ns: List[int]) -> Dict[str, float]:
+    """pytest-benchmark style stats, in microseconds"""
+    us = sorted(s / 1000.0 for s in samples_ns)
+    quartiles = statistics.quantiles(us, n=4) if len(us) >= 2 else [us[0]] * 3
+    mean = statistics.fmean(us)
+    return {
+        "rounds": len(us),
+        "min_us": round(us[0], 3),
+        "max_us": round(us[-1], 3),
+        "mean_us": round(mean, 3),
+        "stddev_us": round(statistics.stdev(us), 3) if len(us) > 1 else 0.0,
+        "median_us": round(statistics.median(us), 3),
+        "iqr_us": round(quartiles[2] - quartiles[0], 3),
+        "ops": round(1e6 / mean, 1) if mean else None
+    }
+
+
+async def bench_case(case: dict, size: int, args) -> Optional[dict]:
+    try:
+        module = load_step(case["path"])
+    except ImportError as e:
+        return {"skipped": f"import failed: {e}"}
+
+    if case.get("patch"):
+        case["patch"](module)
+
+    latency_s = args.state_latency_us / 1e6 if args.state_latency_us else None
+    state = FakeState(latency=latency_s, json_roundtrip=args.json_roundtrip)
+    if case.get("seed"):
+        case["seed"](state, size)
+    _reset_job_index()
+    ctx = FakeContext(state=state)
+
+    handler: Callable = module.handler
+    samples: List[int] = []
+    started = time.perf_counter()
+    warmup = args.warmup
+
+    while True:
+        call_args = case["args"](ctx, module)
+        t0 = time.perf_counter_ns()
+        await handler(*call_args, ctx)
+        elapsed = time.perf_counter_ns() - t0
+        if case.get("check"):
+            case["check"](ctx, module)
+
+        if warmup > 0:
+            warmup -= 1
+            continue
+        samples.append(elapsed)
+        ctx.emit.events.clear()
+        if len(samples) >= args.max_rounds or (
+            len(samples) >= args.min_rounds and time.perf_counter() - started >= args.min_time
+        ):
+            break
+
+    stats = summarize(samples)
+    stats["state_calls_per_op"] = {
+        op: round(count / (len(samples) + args.warmup), 2) for op, count in state.calls.items()
+    }
+    return stats
+
+
+async def run(args) -> dict:
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    results = []
+    for case in CASES:
+        if args.k and args.k not in case["name"]:
+            continue
+        for size in sizes if case.get("seed") else [0]:
+            stats = await bench_case(case, size, args)
+            results.append({"name": case["name"], "state_size": size, **stats})
+    return {
+        "schema": "handler-microbench/v1",
+        "config": {
+            "sizes": sizes,
+            "state_latency_us": args.state_latency_us,
+            "json_roundtrip": args.json_roundtrip,
+            "legacy_records": args.legacy_records,
+            "min_time_s": args.min_time,
+            "python": sys.version.split()[0]
+        },
+        "results": results
+    }
+
+
+def print_table(report: dict) -> None:
+    header = f"{'handler':<24}{'state':>8}{'rounds':>8}{'min us':>12}{'median us':>12}{'mean us':>12}{'stddev':>10}{'ops/s':>12}"
+    print(header)
+    print("-" * len(header))
+    for r in report["results"]:
+        if "skipped" in r:
+            print(f"{r['name']:<24}{r['state_size']:>8}  skipped ({r['skipped']})")
+            continue
+        print(f"{r['name']:<24}{r['state_size']:>8}{r['rounds']:>8}{r['min_us']:>12.1f}"
+              f"{r['median_us']:>12.1f}{r['mean_us']:>12.1f}{r['stddev_us']:>10.1f}{r['ops']:>12.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-benchmark step handlers with a fake FlowContext")
+    parser.add_argument("--sizes", default="0,100,1000,10000", help="Comma-separated state sizes")
+    parser.add_argument("-k", help="Only run cases whose name contains this string")
+    parser.add_argument("--state-latency-us", type=float, default=0.0, help="Injected latency per state call")
+    parser.add_argument("--json-roundtrip", action="store_true", help="Serialize state values through JSON")
+    parser.add_argument("--min-time", type=float, default=0.5, help="Minimum seconds per case")
+    parser.add_argument("--min-rounds", type=int, default=5)
+    parser.add_argument("--max-rounds", type=int, default=10000)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--legacy-records", action="store_true", help="Seed state with pre-record dict values")
+    parser.add_argument("--json", help="Write the JSON report to this path")
+    args = parser.parse_args()
+
+    global LEGACY_RECORDS
+    LEGACY_RECORDS = args.legacy_records
+
+    output = os.path.abspath(args.json) if args.json else None
+    # Handlers write description files and indexes relative to the cwd
+    os.chdir(tempfile.mkdtemp(prefix="bench-handlers-"))
+    report = asyncio.run(run(args))
+
+    print_table(report)
+    if output:
+        with open(output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
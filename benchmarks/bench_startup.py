@@ -0,0 +1,105 @@
+"""
+Step import-time (cold start) benchmark
+Imports each step module in a fresh interpreter and reports the median
+import time with an empty schema cache (first start after a deploy) and
+with a warm one, plus the cost of importing every step in one process
+
+    python benchmarks/bench_startup.py --runs 5 --json startup.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from typing import Dict, List
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+SRC_DIR = os.path.abspath(os.path.join(BENCH_DIR, "..", "src"))
+
+# Runs in the child interpreter: import the given step files, print ms per file
+CHILD = r"""
+import importlib.util, json, sys, time
+timings = {}
+for i, path in enumerate(sys.argv[1:]):
+    started = time.perf_counter()
+    spec = importlib.util.spec_from_file_location(f"startup_step_{i}", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    timings[path] = (time.perf_counter() - started) * 1000
+print(json.dumps(timings))
+"""
+
+
+def step_files() -> List[str]:
+    paths = []
+    for root, _, files in os.walk(SRC_DIR):
+        paths.extend(os.path.join(root, f) for f in files if f.endswith("_step.py"))
+    return sorted(paths)
+
+
+def run_child(paths: List[str], cache_dir: str) -> Dict[str, float]:
+    env = {**os.environ, "SCHEMA_CACHE_DIR": cache_dir}
+    output = subprocess.run(
+        [sys.executable, "-c", CHILD, *paths],
+        env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def measure(paths: List[str], runs: int, warm: bool) -> Dict[str, List[float]]:
+    samples: Dict[str, List[float]] = {path: [] for path in paths}
+    samples["<all steps>"] = []
+    for _ in range(runs):
+        for path in paths:
+            with tempfile.TemporaryDirectory(prefix="schema-cache-") as cache_dir:
+                if warm:
+                    run_child([path], cache_dir)
+                samples[path].append(run_child([path], cache_dir)[path])
+        with tempfile.TemporaryDirectory(prefix="schema-cache-") as cache_dir:
+            if warm:
+                run_child(paths, cache_dir)
+            samples["<all steps>"].append(sum(run_child(paths, cache_dir).values()))
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure per-step import time in fresh interpreters")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per step and mode")
+    parser.add_argument("-k", help="Only steps whose path contains this string")
+    parser.add_argument("--json", help="Write the JSON report to this path")
+    args = parser.parse_args()
+
+    paths = [p for p in step_files() if not args.k or args.k in p]
+    cold = measure(paths, args.runs, warm=False)
+    warm = measure(paths, args.runs, warm=True)
+
+    results = []
+    for key in [*paths, "<all steps>"]:
+        name = os.path.relpath(key, SRC_DIR) if key in paths else key
+        results.append({
+            "step": name,
+            "cold_median_ms": round(statistics.median(cold[key]), 2),
+            "warm_median_ms": round(statistics.median(warm[key]), 2),
+            "cold_min_ms": round(min(cold[key]), 2),
+            "warm_min_ms": round(min(warm[key]), 2)
+        })
+
+    header = f"{'step':<40}{'cold ms':>12}{'warm ms':>12}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(f"{r['step']:<40}{r['cold_median_ms']:>12.1f}{r['warm_median_ms']:>12.1f}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({
+                "schema": "step-startup/v1",
+                "config": {"runs": args.runs, "python": sys.version.split()[0]},
+                "results": results
+            }, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
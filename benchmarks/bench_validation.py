@@ -0,0 +1,76 @@
+"""
+Request body validation benchmark
+Per-call cost of the cached validators in services/validation_service.py
+for valid and invalid job/todo bodies, on both backends (pydantic-core
+TypeAdapter and the pure-Python fallback)
+
+    python benchmarks/bench_validation.py --json validation.json
+"""
+import argparse
+import json
+import os
+import sys
+import timeit
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.abspath(os.path.join(BENCH_DIR, "..", "src")))
+
+from services.validation_service import get_validator
+
+
+DESCRIPTION = "Looking for an experienced backend developer to build scalable microservices using Node.js and TypeScript with AWS."
+
+PAYLOADS = {
+    "job": {
+        "valid": {"role": "Senior Software Engineer", "description": DESCRIPTION, "yoe": 5, "comp": "$120k - $150k"},
+        "invalid": {"role": "  ", "description": "too short", "yoe": -1, "comp": 5},
+    },
+    "todo": {
+        "valid": {"title": "Write benchmark", "description": "validation", "completed": False},
+        "invalid": {"title": "", "completed": "yes"},
+    },
+    "todo_update": {
+        "valid": {"completed": True},
+        "invalid": {"title": "", "completed": 1},
+    },
+}
+
+
+def bench(validator, body, min_time: float) -> dict:
+    timer = timeit.Timer(lambda: validator(body))
+    number, _ = timer.autorange()
+    runs = timer.repeat(repeat=max(3, int(min_time / 0.2)), number=number)
+    best = min(runs) / number
+    return {"calls_per_run": number, "best_ns": round(best * 1e9, 1), "ops": round(1 / best)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark cached request body validators")
+    parser.add_argument("--backends", default="pydantic,python", help="Comma-separated: pydantic, python")
+    parser.add_argument("--min-time", type=float, default=1.0, help="Approximate seconds per case")
+    parser.add_argument("--json", help="Write the JSON report to this path")
+    args = parser.parse_args()
+
+    results = []
+    for backend in [b.strip() for b in args.backends.split(",") if b.strip()]:
+        for name, payloads in PAYLOADS.items():
+            try:
+                validator = get_validator(name, backend)
+            except RuntimeError as e:
+                print(f"skipping {backend}: {e}")
+                break
+            for kind, body in payloads.items():
+                results.append({"backend": backend, "body": name, "payload": kind,
+                                **bench(validator, body, args.min_time)})
+
+    print(f"{'backend':<10}{'body':<14}{'payload':<10}{'ns/call':>12}{'ops/s':>14}")
+    for r in results:
+        print(f"{r['backend']:<10}{r['body']:<14}{r['payload']:<10}{r['best_ns']:>12.0f}{r['ops']:>14,}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"schema": "validation-bench/v1", "python": sys.version.split()[0], "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""
+In-memory stand-in for the Motia FlowContext
+Lets step handlers run in isolation (benchmarks, local experiments) with an
+in-memory state store that can inject latency, a recording emitter and a
+no-op logger
+"""
+import asyncio
+import copy
+import json
+import random
+import uuid
+from typing import Any, Callable, Dict, List, Optional, Union
+
+
+Latency = Union[None, float, Callable[[], float]]
+
+
+class FakeState:
+    """
+    Async state store with the same surface as context.state
+
+    Values are deep-copied on set/get (round-tripped through JSON when
+    json_roundtrip=True) so handlers can't share mutable objects with the
+    store, mirroring the serialization a real adapter does.
+    """
+
+    def __init__(self, latency: Latency = None, json_roundtrip: bool = False):
+        self.groups: Dict[str, Dict[str, Any]] = {}
+        self.latency = latency
+        self.json_roundtrip = json_roundtrip
+        self.calls: Dict[str, int] = {}
+
+    async def _delay(self, op: str) -> None:
+        self.calls[op] = self.calls.get(op, 0) + 1
+        delay = self.latency() if callable(self.latency) else self.latency
+        if delay:
+            await asyncio.sleep(delay)
+
+    def _copy(self, value):
+        if value is None:
+            return None
+        if self.json_roundtrip:
+            return json.loads(json.dumps(value))
+        return copy.deepcopy(value)
+
+    async def get(self, group_id: str, key: str):
+        await self._delay("get")
+        return self._copy(self.groups.get(group_id, {}).get(key))
+
+    async def set(self, group_id: str, key: str, value):
+        await self._delay("set")
+        self.groups.setdefault(group_id, {})[key] = self._copy(value)
+        return value
+
+    async def delete(self, group_id: str, key: str):
+        await self._delay("delete")
+        return self.groups.get(group_id, {}).pop(key, None)
+
+    async def keys(self, group_id: str) -> List[str]:
+        await self._delay("keys")
+        return list(self.groups.get(group_id, {}).keys())
+
+    async def get_group(self, group_id: str) -> list:
+        await self._delay("get_group")
+        return [self._copy(v) for v in self.groups.get(group_id, {}).values()]
+
+    async def clear(self, group_id: str) -> None:
+        await self._delay("clear")
+        self.groups.pop(group_id, None)
+
+    def seed(self, group_id: str, items: Dict[str, Any]) -> None:
+        """Synchronously preload a group (no latency, no call counting)"""
+        self.groups.setdefault(group_id, {}).update(items)
+
+
+class RecordingEmitter:
+    """Callable emit that records every event"""
+
+    def __init__(self):
+        self.events: List[dict] = []
+
+    async def __call__(self, event: dict) -> None:
+        self.events.append(event)
+
+    def topics(self) -> List[str]:
+        return [event.get("topic") for event in self.events]
+
+
+class NoopLogger:
+    def info(self, *args, **kwargs):
+        pass
+
+    def warn(self, *args, **kwargs):
+        pass
+
+    def warning(self, *args, **kwargs):
+        pass
+
+    def error(self, *args, **kwargs):
+        pass
+
+    def debug(self, *args, **kwargs):
+        pass
+
+
+class FakeContext:
+    def __init__(
+        self,
+        state: Optional[FakeState] = None,
+        emit: Optional[RecordingEmitter] = None,
+        logger: Any = None,
+        trace_id: Optional[str] = None
+    ):
+        self.state = state or FakeState()
+        self.emit = emit or RecordingEmitter()
+        self.logger = logger or NoopLogger()
+        self.trace_id = trace_id or uuid.uuid4().hex
+        self.streams = None
+
+
+def make_job(i: int, status: Optional[str] = None, rng: Optional[random.Random] = None) -> dict:
+    """Job record shaped like CreateJob's"""
+    rng = rng or random
+    timestamp = f"2025-01-01T00:00:00.{i:06d}+00:00"
+    return {
+        "job_id": f"job-{i:07d}",
+        "role": rng.choice(["Senior Software Engineer", "Data Engineer", "Product Designer", "Staff Engineer"]),
+        "description": "Looking for an experienced engineer to build scalable services and collaborate across teams to ship quality products.",
+        "yoe": rng.randint(0, 15),
+        "comp": rng.choice([None, "$120k - $150k"]),
+        "status": status or rng.choice(["pending", "processing", "completed", "failed"]),
+        "created_at": timestamp,
+        "updated_at": timestamp,
+        "file_path": None,
+        "error": None,
+        "reuse": None
+    }
+
+
+def make_todo(i: int) -> dict:
+    """Todo record shaped like CreateTodo's"""
+    timestamp = f"2025-01-01T00:00:00.{i:06d}+00:00"
+    return {
+        "id": f"todo-{i:07d}",
+        "title": f"Todo {i}",
+        "description": "Benchmark todo",
+        "completed": i % 2 == 0,
+        "createdAt": timestamp,
+        "updatedAt": timestamp
+    }
@@ -0,0 +1,217 @@
+"""
+Fake Gemini Server for load testing
+Local stand-in for the Gemini generateContent REST endpoint with configurable
+latency distribution, error rates and output token throughput
+
+Point the app at it with GEMINI_BASE_URL=http://127.0.0.1:8089 (any
+GEMINI_API_KEY value works), e.g.
+
+    python benchmarks/fake_gemini_server.py --latency lognormal:-0.5,0.6 --error-rate 0.01
+"""
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Optional
+
+
+_PATH_RE = re.compile(r"^/[^/]+/models/(?P<model>[^/:]+):generateContent")
+
+_BODY = """Role Overview:
+We are looking for a {role} to join our team and help us build reliable products.
+
+Key Responsibilities:
+{bullets}
+
+Required Qualifications:
+- Proven experience in a similar role
+- Strong communication skills
+- Ability to work in a fast-paced environment
+"""
+
+
+def parse_latency(spec: str) -> Callable[[random.Random], float]:
+    """
+    Parse a latency distribution spec (seconds)
+
+    constant:0.8 | uniform:0.2,1.5 | normal:0.8,0.2 | lognormal:mu,sigma | exponential:mean
+    """
+    kind, _, params = spec.partition(":")
+    values = [float(v) for v in params.split(",") if v]
+
+    if kind == "constant":
+        return lambda rng: values[0]
+    if kind == "uniform":
+        return lambda rng: rng.uniform(values[0], values[1])
+    if kind == "normal":
+        return lambda rng: max(0.0, rng.gauss(values[0], values[1]))
+    if kind == "lognormal":
+        return lambda rng: rng.lognormvariate(values[0], values[1])
+    if kind == "exponential":
+        return lambda rng: rng.expovariate(1.0 / values[0])
+    raise ValueError(f"Unknown latency distribution: {spec}")
+
+
+class FakeGeminiConfig:
+    def __init__(
+        self,
+        latency: str = "constant:0.5",
+        error_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        tokens_per_second: float = 0.0,
+        output_tokens: int = 400,
+        seed: Optional[int] = None
+    ):
+        self.sample_latency = parse_latency(latency)
+        self.latency_spec = latency
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.tokens_per_second = tokens_per_second
+        self.output_tokens = output_tokens
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.stats = {"requests": 0, "ok": 0, "errors": 0, "rate_limited": 0, "in_flight": 0}
+
+
+def _render_text(prompt: str, output_tokens: int) -> str:
+    role_match = re.search(r"Role: (.+)", prompt)
+    role = role_match.group(1).strip() if role_match else "Team Member"
+    # Roughly 4 characters per token, padded with bullet points
+    bullets = []
+    while sum(len(b) for b in bullets) < output_tokens * 4 - 300:
+        bullets.append(f"- Deliver and maintain key initiative #{len(bullets) + 1} across the team")
+    return _BODY.format(role=role, bullets="\n".join(bullets))
+
+
+def make_handler(cfg: FakeGeminiConfig):
+    class FakeGeminiHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):
+            pass
+
+        def _send(self, status: int, payload: dict) -> None:
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path.rstrip("/") == "/stats":
+                with cfg.lock:
+                    return self._send(200, dict(cfg.stats))
+            return self._send(404, {"error": {"code": 404, "message": "Not found"}})
+
+        def do_POST(self):
+            match = _PATH_RE.match(self.path)
+            length = int(self.headers.get("Content-Length") or 0)
+            raw = self.rfile.read(length) if length else b"{}"
+            if not match:
+                return self._send(404, {"error": {"code": 404, "message": "Not found"}})
+
+            with cfg.lock:
+                cfg.stats["requests"] += 1
+                cfg.stats["in_flight"] += 1
+                roll = cfg.rng.random()
+                latency = cfg.sample_latency(cfg.rng)
+
+            try:
+                request = json.loads(raw or b"{}")
+                prompt = "".join(
+                    part.get("text", "")
+                    for content in request.get("contents", [])
+                    for part in content.get("parts", [])
+                )
+                prompt_tokens = max(1, len(prompt) // 4)
+
+                if cfg.tokens_per_second > 0:
+                    latency += cfg.output_tokens / cfg.tokens_per_second
+                time.sleep(latency)
+
+                if roll < cfg.rate_limit_rate:
+                    with cfg.lock:
+                        cfg.stats["rate_limited"] += 1
+                    return self._send(429, {"error": {
+                        "code": 429, "message": "Resource has been exhausted", "status": "RESOURCE_EXHAUSTED"
+                    }})
+                if roll < cfg.rate_limit_rate + cfg.error_rate:
+                    with cfg.lock:
+                        cfg.stats["errors"] += 1
+                    return self._send(500, {"error": {
+                        "code": 500, "message": "Internal error", "status": "INTERNAL"
+                    }})
+
+                with cfg.lock:
+                    cfg.stats["ok"] += 1
+                self._send(200, {
+                    "candidates": [{
+                        "content": {"role": "model", "parts": [{"text": _render_text(prompt, cfg.output_tokens)}]},
+                        "finishReason": "STOP",
+                        "index": 0
+                    }],
+                    "usageMetadata": {
+                        "promptTokenCount": prompt_tokens,
+                        "candidatesTokenCount": cfg.output_tokens,
+                        "totalTokenCount": prompt_tokens + cfg.output_tokens
+                    },
+                    "modelVersion": match.group("model")
+                })
+            finally:
+                with cfg.lock:
+                    cfg.stats["in_flight"] -= 1
+
+    return FakeGeminiHandler
+
+
+def start_server(cfg: FakeGeminiConfig, host: str = "127.0.0.1", port: int = 8089) -> ThreadingHTTPServer:
+    """Start the fake server on a daemon thread and return it"""
+    server = ThreadingHTTPServer((host, port), make_handler(cfg))
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency", default="constant:0.5", help="Latency distribution in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of 500 responses")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Fraction of 429 responses")
+    parser.add_argument("--tokens-per-second", type=float, default=0.0, help="Output token throughput (0 = instant)")
+    parser.add_argument("--output-tokens", type=int, default=400)
+    parser.add_argument("--seed", type=int, default=None)
+
+
+def config_from_args(args) -> FakeGeminiConfig:
+    return FakeGeminiConfig(
+        latency=args.latency,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        tokens_per_second=args.tokens_per_second,
+        output_tokens=args.output_tokens,
+        seed=args.seed
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local fake Gemini server for load tests")
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(config_from_args(args)))
+    server.daemon_threads = True
+    print(f"Fake Gemini listening on http://{args.host}:{args.port} ({args.latency})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,398 @@
+"""
+End-to-end load test for the job generation pipeline
+Drives POST /jobs at a target rate, polls GET /jobs/:id until every job is
+terminal and writes a machine-readable JSON report
+
+    # 1. fake Gemini (or pass --fake-gemini to start it in this process)
+    python benchmarks/fake_gemini_server.py --latency lognormal:-0.5,0.6
+    # 2. app pointed at it
+    GEMINI_BASE_URL=http://127.0.0.1:8089 GEMINI_API_KEY=fake npm run dev
+    # 3. load
+    python benchmarks/load_test.py --rps 20 --duration 60 --pid <motia pid> -o bench.json
+    # 4. compare two runs
+    python benchmarks/load_test.py --compare before.json after.json
+"""
+import argparse
+import asyncio
+import http.client
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import fake_gemini_server
+
+
+TERMINAL_STATUSES = {"completed", "failed", "timed_out"}
+
+ROLES = ["Senior Software Engineer", "Data Engineer", "Product Designer", "Site Reliability Engineer", "Staff Engineer"]
+_WORDS = ("build scalable services with modern tooling and collaborate closely with product, design and "
+          "infrastructure teams to ship reliable features for customers around the world").split()
+
+
+def make_payload(rng: random.Random) -> dict:
+    words = []
+    while len(" ".join(words)) < 110:
+        words.append(rng.choice(_WORDS))
+    description = ("Looking for an engineer to " + " ".join(words))[:140]
+    payload = {"role": rng.choice(ROLES), "description": description, "yoe": rng.randint(0, 12)}
+    if rng.random() < 0.5:
+        payload["comp"] = f"${rng.randint(80, 200)}k"
+    return payload
+
+
+def percentiles(values: List[float]) -> Dict[str, Optional[float]]:
+    if not values:
+        return {"count": 0, "p50": None, "p90": None, "p95": None, "p99": None, "max": None, "mean": None}
+    ordered = sorted(values)
+
+    def pick(q):
+        return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))], 3)
+
+    return {
+        "count": len(ordered),
+        "p50": pick(0.50),
+        "p90": pick(0.90),
+        "p95": pick(0.95),
+        "p99": pick(0.99),
+        "max": round(ordered[-1], 3),
+        "mean": round(sum(ordered) / len(ordered), 3)
+    }
+
+
+def read_rss_kb(pids: List[int]) -> Optional[int]:
+    """Sum VmRSS of the given pids (and their children when psutil is installed)"""
+    if not pids:
+        return None
+    try:
+        import psutil
+        total = 0
+        for pid in pids:
+            proc = psutil.Process(pid)
+            for p in [proc] + proc.children(recursive=True):
+                try:
+                    total += p.memory_info().rss
+                except psutil.NoSuchProcess:
+                    pass
+        return total // 1024
+    except ImportError:
+        pass
+
+    total = 0
+    for pid in pids:
+        try:
+            with open(f"/proc/{pid}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        total += int(line.split()[1])
+        except OSError:
+            return None
+    return total
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], text=True, stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class ApiClient:
+    """Blocking http.client calls run on a thread pool, one connection per thread"""
+
+    def __init__(self, base_url: str, timeout: float, workers: int):
+        parsed = urlparse(base_url)
+        self.host = parsed.hostname
+        self.port = parsed.port or 80
+        self.timeout = timeout
+        self.pool = ThreadPoolExecutor(max_workers=workers)
+        self._local = threading.local()
+
+    def _request(self, method: str, path: str, body: Optional[dict] = None):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        payload = json.dumps(body).encode("utf-8") if body is not None else None
+        headers = {"Content-Type": "application/json"} if payload else {}
+        try:
+            conn.request(method, path, body=payload, headers=headers)
+            response = conn.getresponse()
+            data = response.read()
+        except (OSError, http.client.HTTPException):
+            conn.close()
+            self._local.conn = None
+            raise
+        try:
+            parsed = json.loads(data) if data else None
+        except ValueError:
+            parsed = None
+        return response.status, parsed
+
+    async def call(self, method: str, path: str, body: Optional[dict] = None):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.pool, self._request, method, path, body)
+
+
+class LoadTest:
+    def __init__(self, args):
+        self.args = args
+        self.client = ApiClient(args.api_url, args.timeout, args.workers)
+        self.rng = random.Random(1 if args.seed is None else args.seed)
+        self.outstanding: Dict[str, float] = {}
+        self.accepted = 0
+        self.create_latency_ms: List[float] = []
+        self.ttc_ms: List[float] = []
+        self.server_ttc_ms: List[float] = []
+        self.statuses: Dict[str, int] = {}
+        self.create_errors: Dict[str, int] = {}
+        self.queue_depth: List[list] = []
+        self.rss_samples: List[list] = []
+        self.first_completion = None
+        self.last_completion = None
+        self.submitting = True
+
+    async def submit(self) -> None:
+        started = time.monotonic()
+        try:
+            status, body = await self.client.call("POST", "/jobs", make_payload(self.rng))
+        except Exception as e:
+            self.create_errors[type(e).__name__] = self.create_errors.get(type(e).__name__, 0) + 1
+            return
+        self.create_latency_ms.append((time.monotonic() - started) * 1000)
+        if status == 201 and body and body.get("job_id"):
+            self.accepted += 1
+            self.outstanding[body["job_id"]] = started
+        else:
+            self.create_errors[str(status)] = self.create_errors.get(str(status), 0) + 1
+
+    async def drive(self) -> int:
+        """Open-loop arrivals: requests are scheduled on the clock, not on completions"""
+        interval = 1.0 / self.args.rps
+        start = time.monotonic()
+        tasks = []
+        sent = 0
+        while time.monotonic() - start < self.args.duration:
+            tasks.append(asyncio.ensure_future(self.submit()))
+            sent += 1
+            next_at = start + sent * interval
+            await asyncio.sleep(max(0.0, next_at - time.monotonic()))
+        await asyncio.gather(*tasks)
+        self.submitting = False
+        return sent
+
+    async def poll_one(self, job_id: str, semaphore: asyncio.Semaphore) -> None:
+        async with semaphore:
+            try:
+                status, body = await self.client.call("GET", f"/jobs/{job_id}")
+            except Exception:
+                return
+        if status != 200 or not body or body.get("status") not in TERMINAL_STATUSES:
+            return
+
+        submitted = self.outstanding.pop(job_id, None)
+        if submitted is None:
+            return
+        now = time.monotonic()
+        self.ttc_ms.append((now - submitted) * 1000)
+        self.statuses[body["status"]] = self.statuses.get(body["status"], 0) + 1
+        self.first_completion = self.first_completion or now
+        self.last_completion = now
+
+        try:
+            created = datetime.fromisoformat(body["created_at"])
+            updated = datetime.fromisoformat(body["updated_at"])
+            self.server_ttc_ms.append((updated - created).total_seconds() * 1000)
+        except (KeyError, TypeError, ValueError):
+            pass
+
+    async def poll(self) -> None:
+        semaphore = asyncio.Semaphore(self.args.poll_concurrency)
+        deadline = None
+        while self.submitting or self.outstanding:
+            if not self.submitting and deadline is None:
+                deadline = time.monotonic() + self.args.drain_timeout
+            if deadline is not None and time.monotonic() > deadline:
+                break
+            await asyncio.gather(*[self.poll_one(j, semaphore) for j in list(self.outstanding)])
+            await asyncio.sleep(self.args.poll_interval)
+
+    async def sample(self, t0: float) -> None:
+        while self.submitting or self.outstanding:
+            elapsed = round(time.monotonic() - t0, 2)
+            depth = None
+            try:
+                status, body = await self.client.call("GET", "/jobs?limit=0")
+                if status == 200 and body:
+                    summary = body.get("summary", {})
+                    depth = summary.get("pending", 0) + summary.get("processing", 0)
+            except Exception:
+                pass
+            self.queue_depth.append([elapsed, depth, len(self.outstanding)])
+            self.rss_samples.append([elapsed, read_rss_kb(self.args.pid)])
+            await asyncio.sleep(self.args.sample_interval)
+
+    async def run(self) -> dict:
+        t0 = time.monotonic()
+        rss_start = read_rss_kb(self.args.pid)
+        sampler = asyncio.ensure_future(self.sample(t0))
+        poller = asyncio.ensure_future(self.poll())
+        sent = await self.drive()
+        await poller
+        self.submitting = False
+        await sampler
+        rss_end = read_rss_kb(self.args.pid)
+
+        completed = sum(self.statuses.values())
+        span = (self.last_completion - t0) if self.last_completion else None
+        rss_values = [kb for _, kb in self.rss_samples if kb is not None]
+
+        return {
+            "schema": "job-pipeline-load-test/v1",
+            "git_commit": git_commit(),
+            "timestamp": datetime.now().astimezone().isoformat(),
+            "host": platform.node(),
+            "config": {
+                "api_url": self.args.api_url,
+                "rps": self.args.rps,
+                "duration_s": self.args.duration,
+                "poll_interval_s": self.args.poll_interval,
+                "seed": self.args.seed,
+                "fake_gemini": {
+                    "latency": self.args.latency,
+                    "error_rate": self.args.error_rate,
+                    "rate_limit_rate": self.args.rate_limit_rate,
+                    "tokens_per_second": self.args.tokens_per_second,
+                    "output_tokens": self.args.output_tokens
+                } if self.args.fake_gemini else None
+            },
+            "requests": {
+                "sent": sent,
+                "accepted": self.accepted,
+                "errors": self.create_errors
+            },
+            "jobs": {
+                "completed": completed,
+                "by_status": self.statuses,
+                "unfinished": len(self.outstanding),
+                "jobs_per_sec": round(completed / span, 3) if span else 0.0
+            },
+            "create_latency_ms": percentiles(self.create_latency_ms),
+            "time_to_completion_ms": percentiles(self.ttc_ms),
+            "server_time_to_completion_ms": percentiles(self.server_ttc_ms),
+            "queue_depth": {
+                "columns": ["elapsed_s", "pending_plus_processing", "client_outstanding"],
+                "samples": self.queue_depth,
+                "max": max((d for _, d, _ in self.queue_depth if d is not None), default=None)
+            },
+            "rss_kb": {
+                "pids": self.args.pid,
+                "start": rss_start,
+                "end": rss_end,
+                "peak": max(rss_values) if rss_values else None,
+                "growth": (rss_end - rss_start) if rss_start is not None and rss_end is not None else None,
+                "samples": self.rss_samples
+            }
+        }
+
+
+COMPARE_METRICS = [
+    ("jobs", "jobs_per_sec", True),
+    ("time_to_completion_ms", "p50", False),
+    ("time_to_completion_ms", "p95", False),
+    ("time_to_completion_ms", "p99", False),
+    ("create_latency_ms", "p50", False),
+    ("create_latency_ms", "p99", False),
+    ("queue_depth", "max", False),
+    ("rss_kb", "growth", False),
+]
+
+
+def compare(before_path: str, after_path: str, tolerance: float) -> int:
+    """Print metric deltas between two reports, exit 1 on regressions beyond tolerance"""
+    with open(before_path) as f:
+        before = json.load(f)
+    with open(after_path) as f:
+        after = json.load(f)
+
+    regressions = 0
+    rows = []
+    for section, key, higher_is_better in COMPARE_METRICS:
+        old = before.get(section, {}).get(key)
+        new = after.get(section, {}).get(key)
+        if old is None or new is None:
+            continue
+        change = (new - old) / old if old else 0.0
+        regressed = (change < -tolerance) if higher_is_better else (change > tolerance)
+        regressions += regressed
+        rows.append({"metric": f"{section}.{key}", "before": old, "after": new,
+                     "change": round(change, 4), "regressed": regressed})
+
+    print(json.dumps({
+        "before": before.get("git_commit"),
+        "after": after.get("git_commit"),
+        "tolerance": tolerance,
+        "metrics": rows
+    }, indent=2))
+    return 1 if regressions else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test POST /jobs -> GenerateJobDescription -> GET /jobs/:id")
+    parser.add_argument("--api-url", default="http://localhost:3000")
+    parser.add_argument("--rps", type=float, default=10.0, help="Target job submissions per second")
+    parser.add_argument("--duration", type=float, default=30.0, help="Submission window in seconds")
+    parser.add_argument("--drain-timeout", type=float, default=120.0, help="Max wait for outstanding jobs")
+    parser.add_argument("--poll-interval", type=float, default=0.5)
+    parser.add_argument("--poll-concurrency", type=int, default=32)
+    parser.add_argument("--sample-interval", type=float, default=1.0)
+    parser.add_argument("--workers", type=int, default=64, help="HTTP client threads")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--pid", type=int, action="append", default=[], help="Server pid(s) to sample RSS from")
+    parser.add_argument("-o", "--output", help="Write the JSON report here (default stdout)")
+    parser.add_argument("--fake-gemini", action="store_true", help="Start the fake Gemini server in-process")
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"), help="Compare two reports")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="Relative change treated as a regression")
+    fake_gemini_server.add_arguments(parser)
+    args = parser.parse_args()
+
+    if args.compare:
+        sys.exit(compare(args.compare[0], args.compare[1], args.tolerance))
+
+    fake = None
+    if args.fake_gemini:
+        fake = fake_gemini_server.start_server(fake_gemini_server.config_from_args(args), args.host, args.port)
+
+    report = asyncio.run(LoadTest(args).run())
+
+    if fake is not None:
+        report["fake_gemini_stats"] = fake_stats(fake)
+        fake.shutdown()
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+        print(f"Wrote {args.output}: {report['jobs']['jobs_per_sec']} jobs/sec, "
+              f"p95 ttc {report['time_to_completion_ms']['p95']} ms")
+    else:
+        print(output)
+
+
+def fake_stats(server) -> dict:
+    conn = http.client.HTTPConnection(*server.server_address[:2], timeout=5)
+    conn.request("GET", "/stats")
+    return json.loads(conn.getresponse().read())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+import os
+import sys
+
+# Add src to path for service imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.greeting_store_service import greeting_stats
+
+
+config = {
+    "name": "GreetingStats",
+    "type": "api",
+    "path": "/hello/stats",
+    "method": "GET",
+    "description": "Rolled-up greeting counts per minute",
+    "emits": [],
+    "flows": ["hello-world-flow"],
+    "responseSchema": {
+        200: {
+            "type": "object",
+            "properties": {
+                "total": {"type": "integer"},
+                "window_minutes": {"type": "integer"},
+                "last_greeting_at": {"type": ["string", "null"]},
+                "per_minute": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "minute": {"type": "string"},
+                            "count": {"type": "integer"}
+                        }
+                    }
+                }
+            }
+        }
+    }
+}
+
+async def handler(req, context):
+    # Reads only the per-minute buckets, never individual greetings
+    stats = await greeting_stats(context.state)
+    return {
+        "status": 200,
+        "body": stats
+    }
@@ -1,34 +1,47 @@
+import sys
 import os
 import random
 import string
 from datetime import datetime, timezone
 
-# Optional: Using Pydantic for validation (remove if not using Pydantic)
-try:
-    from pydantic import BaseModel
+# Add src to path for service imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.schema_cache import load_step_schemas
+
+
+def _build_schemas():
+    """Schemas for the step config (only runs on a schema cache miss)"""
+    # Optional: Using Pydantic for validation (remove if not using Pydantic)
+    try:
+        from pydantic import BaseModel
     
-    class HelloResponse(BaseModel):
-        message: str
-        status: str
-        appName: str
+        class HelloResponse(BaseModel):
+            message: str
+            status: str
+            appName: str
     
-    # If using Pydantic, we can generate the JSON schema
-    response_schema = {
-        200: HelloResponse.model_json_schema()
-    }
-except ImportError:
-    # Without Pydantic, define JSON schema manually
-    response_schema = {
-        200: {
-            "type": "object",
-            "properties": {
-                "message": {"type": "string"},
-                "status": {"type": "string"},
-                "appName": {"type": "string"}
-            },
-            "required": ["message", "status", "appName"]
+        # If using Pydantic, we can generate the JSON schema
+        response_schema = {
+            200: HelloResponse.model_json_schema()
         }
-    }
+    except ImportError:
+        # Without Pydantic, define JSON schema manually
+        response_schema = {
+            200: {
+                "type": "object",
+                "properties": {
+                    "message": {"type": "string"},
+                    "status": {"type": "string"},
+                    "appName": {"type": "string"}
+                },
+                "required": ["message", "status", "appName"]
+            }
+        }
+    return {"response_schema": response_schema}
+
+
+response_schema = load_step_schemas(__file__, _build_schemas)["response_schema"]
 
 config = {
     "name": "HelloAPI",
@@ -1,39 +1,56 @@
-# Optional: Using Pydantic for validation
-try:
-    from pydantic import BaseModel
+import os
+import sys
+
+# Add src to path for service imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.schema_cache import load_step_schemas
+
+
+def _build_schemas():
+    """Schemas for the step config (only runs on a schema cache miss)"""
+    # Optional: Using Pydantic for validation
+    try:
+        from pydantic import BaseModel
     
-    class NameInput(BaseModel):
-        name: str
+        class NameInput(BaseModel):
+            name: str
         
     
-    class GreetingResponse(BaseModel):
-        greeting: str
-        message: str
+        class GreetingResponse(BaseModel):
+            greeting: str
+            message: str
     
-    # Generate JSON schemas from Pydantic models
-    input_schema = NameInput.model_json_schema()
-    response_schema = {
-        200: GreetingResponse.model_json_schema()
-    }
-except ImportError:
-    # Without Pydantic, define JSON schemas manually
-    input_schema = {
-        "type": "object",
-        "properties": {
-            "name": {"type": "string"}
-        },
-        "required": ["name"]
-    }
-    response_schema = {
-        200: {
+        # Generate JSON schemas from Pydantic models
+        input_schema = NameInput.model_json_schema()
+        response_schema = {
+            200: GreetingResponse.model_json_schema()
+        }
+    except ImportError:
+        # Without Pydantic, define JSON schemas manually
+        input_schema = {
             "type": "object",
             "properties": {
-                "greeting": {"type": "string"},
-                "message": {"type": "string"}
+                "name": {"type": "string"}
             },
-            "required": ["greeting", "message"]
+            "required": ["name"]
         }
-    }
+        response_schema = {
+            200: {
+                "type": "object",
+                "properties": {
+                    "greeting": {"type": "string"},
+                    "message": {"type": "string"}
+                },
+                "required": ["greeting", "message"]
+            }
+        }
+    return {"input_schema": input_schema, "response_schema": response_schema}
+
+
+_schemas = load_step_schemas(__file__, _build_schemas)
+input_schema = _schemas["input_schema"]
+response_schema = _schemas["response_schema"]
 
 config = {
     "name": "PostGreeting",
@@ -0,0 +1,23 @@
+import os
+import sys
+
+# Add src to path for service imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.greeting_store_service import prune_greetings
+
+
+config = {
+    "name": "PruneGreetings",
+    "type": "cron",
+    "cron": "*/10 * * * *",
+    "description": "Drops expired greetings and stale per-minute counters",
+    "emits": [],
+    "flows": ["hello-world-flow"]
+}
+
+async def handler(context):
+    # Also removes the one-record-per-request greetings written before retention
+    removed = await prune_greetings(context.state)
+    if removed["greetings"] or removed["stats"]:
+        context.logger.info("Pruned greetings", removed)
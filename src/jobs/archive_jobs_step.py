@@ -0,0 +1,117 @@
+"""
+Archive Jobs Cron Step
+Moves completed/failed/timed-out jobs older than JOB_ARCHIVE_AFTER_DAYS out of the
+jobs state group into the cold archive (see services/archive_service.py),
+so list and index reloads scale with recent volume instead of history
+"""
+import asyncio
+import sys
+import os
+
+# Add src to path for service imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from models.records import Job, ms_to_iso, now_ms
+from services.archive_service import create_archive_service
+from services.job_index_service import load_job_index, unindex_job
+from services.tracing_service import start_trace
+from services.metrics_service import registry as metrics
+from services.profiling_service import profiled
+
+
+ARCHIVABLE_STATUSES = ("completed", "failed", "timed_out")
+
+config = {
+    "name": "ArchiveJobs",
+    "type": "cron",
+    "cron": "15 3 * * *",
+    "description": "Move old finished jobs from state to the cold archive",
+    "emits": [],
+    "flows": ["job-generation"]
+}
+
+
+def _env_flag(name: str) -> bool:
+    return os.environ.get(name, "false").lower() in ("1", "true", "yes")
+
+
+@profiled(config["name"])
+async def handler(context):
+    """
+    Handler for the nightly archive run
+    Writes one segment per run (at most JOB_ARCHIVE_BATCH jobs), then removes
+    the archived jobs from state and the facet index. The segment is durable
+    before anything is deleted, so an interrupted run only leaves jobs in
+    both tiers.
+    """
+    after_days = float(os.environ.get("JOB_ARCHIVE_AFTER_DAYS", "30"))
+    batch = int(os.environ.get("JOB_ARCHIVE_BATCH", "5000"))
+    purge_files = _env_flag("JOB_ARCHIVE_PURGE_FILES")
+    if after_days <= 0:
+        return
+
+    tracer = start_trace(context, "ArchiveJobs")
+    try:
+        cutoff = now_ms() - int(after_days * 86_400_000)
+
+        with tracer.span("index.load"):
+            index = await load_job_index(context.state)
+            candidates = index.select(ARCHIVABLE_STATUSES, created_to=ms_to_iso(cutoff))[:batch]
+
+        jobs = []
+        with tracer.span("state.get", group="jobs", count=len(candidates)):
+            for job_id in candidates:
+                job = Job.from_state(await context.state.get("jobs", job_id))
+                # Re-check against the record, the index row may be stale
+                if job and job.status in ARCHIVABLE_STATUSES and job.updated_at < cutoff:
+                    jobs.append(job)
+
+        if not jobs:
+            tracer.finish(archived=0)
+            return
+
+        archive = create_archive_service()
+        with tracer.span("archive.write", count=len(jobs)):
+            segment = archive.write_segment(jobs)
+
+        file_service = prompt_index = None
+        if purge_files:
+            from services.file_service import create_file_service
+            from services.prompt_index_service import create_prompt_index_service
+            file_service = create_file_service()
+            prompt_index = create_prompt_index_service(context.state)
+
+        with tracer.span("state.delete", group="jobs", count=len(jobs)):
+            for job in jobs:
+                await context.state.delete("jobs", job.job_id)
+                await unindex_job(context.state, job.job_id)
+                metrics.gauge_add("jobs_by_status", -1, status=job.status)
+                if purge_files:
+                    await file_service.delete_job_description(job.job_id)
+                    # Reuse would point at a file that no longer exists
+                    await prompt_index.remove(job.job_id)
+
+        if purge_files:
+            # Deleting job files only dropped references to shared blobs
+            with tracer.span("file.gc"):
+                loop = asyncio.get_running_loop()
+                gc_stats = await loop.run_in_executor(None, file_service.collect_garbage)
+            context.logger.info("Collected unreferenced description blobs", gc_stats)
+
+        metrics.inc("jobs_archived_total", len(jobs))
+        try:
+            await metrics.flush(context.state)
+        except Exception as metrics_error:
+            context.logger.warn("Failed to flush metrics", {"error": str(metrics_error)})
+
+        context.logger.info("Archived jobs", {
+            "segment": segment,
+            "count": len(jobs),
+            "cutoff": ms_to_iso(cutoff),
+            "purged_files": purge_files
+        })
+        tracer.finish(archived=len(jobs), segment=segment)
+
+    except Exception as e:
+        tracer.finish("error", error=str(e))
+        context.logger.error("Failed to archive jobs", {"error": str(e)})
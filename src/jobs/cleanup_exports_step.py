@@ -0,0 +1,44 @@
+"""
+Cleanup Exports Cron Step
+Deletes gzip exports written by GET /exports/jobs?gzip=true once they are
+older than EXPORT_TTL_HOURS, so EXPORT_DIR does not grow without bound
+"""
+import asyncio
+import sys
+import os
+
+# Add src to path for service imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.export_service import export_ttl_s, remove_expired_exports
+from services.profiling_service import profiled
+
+
+config = {
+    "name": "CleanupExports",
+    "type": "cron",
+    "cron": "0 * * * *",
+    "description": "Delete gzip job exports older than EXPORT_TTL_HOURS",
+    "emits": [],
+    "flows": ["job-generation"]
+}
+
+
+@profiled(config["name"])
+async def handler(context):
+    """
+    Handler for the hourly cleanup run
+    Age is taken from the file's mtime, i.e. when the export finished;
+    chunks requested after that are 404, so clients fetch within the TTL.
+    """
+    ttl = export_ttl_s()
+    if ttl <= 0:
+        return
+
+    try:
+        loop = asyncio.get_running_loop()
+        stats = await loop.run_in_executor(None, remove_expired_exports, ttl)
+        if stats["removed"]:
+            context.logger.info("Removed expired exports", stats)
+    except Exception as e:
+        context.logger.error("Failed to remove expired exports", {"error": str(e)})
@@ -1,181 +1,181 @@
 """
 Create Job API Step
-POST /jobs - Creates a new job and triggers description generation
+POST /jobs - Creates a new job and queues description generation
 """
 import uuid
-from datetime import datetime, timezone
-from typing import Optional
+import sys
+import os
 
-try:
-    from pydantic import BaseModel, Field, field_validator
-    
-    class JobInput(BaseModel):
-        role: str = Field(..., min_length=1, description="Job title/role")
-        description: str = Field(..., min_length=100, max_length=150, description="Brief job description")
-        yoe: int = Field(..., ge=0, description="Years of experience required")
-        comp: Optional[str] = Field(None, description="Optional compensation details")
-        
-        @field_validator('role')
-        @classmethod
-        def validate_role(cls, v):
-            if not v or not v.strip():
-                raise ValueError('Role cannot be empty')
-            return v.strip()
-        
-        @field_validator('description')
-        @classmethod
-        def validate_description(cls, v):
-            if len(v) < 100:
-                raise ValueError('Description must be at least 100 characters')
-            if len(v) > 150:
-                raise ValueError('Description must not exceed 150 characters')
-            return v.strip()
-    
-    class JobResponse(BaseModel):
-        job_id: str
-        role: str
-        description: str
-        yoe: int
-        comp: Optional[str]
-        status: str
-        message: str
-        created_at: str
-    
-    class ErrorResponse(BaseModel):
-        error: str
-        details: Optional[dict] = None
-    
-    body_schema = JobInput.model_json_schema()
-    response_schema = {
-        201: JobResponse.model_json_schema(),
-        400: ErrorResponse.model_json_schema()
-    }
-    
-except ImportError:
-    # Fallback without Pydantic
-    body_schema = {
-        "type": "object",
-        "properties": {
-            "role": {"type": "string", "minLength": 1},
-            "description": {"type": "string", "minLength": 100, "maxLength": 150},
-            "yoe": {"type": "integer", "minimum": 0},
-            "comp": {"type": "string"}
-        },
-        "required": ["role", "description", "yoe"]
-    }
-    response_schema = {
-        201: {
-            "type": "object",
-            "properties": {
-                "job_id": {"type": "string"},
-                "role": {"type": "string"},
-                "status": {"type": "string"},
-                "message": {"type": "string"},
-                "created_at": {"type": "string"}
-            }
-        },
-        400: {
-            "type": "object",
-            "properties": {
-                "error": {"type": "string"}
-            }
+# Add src to path for service imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from models.records import Job, ms_to_iso
+from services.admission_service import admit
+from services.gemini_service import estimate_job_tokens
+from services.metrics_service import registry as metrics
+from services.outbox_service import enqueue_job
+from services.usage_service import release, reserve, tenant_from_request
+from services.tracing_service import start_trace
+from services.schema_cache import load_step_schemas
+from services.validation_service import error_response, validate_body
+from services.profiling_service import profiled
+
+
+def _build_schemas():
+    """Schemas for the step config (only runs on a schema cache miss)"""
+    from models.jobs import error_response_schema, job_input_schema, job_response_schema
+    return {
+        "body_schema": job_input_schema(),
+        "response_schema": {
+            201: job_response_schema(),
+            400: error_response_schema(),
+            429: error_response_schema(),
+            503: error_response_schema()
         }
     }
 
 
+_schemas = load_step_schemas(__file__, _build_schemas, depends=["models/jobs.py"])
+body_schema = _schemas["body_schema"]
+response_schema = _schemas["response_schema"]
+
+
 config = {
     "name": "CreateJob",
     "type": "api",
     "path": "/jobs",
     "method": "POST",
-    "description": "Create a new job and trigger description generation",
-    "emits": ["generate-job-description"],
+    "description": "Create a new job and queue description generation",
+    "emits": [],
     "flows": ["job-generation"],
     "bodySchema": body_schema,
     "responseSchema": response_schema
 }
 
 
+@profiled(config["name"])
 async def handler(req, context):
     """
     Handler for creating a new job
-    Validates input, stores in state, emits event for background generation
+    Validates input, applies admission control and the tenant's daily
+    token budget, and writes the job with its generate event to the outbox
+    in one state write; the OutboxFlusher step stores the record and emits
+    the event
     """
+    tracer = start_trace(context, "CreateJob")
+    job_id = None
+    tenant = None
+    budget = None
+    queued = False
     try:
-        body = req.get("body", {})
+        data, errors = validate_body("job", req.get("body"))
+        if errors:
+            return error_response(errors)
         
-        # Validate required fields
-        role = body.get("role", "").strip()
-        description = body.get("description", "").strip()
-        yoe = body.get("yoe")
-        comp = body.get("comp")
-        
-        # Manual validation
-        if not role:
-            return {
-                "status": 400,
-                "body": {"error": "Role is required"}
-            }
-        
-        if not description:
-            return {
-                "status": 400,
-                "body": {"error": "Description is required"}
-            }
+        role = data["role"]
+        description = data["description"]
+        yoe = data["yoe"]
+        comp = data.get("comp")
         
-        if len(description) < 100 or len(description) > 150:
+        # Turn work away while the backlog would outlast the job's deadline
+        tenant = tenant_from_request(req)
+        with tracer.span("admission.check", tenant=tenant):
+            admission = await admit(context.state, tenant)
+        if not admission["allowed"]:
+            context.logger.warn("Job rejected by admission control", {
+                "tenant": tenant,
+                "reason": admission["reason"],
+                "wait_s": admission["wait_s"]
+            })
+            tracer.finish("rejected", tenant=tenant, http_status=admission["status"])
             return {
-                "status": 400,
+                "status": admission["status"],
+                "headers": {"Retry-After": str(admission["retry_after_s"])},
                 "body": {
-                    "error": f"Description must be 100-150 characters (current: {len(description)})"
+                    "error": (
+                        "Too many queued jobs for this tenant"
+                        if admission["reason"] == "tenant_queue" else
+                        "Job queue is over capacity"
+                    ),
+                    "details": {
+                        "reason": admission["reason"],
+                        "tenant": tenant,
+                        "estimated_wait_s": None if admission["wait_s"] is None else round(admission["wait_s"], 1),
+                        "retry_after_s": admission["retry_after_s"]
+                    }
                 }
             }
         
-        if yoe is None or not isinstance(yoe, int) or yoe < 0:
+        # Reserve the job's estimated tokens before anything is queued, so
+        # an over-budget tenant never reaches Gemini
+        estimate = estimate_job_tokens(role, description, yoe, comp)
+        with tracer.span("usage.reserve", tenant=tenant, estimate=estimate):
+            budget = await reserve(context.state, tenant, estimate)
+        if not budget["allowed"]:
+            context.logger.warn("Job rejected by token budget", {
+                "tenant": tenant,
+                "estimate": estimate,
+                "budget": budget["budget"],
+                "spent": budget["spent"]
+            })
+            tracer.finish("rejected", tenant=tenant, http_status=429)
             return {
-                "status": 400,
-                "body": {"error": "Valid years of experience (yoe) is required (must be >= 0)"}
+                "status": 429,
+                "headers": {"Retry-After": str(budget["retry_after_s"])},
+                "body": {
+                    "error": "Daily token budget exceeded",
+                    "details": {
+                        "tenant": tenant,
+                        "budget": budget["budget"],
+                        "spent": budget["spent"],
+                        "estimate": estimate,
+                        "retry_after_s": budget["retry_after_s"]
+                    }
+                }
             }
         
         # Generate unique job ID
         job_id = str(uuid.uuid4())
-        timestamp = datetime.now(timezone.utc).isoformat()
         
-        # Create job object
-        job = {
-            "job_id": job_id,
-            "role": role,
-            "description": description,
-            "yoe": yoe,
-            "comp": comp,
-            "status": "pending",
-            "created_at": timestamp,
-            "updated_at": timestamp,
-            "file_path": None,
-            "error": None
-        }
-        
-        # Store in state (job tracking)
-        await context.state.set("jobs", job_id, job)
+        # Create job record; generation is abandoned after the deadline,
+        # counted from when a deferred job is released
+        job = Job(job_id=job_id, role=role, description=description, yoe=yoe, comp=comp, tenant=tenant)
+        not_before = budget["not_before"]
+        deadline_s = float(os.environ.get("JOB_DEADLINE_S", "300"))
+        if deadline_s > 0:
+            job.deadline_at = max(job.created_at, not_before or 0) + int(deadline_s * 1000)
         
-        context.logger.info("Job created, triggering generation", {
-            "job_id": job_id,
-            "role": role,
-            "yoe": yoe
-        })
-        
-        # Emit event for background processing
-        await context.emit({
-            "topic": "generate-job-description",
-            "data": {
+        # Job record and generate event are stored together, so a crash can
+        # never leave a pending job without its event
+        with tracer.span("outbox.enqueue"):
+            await enqueue_job(context.state, job, "generate-job-description", {
                 "job_id": job_id,
                 "role": role,
                 "description": description,
                 "yoe": yoe,
-                "comp": comp
-            }
+                "comp": comp,
+                "deadline_at": job.deadline_at,
+                "tenant": tenant,
+                "usage_day": budget["day"],
+                "reserved_tokens": budget["reserved"]
+            }, not_before=not_before, cost=estimate)
+        # From here on the generate step settles the reservation
+        queued = True
+        
+        estimated_completion = None
+        if admission["wait_s"] is not None:
+            estimated_completion = max(job.created_at, not_before or 0) + int(admission["wait_s"] * 1000)
+        
+        context.logger.info("Job created, generation queued", {
+            "job_id": job_id,
+            "role": role,
+            "yoe": yoe,
+            "tenant": tenant,
+            "not_before": ms_to_iso(not_before)
         })
         
+        tracer.finish(job_id=job_id, http_status=201)
+        
         # Return immediate response
         return {
             "status": 201,
@@ -186,13 +186,31 @@ async def handler(req, context):
                 "yoe": yoe,
                 "comp": comp,
                 "status": "pending",
-                "message": "Job created successfully. Description generation in progress.",
-                "created_at": timestamp
+                "message": (
+                    "Job created successfully. Description generation in progress."
+                    if not_before is None else
+                    "Job created. Daily token budget reached; generation starts at not_before."
+                ),
+                "created_at": ms_to_iso(job.created_at),
+                "deadline_at": ms_to_iso(job.deadline_at),
+                "tenant": tenant,
+                "not_before": ms_to_iso(not_before),
+                "estimated_completion_at": ms_to_iso(estimated_completion)
             }
         }
         
     except Exception as e:
+        tracer.finish("error", job_id=job_id, error=str(e))
         context.logger.error("Failed to create job", {"error": str(e)})
+        if budget and budget["reserved"] and not queued:
+            # Nothing was queued, so nothing else will return the tokens
+            try:
+                await release(context.state, tenant, budget["day"], budget["reserved"])
+            except Exception as usage_error:
+                context.logger.warn("Failed to release token reservation", {
+                    "tenant": tenant,
+                    "error": str(usage_error)
+                })
         return {
             "status": 400,
             "body": {
@@ -200,3 +218,11 @@ async def handler(req, context):
                 "details": {"message": str(e)}
             }
         }
+    
+    finally:
+        # Admission and budget rejections are counted in this process; the
+        # flush is a no-op when nothing was recorded
+        try:
+            await metrics.flush(context.state)
+        except Exception as metrics_error:
+            context.logger.warn("Failed to flush metrics", {"error": str(metrics_error)})
@@ -0,0 +1,141 @@
+"""
+Download Export API Step
+GET /exports/jobs/:name - Bytes of a gzip export written by ExportJobs
+"""
+import base64
+import sys
+import os
+
+# Add src to path for service imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.export_service import export_path
+from services.log_service import step_logger
+from services.profiling_service import profiled
+
+# Motia API responses are JSON messages, so file bytes are sent base64
+# encoded, at most MAX_CHUNK bytes per request
+MAX_CHUNK = 8 * 1024 * 1024
+
+
+config = {
+    "name": "DownloadExport",
+    "type": "api",
+    "path": "/exports/jobs/:name",
+    "method": "GET",
+    "description": "Download a gzip jobs export in base64 chunks",
+    "emits": [],
+    "flows": ["job-generation"],
+    "queryParams": [
+        {"name": "offset", "description": "First byte to return (default 0)"},
+        {"name": "length", "description": f"Bytes to return (default and max {MAX_CHUNK})"}
+    ],
+    "responseSchema": {
+        200: {
+            "type": "object",
+            "properties": {
+                "name": {"type": "string"},
+                "offset": {"type": "integer"},
+                "length": {"type": "integer"},
+                "total": {"type": "integer"},
+                "encoding": {"type": "string"},
+                "data": {"type": "string"}
+            }
+        },
+        400: {
+            "type": "object",
+            "properties": {
+                "error": {"type": "string"}
+            }
+        },
+        404: {
+            "type": "object",
+            "properties": {
+                "error": {"type": "string"}
+            }
+        },
+        416: {
+            "type": "object",
+            "properties": {
+                "error": {"type": "string"}
+            }
+        }
+    }
+}
+
+# A chunk that does not reach the end of the file has the same shape
+config["responseSchema"][206] = config["responseSchema"][200]
+
+
+def _param(query: dict, name: str):
+    value = query.get(name)
+    if isinstance(value, list):
+        value = value[0] if value else None
+    return value
+
+
+def _read(path: str, offset: int, length: int):
+    with open(path, "rb") as f:
+        total = os.fstat(f.fileno()).st_size
+        f.seek(offset)
+        return f.read(length), total
+
+
+@profiled(config["name"])
+async def handler(req, context):
+    """
+    Handler for export downloads
+    Returns one chunk; the whole file fits in one 200 response up to
+    MAX_CHUNK bytes, larger files are fetched as 206 chunks by offset
+    """
+    log = step_logger(context, "DownloadExport")
+    name = (req.get("pathParams") or {}).get("name")
+    path = export_path(name)
+    if path is None or not os.path.isfile(path):
+        log.finish(http_status=404)
+        return {
+            "status": 404,
+            "body": {"error": f"Export {name} not found"}
+        }
+
+    query = req.get("queryParams") or {}
+    try:
+        offset = int(_param(query, "offset") or 0)
+        length = min(int(_param(query, "length") or MAX_CHUNK), MAX_CHUNK)
+    except (TypeError, ValueError):
+        return {
+            "status": 400,
+            "body": {"error": "offset and length must be integers"}
+        }
+    if offset < 0 or length <= 0:
+        return {
+            "status": 400,
+            "body": {"error": "offset must be >= 0 and length > 0"}
+        }
+
+    data, total = _read(path, offset, length)
+    if offset and offset >= total:
+        log.finish(http_status=416)
+        return {
+            "status": 416,
+            "headers": {"Content-Range": f"bytes */{total}"},
+            "body": {"error": f"offset is past the end of the export ({total} bytes)"}
+        }
+
+    partial = offset > 0 or offset + len(data) < total
+    headers = {"Accept-Ranges": "bytes"}
+    if partial:
+        headers["Content-Range"] = f"bytes {offset}-{offset + len(data) - 1}/{total}"
+    log.finish(http_status=206 if partial else 200, bytes=len(data))
+    return {
+        "status": 206 if partial else 200,
+        "headers": headers,
+        "body": {
+            "name": name,
+            "offset": offset,
+            "length": len(data),
+            "total": total,
+            "encoding": "base64",
+            "data": base64.b64encode(data).decode("ascii")
+        }
+    }
@@ -0,0 +1,192 @@
+"""
+Export Jobs API Step
+GET /exports/jobs - NDJSON export of jobs with their generated content, one
+page per request
+"""
+import sys
+import os
+import time
+import uuid
+
+# Add src to path for service imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from models.records import iso_to_ms
+from services.export_service import DEFAULT_CONCURRENCY, export_dir, export_page, iter_export, write_export
+from services.job_index_service import JOB_STATUSES
+from services.log_service import step_logger
+from services.profiling_service import profiled
+
+DEFAULT_LIMIT = 1000
+MAX_LIMIT = 10000
+
+
+config = {
+    "name": "ExportJobs",
+    "type": "api",
+    "path": "/exports/jobs",
+    "method": "GET",
+    "description": "Export jobs and their generated content as NDJSON",
+    "emits": [],
+    "flows": ["job-generation"],
+    "queryParams": [
+        {"name": "status", "description": "Comma-separated statuses to export (default all)"},
+        {"name": "created_from", "description": "Only jobs created at or after this ISO timestamp / epoch ms"},
+        {"name": "created_to", "description": "Only jobs created before this ISO timestamp / epoch ms"},
+        {"name": "include_content", "description": "true/false - embed description file content (default true)"},
+        {"name": "include_archived", "description": "true/false - include jobs from the cold archive (default false)"},
+        {"name": "limit", "description": f"Jobs per page (default {DEFAULT_LIMIT}, max {MAX_LIMIT})"},
+        {"name": "cursor", "description": "X-Next-Cursor of the previous page"},
+        {"name": "gzip", "description": "true - write the whole export to a gzip file and return its download URL"}
+    ],
+    "responseSchema": {
+        200: {"type": "string"},
+        201: {
+            "type": "object",
+            "properties": {
+                "name": {"type": "string"},
+                "url": {"type": "string"},
+                "count": {"type": "integer"},
+                "bytes": {"type": "integer"}
+            }
+        },
+        400: {
+            "type": "object",
+            "properties": {
+                "error": {"type": "string"}
+            }
+        }
+    }
+}
+
+
+def _param(query_params, name):
+    """Query params may arrive as a string or a list of strings"""
+    value = query_params.get(name)
+    if isinstance(value, list):
+        value = value[0] if value else None
+    if value is None or value == "":
+        return None
+    return value
+
+
+def _flag(query_params, name, default):
+    value = _param(query_params, name)
+    if value is None:
+        return default
+    if str(value).lower() not in ("true", "false", "1", "0"):
+        raise ValueError(f"{name} must be true or false")
+    return str(value).lower() in ("true", "1")
+
+
+def _timestamp(query_params, name):
+    value = _param(query_params, name)
+    if value is None:
+        return None
+    parsed = iso_to_ms(int(value) if str(value).isdigit() else value)
+    if parsed is None:
+        raise ValueError(f"{name} must be an ISO-8601 timestamp or epoch milliseconds")
+    return parsed
+
+
+def _parse_options(query_params):
+    """Parse and validate export parameters, raises ValueError on bad input"""
+    statuses = None
+    status = _param(query_params, "status")
+    if status is not None:
+        statuses = [s.strip() for s in status.split(",") if s.strip()]
+        unknown = [s for s in statuses if s not in JOB_STATUSES]
+        if unknown:
+            raise ValueError(f"Unknown status: {', '.join(unknown)}")
+
+    return {
+        "statuses": statuses,
+        "created_from": _timestamp(query_params, "created_from"),
+        "created_to": _timestamp(query_params, "created_to"),
+        "include_content": _flag(query_params, "include_content", True),
+        "include_archived": _flag(query_params, "include_archived", False),
+        "concurrency": int(os.environ.get("EXPORT_CONCURRENCY", DEFAULT_CONCURRENCY))
+    }
+
+
+def _limit(query_params):
+    value = _param(query_params, "limit")
+    if value is None:
+        return DEFAULT_LIMIT
+    try:
+        limit = int(value)
+    except (TypeError, ValueError):
+        raise ValueError("limit must be an integer")
+    if limit <= 0:
+        raise ValueError("limit must be > 0")
+    return min(limit, MAX_LIMIT)
+
+
+@profiled(config["name"])
+async def handler(req, context):
+    """
+    Handler for exporting jobs
+    Motia hands API responses to the runtime as one JSON message, so the
+    generator cannot be streamed to the client as it is produced. Each
+    request returns one page of at most `limit` lines and the cursor of the
+    next page in X-Next-Cursor, which keeps memory bounded per request.
+    With gzip=true the whole export is streamed into a compressed file
+    under EXPORT_DIR instead, downloaded from GET /exports/jobs/:name.
+    """
+    log = step_logger(context, "ExportJobs")
+    try:
+        query_params = req.get("queryParams", {}) or {}
+        try:
+            options = _parse_options(query_params)
+            compress = _flag(query_params, "gzip", False)
+            limit = _limit(query_params)
+            cursor = _param(query_params, "cursor")
+            if compress and (cursor is not None or _param(query_params, "limit") is not None):
+                raise ValueError("cursor and limit do not apply to gzip exports")
+        except ValueError as e:
+            return {
+                "status": 400,
+                "body": {"error": str(e)}
+            }
+
+        if compress:
+            name = f"jobs-{int(time.time() * 1000)}-{uuid.uuid4().hex[:8]}.ndjson.gz"
+            result = await write_export(
+                iter_export(context.state, **options),
+                os.path.join(export_dir(), name),
+                compress=True
+            )
+            result["url"] = f"/exports/jobs/{name}"
+            log.info("Wrote jobs export", result)
+            log.finish(http_status=201, exported=result["count"])
+            return {
+                "status": 201,
+                "headers": {"Location": result["url"]},
+                "body": result
+            }
+
+        try:
+            lines, next_cursor = await export_page(context.state, limit, cursor, **options)
+        except ValueError as e:
+            return {
+                "status": 400,
+                "body": {"error": str(e)}
+            }
+
+        headers = {"Content-Type": "application/x-ndjson", "X-Export-Count": str(len(lines))}
+        if next_cursor:
+            headers["X-Next-Cursor"] = next_cursor
+        log.info("Exported jobs", lambda: {"count": len(lines), "more": next_cursor is not None})
+        log.finish(http_status=200, exported=len(lines))
+        return {
+            "status": 200,
+            "headers": headers,
+            "body": "".join(lines)
+        }
+
+    except Exception as e:
+        log.error("Failed to export jobs", {"error": str(e)})
+        return {
+            "status": 500,
+            "body": {"error": str(e)}
+        }
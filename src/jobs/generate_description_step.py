@@ -2,43 +2,33 @@
 Generate Job Description Event Step
 Background processor that generates job descriptions using Gemini AI
 """
-from datetime import datetime, timezone
 import sys
 import os
 
 # Add src to path for service imports
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from services.gemini_service import create_gemini_service
-from services.file_service import create_file_service
+from models.records import Job, now_ms
+from services.gemini_service import DeadlineExceeded, create_gemini_service
+from services.file_service import content_digest, create_file_service
+from services.job_index_service import index_job
+from services.fair_queue_service import release_inflight
+from services.usage_service import settle as settle_usage
+from services.prompt_index_service import create_prompt_index_service, adapt_content
+from services.vector_index_service import create_vector_index_service, is_available as vector_index_available
+from services.tracing_service import start_trace
+from services.metrics_service import registry as metrics
+from services.profiling_service import profiled
+from services.schema_cache import load_step_schemas
 
-try:
-    from pydantic import BaseModel
-    from typing import Optional
-    
-    class GenerateJobInput(BaseModel):
-        job_id: str
-        role: str
-        description: str
-        yoe: int
-        comp: Optional[str] = None
-    
-    input_schema = GenerateJobInput.model_json_schema()
-    
-except ImportError:
-    input_schema = {
-        "type": "object",
-        "properties": {
-            "job_id": {"type": "string"},
-            "role": {"type": "string"},
-            "description": {"type": "string"},
-            "yoe": {"type": "integer"},
-            "comp": {"type": "string"}
-        },
-        "required": ["job_id", "role", "description", "yoe"]
-    }
+def _build_schemas():
+    """Schemas for the step config (only runs on a schema cache miss)"""
+    from models.jobs import generate_job_input_schema
+    return {"input_schema": generate_job_input_schema()}
 
 
+input_schema = load_step_schemas(__file__, _build_schemas, depends=["models/jobs.py"])["input_schema"]
+
 config = {
     "name": "GenerateJobDescription",
     "type": "event",
@@ -50,6 +40,41 @@ config = {
 }
 
 
+async def _mark_timed_out(context, job: Job, stage: str) -> None:
+    """Record a job whose deadline passed; no result will be produced for it"""
+    metrics.transition(job.status, "timed_out")
+    metrics.observe("job_time_to_completion_seconds", (now_ms() - job.created_at) / 1000, status="timed_out")
+    metrics.inc("jobs_timed_out_total", stage=stage)
+    job.touch("timed_out")
+    job.error = f"Deadline exceeded while {stage}"
+    await context.state.set("jobs", job.job_id, job.to_state())
+    await index_job(context.state, job)
+    context.logger.warn("Job deadline exceeded", {"job_id": job.job_id, "stage": stage})
+
+
+async def _release(context, input_data: dict, prompt_tokens: int = 0, output_tokens: int = 0) -> None:
+    """
+    Free the job's in-flight slot and replace its token reservation with
+    the tokens used (never fails the job)
+    """
+    try:
+        await release_inflight(context.state, input_data.get("job_id"))
+        await settle_usage(
+            context.state,
+            input_data.get("tenant"),
+            input_data.get("usage_day"),
+            reserved=input_data.get("reserved_tokens") or 0,
+            prompt_tokens=prompt_tokens,
+            output_tokens=output_tokens
+        )
+    except Exception as usage_error:
+        context.logger.warn("Failed to record token usage", {
+            "job_id": input_data.get("job_id"),
+            "error": str(usage_error)
+        })
+
+
+@profiled(config["name"])
 async def handler(input_data, context):
     """
     Handler for generating job descriptions
@@ -60,6 +85,10 @@ async def handler(input_data, context):
     description = input_data.get("description")
     yoe = input_data.get("yoe")
     comp = input_data.get("comp")
+    deadline_at = input_data.get("deadline_at")
+    
+    tracer = start_trace(context, "GenerateJobDescription", job_id=job_id)
+    released = False
     
     context.logger.info("Starting job description generation", {
         "job_id": job_id,
@@ -68,36 +97,106 @@ async def handler(input_data, context):
     
     try:
         # Get job from state
-        job = await context.state.get("jobs", job_id)
+        with tracer.span("state.get", group="jobs"):
+            job = Job.from_state(await context.state.get("jobs", job_id))
         
         if not job:
             context.logger.error("Job not found in state", {"job_id": job_id})
+            # Nothing will run for this event: hand back its slot and tokens
+            await _release(context, input_data)
+            tracer.finish("not_found")
+            return
+        
+        # The outbox delivers at least once; a redelivered event for a job
+        # that is already processing or finished is a no-op
+        if job.status != "pending":
+            context.logger.info("Skipping duplicate generation event", {
+                "job_id": job_id,
+                "status": job.status
+            })
+            if job.status in ("completed", "failed", "timed_out"):
+                # A republished outbox entry marked it in flight again
+                await release_inflight(context.state, job_id)
+            tracer.finish("duplicate")
+            return
+        
+        # Nobody is waiting for an expired job: drop it before any work
+        job.deadline_at = deadline_at = deadline_at or job.deadline_at
+        if job.expired():
+            await _mark_timed_out(context, job, "queued")
+            await _release(context, input_data)
+            tracer.finish("timed_out", stage="queued")
             return
         
+        # Time between CreateJob and this handler picking the event up
+        tracer.record("queue.wait", job.created_at / 1000, tracer.started_at)
+        
         # Update status to processing
-        job["status"] = "processing"
-        job["updated_at"] = datetime.now(timezone.utc).isoformat()
-        await context.state.set("jobs", job_id, job)
-        
-        # Generate job description using Gemini
-        context.logger.info("Calling Gemini API", {"job_id": job_id})
-        gemini_service = create_gemini_service()
-        
-        generated_content = await gemini_service.generate_job_description(
-            role=role,
-            description=description,
-            yoe=yoe,
-            comp=comp
-        )
+        metrics.transition(job.status, "processing")
+        job.touch("processing")
+        with tracer.span("state.set", group="jobs", status="processing"):
+            await context.state.set("jobs", job_id, job.to_state())
+            await index_job(context.state, job)
+        
+        file_service = create_file_service()
+        prompt_index = create_prompt_index_service(context.state)
+        generated_content = None
+        reuse = None
+        model = None
+        usage = None
+        
+        # Reuse a prior generation for near-duplicate submissions
+        if prompt_index.enabled:
+            with tracer.span("prompt_index.lookup"):
+                match = await prompt_index.find_similar(role, description, yoe, comp, exclude=job_id)
+            metrics.inc("cache_lookups_total", cache="prompt_reuse", result="hit" if match else "miss")
+            if match:
+                with tracer.span("file.read", source_job_id=match.job_id):
+                    source_content = await file_service.read_job_description(match.job_id)
+                if source_content and prompt_index.mode == "adapt":
+                    # None when the source cannot be adapted: generate instead
+                    generated_content = adapt_content(source_content, match, role, yoe, comp)
+                elif source_content:
+                    generated_content = source_content
+                if generated_content is not None:
+                    reuse = {
+                        "source_job_id": match.job_id,
+                        "similarity": round(match.similarity, 4),
+                        "mode": prompt_index.mode
+                    }
+                    context.logger.info("Reusing prior generation", {"job_id": job_id, **reuse})
+        
+        if generated_content is None:
+            # Generate job description using Gemini
+            context.logger.info("Calling Gemini API", {"job_id": job_id})
+            with tracer.span("gemini.generate"):
+                gemini_service = create_gemini_service()
+                
+                result = await gemini_service.generate_job_description(
+                    role=role,
+                    description=description,
+                    yoe=yoe,
+                    comp=comp,
+                    deadline_at=deadline_at
+                )
+            generated_content = result.text
+            model = result.model
+            usage = {"prompt_tokens": result.prompt_tokens, "output_tokens": result.output_tokens}
+            if len(result.attempts) > 1:
+                context.logger.warn("Gemini fell back to another model", {
+                    "job_id": job_id,
+                    "attempts": result.attempts
+                })
         
         context.logger.info("Job description generated", {
             "job_id": job_id,
+            "model": model,
             "content_length": len(generated_content)
         })
         
         # Save to file system
-        file_service = create_file_service()
-        file_path = await file_service.save_job_description(job_id, generated_content)
+        with tracer.span("file.write", bytes=len(generated_content.encode("utf-8"))):
+            file_path = await file_service.save_job_description(job_id, generated_content)
         
         context.logger.info("Job description saved to file", {
             "job_id": job_id,
@@ -105,18 +204,68 @@ async def handler(input_data, context):
         })
         
         # Update job status to completed
-        job["status"] = "completed"
-        job["file_path"] = file_path
-        job["updated_at"] = datetime.now(timezone.utc).isoformat()
-        job["error"] = None
-        await context.state.set("jobs", job_id, job)
+        metrics.transition(job.status, "completed")
+        metrics.observe("job_time_to_completion_seconds", (now_ms() - job.created_at) / 1000, status="completed")
+        job.touch("completed")
+        job.file_path = file_path
+        job.content_hash = content_digest(generated_content)
+        job.error = None
+        job.reuse = reuse
+        job.model = model
+        job.usage = usage
+        with tracer.span("state.set", group="jobs", status="completed"):
+            await context.state.set("jobs", job_id, job.to_state())
+            await index_job(context.state, job)
+        
+        with tracer.span("usage.release"):
+            await _release(context, input_data, **(usage or {}))
+        released = True
+        
+        # Make this generation available to later near-duplicate submissions
+        # (the job is already completed, so index failures must not fail it)
+        if prompt_index.enabled:
+            try:
+                with tracer.span("prompt_index.add"):
+                    await prompt_index.add(job_id, role, description, yoe, comp)
+            except Exception as index_error:
+                context.logger.warn("Failed to update prompt index", {
+                    "job_id": job_id,
+                    "error": str(index_error)
+                })
+        
+        # Incrementally update the similar-jobs vector index
+        if vector_index_available():
+            try:
+                with tracer.span("vector_index.add"):
+                    await create_vector_index_service().add(job_id, generated_content)
+            except Exception as index_error:
+                context.logger.warn("Failed to update vector index", {
+                    "job_id": job_id,
+                    "error": str(index_error)
+                })
         
         context.logger.info("Job description generation completed successfully", {
             "job_id": job_id,
             "role": role
         })
+        tracer.finish("completed")
         
+    except DeadlineExceeded as e:
+        # The in-flight Gemini request was cancelled by the deadline
+        tracer.finish("timed_out", stage="generating", error=str(e))
+        try:
+            job = Job.from_state(await context.state.get("jobs", job_id))
+            if job:
+                await _mark_timed_out(context, job, "generating")
+                await _release(context, input_data)
+        except Exception as state_error:
+            context.logger.error("Failed to update job status to timed_out", {
+                "job_id": job_id,
+                "error": str(state_error)
+            })
+    
     except Exception as e:
+        tracer.finish("failed", error=str(e))
         context.logger.error("Failed to generate job description", {
             "job_id": job_id,
             "error": str(e)
@@ -124,14 +273,24 @@ async def handler(input_data, context):
         
         # Update job status to failed
         try:
-            job = await context.state.get("jobs", job_id)
+            job = Job.from_state(await context.state.get("jobs", job_id))
             if job:
-                job["status"] = "failed"
-                job["error"] = str(e)
-                job["updated_at"] = datetime.now(timezone.utc).isoformat()
-                await context.state.set("jobs", job_id, job)
+                metrics.transition(job.status, "failed")
+                metrics.observe("job_time_to_completion_seconds", (now_ms() - job.created_at) / 1000, status="failed")
+                job.touch("failed")
+                job.error = str(e)
+                await context.state.set("jobs", job_id, job.to_state())
+                await index_job(context.state, job)
+                if not released:
+                    await _release(context, input_data)
         except Exception as state_error:
             context.logger.error("Failed to update job status to failed", {
                 "job_id": job_id,
                 "error": str(state_error)
             })
+    
+    finally:
+        try:
+            await metrics.flush(context.state)
+        except Exception as metrics_error:
+            context.logger.warn("Failed to flush metrics", {"error": str(metrics_error)})
@@ -1,14 +1,19 @@
 """
 Get Job API Step
-GET /jobs/:id - Retrieves job status and content
+GET /jobs/:id - Retrieves job status and, on request, content
 """
+import re
 import sys
 import os
+from typing import Optional, Tuple
 
 # Add src to path for service imports
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from services.file_service import create_file_service
+from services.job_lookup_service import find_job
+from services.log_service import step_logger
+from services.profiling_service import profiled
 
 
 config = {
@@ -16,9 +21,14 @@ config = {
     "type": "api",
     "path": "/jobs/:id",
     "method": "GET",
-    "description": "Get job status and description content",
+    "description": "Get job status and, with include=content or a range, description content",
     "emits": [],
     "flows": ["job-generation"],
+    "queryParams": [
+        {"name": "include", "description": "content: also return the description (read from disk)"},
+        {"name": "offset", "description": "First byte of the description to return (implies include=content)"},
+        {"name": "length", "description": "Bytes of the description to return (implies include=content)"}
+    ],
     "responseSchema": {
         200: {
             "type": "object",
@@ -32,7 +42,40 @@ config = {
                 "created_at": {"type": "string"},
                 "updated_at": {"type": "string"},
                 "file_path": {"type": "string"},
+                "content_hash": {"type": "string"},
                 "content": {"type": "string"},
+                "content_range": {
+                    "type": "object",
+                    "properties": {
+                        "offset": {"type": "integer"},
+                        "length": {"type": "integer"},
+                        "total": {"type": "integer"}
+                    }
+                },
+                "error": {"type": "string"},
+                "archived": {"type": "boolean"},
+                "model": {"type": "string"},
+                "tenant": {"type": "string"},
+                "usage": {
+                    "type": "object",
+                    "properties": {
+                        "prompt_tokens": {"type": "integer"},
+                        "output_tokens": {"type": "integer"}
+                    }
+                },
+                "reuse": {
+                    "type": "object",
+                    "properties": {
+                        "source_job_id": {"type": "string"},
+                        "similarity": {"type": "number"},
+                        "mode": {"type": "string"}
+                    }
+                }
+            }
+        },
+        400: {
+            "type": "object",
+            "properties": {
                 "error": {"type": "string"}
             }
         },
@@ -41,16 +84,77 @@ config = {
             "properties": {
                 "error": {"type": "string"}
             }
+        },
+        416: {
+            "type": "object",
+            "properties": {
+                "error": {"type": "string"}
+            }
         }
     }
 }
 
+# Partial content has the same shape, plus content_range
+config["responseSchema"][206] = config["responseSchema"][200]
+
+_RANGE_RE = re.compile(r"^\s*bytes\s*=\s*(\d*)\s*-\s*(\d*)\s*$")
+
+
+def _param(query: dict, name: str):
+    value = query.get(name)
+    if isinstance(value, list):
+        value = value[0] if value else None
+    return value
+
+
+def _header(req: dict, name: str):
+    for key, value in (req.get("headers") or {}).items():
+        if key.lower() == name:
+            return value[0] if isinstance(value, list) and value else value
+    return None
 
+
+def _requested_range(req: dict) -> Tuple[Optional[Tuple[int, Optional[int]]], Optional[str]]:
+    """
+    ((offset, length), None) for a byte range, (None, None) for no range,
+    (None, error) for bad offset/length parameters
+
+    offset/length query parameters win over a Range header. A negative
+    offset is a suffix range (the last -offset bytes). A Range header this
+    endpoint cannot serve (several ranges, other units) is ignored, as
+    HTTP allows.
+    """
+    query = req.get("queryParams") or {}
+    offset, length = _param(query, "offset"), _param(query, "length")
+    if offset is not None or length is not None:
+        try:
+            offset = int(offset or 0)
+            length = None if length is None else int(length)
+        except (TypeError, ValueError):
+            return None, "offset and length must be integers"
+        if offset < 0 or (length is not None and length <= 0):
+            return None, "offset must be >= 0 and length > 0"
+        return (offset, length), None
+
+    match = _RANGE_RE.match(str(_header(req, "range") or ""))
+    if not match or not (match.group(1) or match.group(2)):
+        return None, None
+    first, last = match.group(1), match.group(2)
+    if not first:
+        return (-int(last), None), None
+    if last and int(last) < int(first):
+        return None, None
+    return (int(first), None if not last else int(last) - int(first) + 1), None
+
+
+@profiled(config["name"])
 async def handler(req, context):
     """
     Handler for retrieving job details
-    Returns job metadata and generated content (if available)
+    Returns job metadata; the description file is only read for
+    include=content or a byte range (Range header or offset/length)
     """
+    log = step_logger(context, "GetJob")
     try:
         path_params = req.get("pathParams", {})
         job_id = path_params.get("id")
@@ -61,45 +165,94 @@ async def handler(req, context):
                 "body": {"error": "Job ID is required"}
             }
         
-        # Get job from state
-        job = await context.state.get("jobs", job_id)
+        byte_range, range_error = _requested_range(req)
+        if range_error:
+            return {
+                "status": 400,
+                "body": {"error": range_error}
+            }
+        include = str(_param(req.get("queryParams") or {}, "include") or "")
+        with_content = byte_range is not None or "content" in [part.strip() for part in include.split(",")]
+        
+        # Get job from state; a just-created job may still be in the outbox
+        # and old jobs live in the cold archive
+        job, archived = await find_job(context.state, job_id)
         
         if not job:
-            context.logger.warn("Job not found", {"job_id": job_id})
+            log.warn("Job not found", {"job_id": job_id})
+            log.finish(http_status=404)
             return {
                 "status": 404,
                 "body": {"error": f"Job with id {job_id} not found"}
             }
         
-        context.logger.info("Job retrieved", {
+        log.info("Job retrieved", lambda: {
             "job_id": job_id,
-            "status": job.get("status")
+            "status": job.status
         })
         
-        # If job is completed, include file content
-        response_body = {**job}
+        response_body = job.to_dict()
+        response_body["archived"] = archived
+        
+        # Status polls stop here: one state read, no disk I/O
+        if not with_content:
+            log.finish(job_id=job_id, http_status=200)
+            return {
+                "status": 200,
+                "body": response_body
+            }
         
-        if job.get("status") == "completed" and job.get("file_path"):
-            try:
-                file_service = create_file_service()
-                content = await file_service.read_job_description(job_id)
-                response_body["content"] = content
-            except Exception as e:
-                context.logger.error("Failed to read job description file", {
-                    "job_id": job_id,
-                    "error": str(e)
-                })
-                response_body["content"] = None
-        else:
-            response_body["content"] = None
+        response_body["content"] = None
+        if job.status == "completed" and job.file_path:
+            file_service = create_file_service()
+            if byte_range is None:
+                try:
+                    response_body["content"] = await file_service.read_job_description(job_id)
+                except Exception as e:
+                    log.error("Failed to read job description file", {
+                        "job_id": job_id,
+                        "error": str(e)
+                    })
+            else:
+                offset, length = byte_range
+                try:
+                    part = await file_service.read_job_description_range(job_id, offset, length)
+                except Exception as e:
+                    log.error("Failed to read job description file", {
+                        "job_id": job_id,
+                        "error": str(e)
+                    })
+                    part = None
+                if part is not None and part[1] == 0:
+                    response_body["content"] = ""
+                elif part is not None:
+                    data, total = part
+                    start = total - len(data) if offset < 0 else offset
+                    if start >= total:
+                        log.finish(job_id=job_id, http_status=416)
+                        return {
+                            "status": 416,
+                            "headers": {"Content-Range": f"bytes */{total}"},
+                            "body": {"error": f"Range starts past the end of the description ({total} bytes)"}
+                        }
+                    # A range may cut a multi-byte character at either end
+                    response_body["content"] = data.decode("utf-8", errors="replace")
+                    response_body["content_range"] = {"offset": start, "length": len(data), "total": total}
+                    log.finish(job_id=job_id, http_status=206)
+                    return {
+                        "status": 206,
+                        "headers": {"Content-Range": f"bytes {start}-{start + len(data) - 1}/{total}"},
+                        "body": response_body
+                    }
         
+        log.finish(job_id=job_id, http_status=200)
         return {
             "status": 200,
             "body": response_body
         }
         
     except Exception as e:
-        context.logger.error("Failed to get job", {"error": str(e)})
+        log.error("Failed to get job", {"error": str(e)})
         return {
             "status": 500,
             "body": {"error": str(e)}
@@ -0,0 +1,51 @@
+"""
+Head Job API Step
+HEAD /jobs/:id - Job status in response headers, for cheap polling
+"""
+import sys
+import os
+
+# Add src to path for service imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from models.records import ms_to_iso
+from services.job_lookup_service import find_job
+from services.log_service import step_logger
+from services.profiling_service import profiled
+
+
+config = {
+    "name": "HeadJob",
+    "type": "api",
+    "path": "/jobs/:id",
+    "method": "HEAD",
+    "description": "Get job status as headers (no body, no disk I/O)",
+    "emits": [],
+    "flows": ["job-generation"]
+}
+
+
+@profiled(config["name"])
+async def handler(req, context):
+    """
+    Handler for status-only polls
+    One state read for a job in state; X-Job-Status carries the status and
+    ETag the content hash once the description exists
+    """
+    log = step_logger(context, "HeadJob")
+    job_id = (req.get("pathParams") or {}).get("id")
+    job, archived = await find_job(context.state, job_id) if job_id else (None, False)
+    if not job:
+        log.finish(job_id=job_id, http_status=404)
+        return {"status": 404, "body": None}
+
+    headers = {
+        "X-Job-Status": job.status,
+        "X-Job-Updated-At": ms_to_iso(job.updated_at),
+        "X-Job-Archived": "true" if archived else "false"
+    }
+    if job.content_hash:
+        headers["ETag"] = f'"{job.content_hash}"'
+
+    log.finish(job_id=job_id, http_status=200)
+    return {"status": 200, "headers": headers, "body": None}
@@ -0,0 +1,77 @@
+"""
+Job Queue API Step
+GET /queue/jobs - Per-tenant depth of the generation queue
+"""
+import sys
+import os
+
+# Add src to path for service imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from models.records import ms_to_iso
+from services.fair_queue_service import max_inflight, queue_depths, tenant_max_inflight
+from services.outbox_service import queued_entries
+from services.log_service import step_logger
+from services.profiling_service import profiled
+
+
+config = {
+    "name": "JobQueue",
+    "type": "api",
+    "path": "/queue/jobs",
+    "method": "GET",
+    "description": "Get queued, deferred and in-flight jobs per tenant",
+    "emits": [],
+    "flows": ["job-generation"],
+    "responseSchema": {
+        200: {
+            "type": "object",
+            "properties": {
+                "tenants": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "tenant": {"type": "string"},
+                            "weight": {"type": "number"},
+                            "queued": {"type": "integer"},
+                            "deferred": {"type": "integer"},
+                            "in_flight": {"type": "integer"},
+                            "queued_tokens": {"type": "integer"},
+                            "oldest_queued_at": {"type": ["string", "null"]},
+                            "deficit": {"type": "number"}
+                        }
+                    }
+                },
+                "queued": {"type": "integer"},
+                "in_flight": {"type": "integer"},
+                "max_in_flight": {"type": ["integer", "null"]},
+                "tenant_max_in_flight": {"type": ["integer", "null"]}
+            }
+        }
+    }
+}
+
+
+@profiled(config["name"])
+async def handler(req, context):
+    """
+    Handler for queue depth
+    One read each of the outbox, the in-flight markers and the scheduler state
+    """
+    log = step_logger(context, "JobQueue")
+    tenants = await queue_depths(context.state, await queued_entries(context.state))
+    for row in tenants:
+        row["oldest_queued_at"] = ms_to_iso(row["oldest_queued_at"])
+
+    log.finish(tenants=len(tenants))
+    return {
+        "status": 200,
+        "body": {
+            "tenants": tenants,
+            "queued": sum(row["queued"] for row in tenants),
+            "in_flight": sum(row["in_flight"] for row in tenants),
+            "max_in_flight": max_inflight() or None,
+            "tenant_max_in_flight": tenant_max_inflight() or None
+        }
+    }
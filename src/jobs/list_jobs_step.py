@@ -2,6 +2,22 @@
 List Jobs API Step
 GET /jobs - Lists all jobs with their status
 """
+import asyncio
+import sys
+import os
+
+# Add src to path for service imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from models.records import Job, ms_to_iso
+from services.job_index_service import load_job_index
+from services.metrics_service import registry as metrics
+from services.log_service import step_logger
+from services.profiling_service import profiled
+
+FILTER_PARAMS = ("status", "yoe_min", "yoe_max", "role_prefix", "has_comp", "limit", "offset")
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 500
 
 
 config = {
@@ -12,6 +28,15 @@ config = {
     "description": "List all jobs with their current status",
     "emits": [],
     "flows": ["job-generation"],
+    "queryParams": [
+        {"name": "status", "description": "Filter by status (pending, processing, completed, failed)"},
+        {"name": "yoe_min", "description": "Minimum years of experience (inclusive)"},
+        {"name": "yoe_max", "description": "Maximum years of experience (inclusive)"},
+        {"name": "role_prefix", "description": "Case-insensitive prefix of the role"},
+        {"name": "has_comp", "description": "true/false - whether compensation is present"},
+        {"name": "limit", "description": f"Page size for filtered queries (default {DEFAULT_LIMIT}, max {MAX_LIMIT})"},
+        {"name": "offset", "description": "Page offset for filtered queries"}
+    ],
     "responseSchema": {
         200: {
             "type": "object",
@@ -36,61 +61,170 @@ config = {
                         "pending": {"type": "integer"},
                         "processing": {"type": "integer"},
                         "completed": {"type": "integer"},
-                        "failed": {"type": "integer"}
+                        "failed": {"type": "integer"},
+                        "timed_out": {"type": "integer"}
+                    }
+                },
+                "facets": {
+                    "type": "object",
+                    "properties": {
+                        "status": {"type": "object"},
+                        "has_comp": {"type": "object"}
                     }
                 }
             }
+        },
+        400: {
+            "type": "object",
+            "properties": {
+                "error": {"type": "string"}
+            }
         }
     }
 }
 
 
+def _param(query_params, name):
+    """Query params may arrive as a string or a list of strings"""
+    value = query_params.get(name)
+    if isinstance(value, list):
+        value = value[0] if value else None
+    if value is None or value == "":
+        return None
+    return value
+
+
+def _parse_filters(query_params):
+    """Parse and validate facet query parameters, raises ValueError on bad input"""
+    filters = {}
+
+    status = _param(query_params, "status")
+    if status is not None:
+        filters["status"] = status
+
+    for name in ("yoe_min", "yoe_max", "offset", "limit"):
+        value = _param(query_params, name)
+        if value is not None:
+            try:
+                filters[name] = int(value)
+            except (TypeError, ValueError):
+                raise ValueError(f"{name} must be an integer")
+            if filters[name] < 0:
+                raise ValueError(f"{name} must be >= 0")
+
+    role_prefix = _param(query_params, "role_prefix")
+    if role_prefix is not None:
+        filters["role_prefix"] = role_prefix
+
+    has_comp = _param(query_params, "has_comp")
+    if has_comp is not None:
+        if str(has_comp).lower() not in ("true", "false", "1", "0"):
+            raise ValueError("has_comp must be true or false")
+        filters["has_comp"] = str(has_comp).lower() in ("true", "1")
+
+    filters["limit"] = min(filters.get("limit", DEFAULT_LIMIT), MAX_LIMIT)
+    return filters
+
+
+def _list_item(job: Job) -> dict:
+    return {
+        "job_id": job.job_id,
+        "role": job.role,
+        "description": job.description,
+        "yoe": job.yoe,
+        "status": job.status,
+        "created_at": ms_to_iso(job.created_at),
+        "updated_at": ms_to_iso(job.updated_at),
+        "error": job.error
+    }
+
+
+async def _filtered_handler(query_params, context, log):
+    """Facet query path: answered from the job index, only the page is loaded"""
+    try:
+        filters = _parse_filters(query_params)
+    except ValueError as e:
+        return {
+            "status": 400,
+            "body": {"error": str(e)}
+        }
+
+    index = await load_job_index(context.state)
+    result = index.query(**filters)
+
+    records = await asyncio.gather(*[
+        context.state.get("jobs", job_id) for job_id in result["job_ids"]
+    ])
+    jobs = [_list_item(Job.from_state(value)) for value in records if value]
+
+    try:
+        await metrics.flush(context.state)
+    except Exception as metrics_error:
+        log.warn("Failed to flush metrics", {"error": str(metrics_error)})
+
+    log.info("Retrieved filtered jobs list", lambda: {
+        "filters": filters,
+        "matched": result["total"],
+        "returned": len(jobs)
+    })
+
+    log.finish(filtered=True, returned=len(jobs))
+    return {
+        "status": 200,
+        "body": {
+            "jobs": jobs,
+            "count": result["total"],
+            "summary": index.status_counts(),
+            "facets": result["facets"]
+        }
+    }
+
+
+@profiled(config["name"])
 async def handler(req, context):
     """
     Handler for listing all jobs
     Returns summary with status counts
+    Facet query parameters are served from the job index
     """
+    log = step_logger(context, "ListJobs")
     try:
+        query_params = req.get("queryParams", {}) or {}
+        if any(_param(query_params, name) is not None for name in FILTER_PARAMS):
+            return await _filtered_handler(query_params, context, log)
+        
         # Get all job keys from state
         job_keys = await context.state.keys("jobs")
         
-        jobs = []
+        records = []
         status_counts = {
             "pending": 0,
             "processing": 0,
             "completed": 0,
-            "failed": 0
+            "failed": 0,
+            "timed_out": 0
         }
         
         # Fetch all jobs and build summary
         for key in job_keys:
-            job = await context.state.get("jobs", key)
+            job = Job.from_state(await context.state.get("jobs", key))
             if job:
-                # Add summary info for list view
-                jobs.append({
-                    "job_id": job.get("job_id"),
-                    "role": job.get("role"),
-                    "description": job.get("description"),
-                    "yoe": job.get("yoe"),
-                    "status": job.get("status"),
-                    "created_at": job.get("created_at"),
-                    "updated_at": job.get("updated_at"),
-                    "error": job.get("error")
-                })
+                records.append(job)
                 
                 # Count by status
-                status = job.get("status", "unknown")
-                if status in status_counts:
-                    status_counts[status] += 1
+                if job.status in status_counts:
+                    status_counts[job.status] += 1
         
-        # Sort by creation date (newest first)
-        jobs.sort(key=lambda x: x.get("created_at", ""), reverse=True)
+        # Sort by creation date (newest first), then render the list view
+        records.sort(key=lambda job: job.created_at, reverse=True)
+        jobs = [_list_item(job) for job in records]
         
-        context.logger.info("Retrieved jobs list", {
+        log.info("Retrieved jobs list", lambda: {
             "total_count": len(jobs),
             "summary": status_counts
         })
         
+        log.finish(filtered=False, returned=len(jobs))
         return {
             "status": 200,
             "body": {
@@ -101,7 +235,7 @@ async def handler(req, context):
         }
         
     except Exception as e:
-        context.logger.error("Failed to list jobs", {"error": str(e)})
+        log.error("Failed to list jobs", {"error": str(e)})
         return {
             "status": 500,
             "body": {"error": str(e)}
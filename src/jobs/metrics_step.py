@@ -0,0 +1,72 @@
+"""
+Metrics API Step
+GET /metrics - Prometheus text-format metrics for the job pipeline
+"""
+import sys
+import os
+
+# Add src to path for service imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.job_index_service import load_job_index
+from services.metrics_service import collect, ensure_status_baseline, render_prometheus, series_key
+from services.profiling_service import profiled
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+config = {
+    "name": "Metrics",
+    "type": "api",
+    "path": "/metrics",
+    "method": "GET",
+    "description": "Prometheus metrics: jobs by status, generation latency, Gemini errors, cache hit ratios",
+    "emits": [],
+    "flows": ["job-generation"]
+}
+
+
+def _derived_gauges(snapshot: dict) -> dict:
+    """Values computed at scrape time from the summed counters"""
+    gauges = snapshot.get("gauges", {})
+    counters = snapshot.get("counters", {})
+
+    derived = {
+        # Jobs emitted but not yet picked up by the generation step
+        "job_generation_backlog": gauges.get(series_key("jobs_by_status", {"status": "pending"}), 0.0)
+    }
+
+    for cache in ("job_index", "prompt_reuse"):
+        hits = counters.get(series_key("cache_lookups_total", {"cache": cache, "result": "hit"}), 0.0)
+        misses = counters.get(series_key("cache_lookups_total", {"cache": cache, "result": "miss"}), 0.0)
+        if hits + misses:
+            derived[series_key("cache_hit_ratio", {"cache": cache})] = round(hits / (hits + misses), 6)
+    return derived
+
+
+@profiled(config["name"])
+async def handler(req, context):
+    """
+    Handler for Prometheus scrapes
+    Sums the per-process metric shards from state; job records are never read
+    """
+    try:
+        async def status_counts():
+            return (await load_job_index(context.state)).status_counts()
+
+        await ensure_status_baseline(context.state, status_counts)
+        snapshot = await collect(context.state)
+
+        return {
+            "status": 200,
+            "headers": {"Content-Type": CONTENT_TYPE},
+            "body": render_prometheus(snapshot, _derived_gauges(snapshot))
+        }
+
+    except Exception as e:
+        context.logger.error("Failed to render metrics", {"error": str(e)})
+        return {
+            "status": 500,
+            "headers": {"Content-Type": CONTENT_TYPE},
+            "body": f"# metrics unavailable: {e}\n"
+        }
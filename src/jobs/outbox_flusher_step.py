@@ -0,0 +1,83 @@
+"""
+Outbox Flusher Cron Step
+Publishes jobs queued by CreateJob: stores the job record and index row,
+emits generate-job-description, then removes the outbox entry. Entries
+are picked per tenant by the fair queue scheduler.
+"""
+import sys
+import os
+
+# Add src to path for service imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.admission_service import update_snapshot
+from services.job_index_service import trim_index_log
+from services.outbox_service import flush_outbox
+from services.tracing_service import start_trace
+from services.metrics_service import registry as metrics
+from services.profiling_service import profiled
+
+
+config = {
+    "name": "OutboxFlusher",
+    "type": "cron",
+    # Six fields (with seconds); set OUTBOX_FLUSH_CRON="* * * * *" on runtimes
+    # whose scheduler only accepts minute resolution
+    "cron": os.environ.get("OUTBOX_FLUSH_CRON", "*/2 * * * * *"),
+    "description": "Publish queued job creation events in batches",
+    "emits": ["generate-job-description"],
+    "flows": ["job-generation"]
+}
+
+
+@profiled(config["name"])
+async def handler(context):
+    """
+    Handler for one flush run
+    Drains up to OUTBOX_BATCH_SIZE entries per batch until the outbox is
+    empty, the in-flight caps are reached or a batch makes no progress,
+    then refreshes the admission control snapshot and trims the job index
+    changelog
+    """
+    tracer = start_trace(context, "OutboxFlusher")
+    published = 0
+    in_flight_before = None
+    try:
+        while True:
+            with tracer.span("outbox.flush"):
+                result = await flush_outbox(context.state, context.emit)
+            if in_flight_before is None:
+                in_flight_before = result["in_flight_before"]
+            published += result["published"]
+            for job_id, error in result["failed"]:
+                context.logger.warn("Failed to publish queued job", {"job_id": job_id, "error": str(error)})
+            if not result["backlog"] or not result["published"]:
+                break
+
+        with tracer.span("admission.snapshot"):
+            snapshot = await update_snapshot(
+                context.state, in_flight_before, result["in_flight"], result["queued_by_tenant"]
+            )
+
+        # The flusher runs every few seconds, so the index changelog never
+        # holds more than its retention
+        with tracer.span("index.trim_log"):
+            await trim_index_log(context.state)
+
+        if published:
+            context.logger.info("Published queued jobs", {
+                "count": published,
+                "backlog": result["backlog"],
+                "drain_rate": snapshot["drain_rate"]
+            })
+        tracer.finish(published=published, backlog=result["backlog"])
+
+    except Exception as e:
+        tracer.finish("error", published=published, error=str(e))
+        context.logger.error("Failed to flush job outbox", {"error": str(e)})
+
+    finally:
+        try:
+            await metrics.flush(context.state)
+        except Exception as metrics_error:
+            context.logger.warn("Failed to flush metrics", {"error": str(metrics_error)})
@@ -0,0 +1,150 @@
+"""
+Similar Jobs API Step
+GET /jobs/:id/similar - Top-k most similar postings from the local vector index
+"""
+import asyncio
+import sys
+import os
+
+# Add src to path for service imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from models.records import Job
+from services.vector_index_service import create_vector_index_service, is_available
+from services.log_service import step_logger
+from services.profiling_service import profiled
+
+DEFAULT_K = 10
+MAX_K = 100
+
+
+config = {
+    "name": "SimilarJobs",
+    "type": "api",
+    "path": "/jobs/:id/similar",
+    "method": "GET",
+    "description": "Get the most similar job postings by generated content",
+    "emits": [],
+    "flows": ["job-generation"],
+    "queryParams": [
+        {"name": "k", "description": f"Number of similar jobs to return (default {DEFAULT_K}, max {MAX_K})"}
+    ],
+    "responseSchema": {
+        200: {
+            "type": "object",
+            "properties": {
+                "job_id": {"type": "string"},
+                "similar": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "job_id": {"type": "string"},
+                            "role": {"type": "string"},
+                            "yoe": {"type": "integer"},
+                            "status": {"type": "string"},
+                            "score": {"type": "number"}
+                        }
+                    }
+                },
+                "count": {"type": "integer"}
+            }
+        },
+        400: {
+            "type": "object",
+            "properties": {
+                "error": {"type": "string"}
+            }
+        },
+        404: {
+            "type": "object",
+            "properties": {
+                "error": {"type": "string"}
+            }
+        },
+        503: {
+            "type": "object",
+            "properties": {
+                "error": {"type": "string"}
+            }
+        }
+    }
+}
+
+
+@profiled(config["name"])
+async def handler(req, context):
+    """
+    Handler for similar-job recommendations
+    Scores every indexed job against the requested one and returns the top k
+    """
+    log = step_logger(context, "SimilarJobs")
+    try:
+        job_id = req.get("pathParams", {}).get("id")
+        k = req.get("queryParams", {}).get("k", DEFAULT_K)
+        if isinstance(k, list):
+            k = k[0] if k else DEFAULT_K
+        
+        try:
+            k = min(int(k), MAX_K)
+        except (TypeError, ValueError):
+            return {
+                "status": 400,
+                "body": {"error": "k must be an integer"}
+            }
+        
+        if not is_available():
+            return {
+                "status": 503,
+                "body": {"error": "Similar jobs are unavailable: numpy is not installed"}
+            }
+        
+        vector_index = create_vector_index_service()
+        loop = asyncio.get_event_loop()
+        matches = await loop.run_in_executor(None, vector_index.similar, job_id, k)
+        
+        if matches is None:
+            log.warn("Job not in vector index", {"job_id": job_id})
+            return {
+                "status": 404,
+                "body": {"error": f"Job with id {job_id} has no generated content indexed"}
+            }
+        
+        records = await asyncio.gather(*[
+            context.state.get("jobs", other_id) for other_id, _ in matches
+        ])
+        
+        similar = []
+        for (other_id, score), value in zip(matches, records):
+            job = Job.from_state(value)
+            if not job:
+                continue
+            similar.append({
+                "job_id": other_id,
+                "role": job.role,
+                "yoe": job.yoe,
+                "status": job.status,
+                "score": round(score, 4)
+            })
+        
+        log.info("Similar jobs retrieved", lambda: {
+            "job_id": job_id,
+            "count": len(similar)
+        })
+        
+        log.finish(job_id=job_id, k=k)
+        return {
+            "status": 200,
+            "body": {
+                "job_id": job_id,
+                "similar": similar,
+                "count": len(similar)
+            }
+        }
+        
+    except Exception as e:
+        log.error("Failed to get similar jobs", {"error": str(e)})
+        return {
+            "status": 500,
+            "body": {"error": str(e)}
+        }
@@ -0,0 +1,97 @@
+"""
+Token Usage API Step
+GET /usage/tokens - Gemini token usage and budget per tenant per UTC day
+"""
+import sys
+import os
+
+# Add src to path for service imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.usage_service import list_usage
+from services.log_service import step_logger
+from services.profiling_service import profiled
+
+MAX_DAYS = 31
+
+
+config = {
+    "name": "TokenUsage",
+    "type": "api",
+    "path": "/usage/tokens",
+    "method": "GET",
+    "description": "Get Gemini token usage and remaining budget per tenant",
+    "emits": [],
+    "flows": ["job-generation"],
+    "queryParams": [
+        {"name": "tenant", "description": "Only this tenant (default: every tenant)"},
+        {"name": "days", "description": f"UTC days to return, today first (default 1, max {MAX_DAYS})"}
+    ],
+    "responseSchema": {
+        200: {
+            "type": "object",
+            "properties": {
+                "usage": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "tenant": {"type": "string"},
+                            "day": {"type": "string"},
+                            "prompt_tokens": {"type": "integer"},
+                            "output_tokens": {"type": "integer"},
+                            "total_tokens": {"type": "integer"},
+                            "reserved_tokens": {"type": "integer"},
+                            "jobs": {"type": "integer"},
+                            "rejected": {"type": "integer"},
+                            "budget": {"type": ["integer", "null"]},
+                            "remaining": {"type": ["integer", "null"]}
+                        }
+                    }
+                },
+                "count": {"type": "integer"}
+            }
+        },
+        400: {
+            "type": "object",
+            "properties": {
+                "error": {"type": "string"}
+            }
+        }
+    }
+}
+
+
+def _param(query: dict, name: str):
+    value = query.get(name)
+    if isinstance(value, list):
+        value = value[0] if value else None
+    return value
+
+
+@profiled(config["name"])
+async def handler(req, context):
+    """
+    Handler for token usage
+    Reads one record per day for a tenant, or the usage group for all tenants
+    """
+    log = step_logger(context, "TokenUsage")
+    query = req.get("queryParams") or {}
+    tenant = _param(query, "tenant")
+    try:
+        days = min(max(int(_param(query, "days") or 1), 1), MAX_DAYS)
+    except (TypeError, ValueError):
+        return {
+            "status": 400,
+            "body": {"error": "days must be an integer"}
+        }
+
+    usage = await list_usage(context.state, tenant, days)
+    log.finish(tenant=tenant, days=days, count=len(usage))
+    return {
+        "status": 200,
+        "body": {
+            "usage": usage,
+            "count": len(usage)
+        }
+    }
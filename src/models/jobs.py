@@ -0,0 +1,131 @@
+"""
+Job request/response models
+Single definition used for both the step config schemas and request body
+validation, so the documented and the enforced rules cannot drift apart.
+The plain JSON schemas are the fallback when Pydantic is not installed
+"""
+from typing import Optional
+
+
+JOB_INPUT_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "role": {"type": "string", "minLength": 1, "description": "Job title/role"},
+        "description": {"type": "string", "minLength": 100, "maxLength": 150, "description": "Brief job description"},
+        "yoe": {"type": "integer", "minimum": 0, "description": "Years of experience required"},
+        "comp": {"type": ["string", "null"], "description": "Optional compensation details"}
+    },
+    "required": ["role", "description", "yoe"]
+}
+# Whitespace is stripped before the length checks
+JOB_INPUT_STRIP = ("role", "description")
+
+GENERATE_JOB_INPUT_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "job_id": {"type": "string"},
+        "role": {"type": "string"},
+        "description": {"type": "string"},
+        "yoe": {"type": "integer"},
+        "comp": {"type": "string"},
+        "deadline_at": {"type": "integer"},
+        "tenant": {"type": "string"},
+        "usage_day": {"type": "string"},
+        "reserved_tokens": {"type": "integer"}
+    },
+    "required": ["job_id", "role", "description", "yoe"]
+}
+
+JOB_RESPONSE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "job_id": {"type": "string"},
+        "role": {"type": "string"},
+        "status": {"type": "string"},
+        "message": {"type": "string"},
+        "created_at": {"type": "string"},
+        "deadline_at": {"type": "string"},
+        "tenant": {"type": "string"},
+        "not_before": {"type": "string"},
+        "estimated_completion_at": {"type": "string"}
+    }
+}
+
+ERROR_RESPONSE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "error": {"type": "string"},
+        "details": {"type": "object"}
+    }
+}
+
+try:
+    from pydantic import BaseModel, ConfigDict, Field, StringConstraints
+    from typing_extensions import Annotated, NotRequired, TypedDict
+
+    class JobInput(TypedDict):
+        __pydantic_config__ = ConfigDict(strict=True)
+
+        role: Annotated[str, StringConstraints(strip_whitespace=True, min_length=1), Field(description="Job title/role")]
+        description: Annotated[
+            str,
+            StringConstraints(strip_whitespace=True, min_length=100, max_length=150),
+            Field(description="Brief job description")
+        ]
+        yoe: Annotated[int, Field(ge=0, description="Years of experience required")]
+        comp: NotRequired[Annotated[Optional[str], Field(description="Optional compensation details")]]
+
+    class GenerateJobInput(BaseModel):
+        job_id: str
+        role: str
+        description: str
+        yoe: int
+        comp: Optional[str] = None
+        # Epoch ms after which the event is dropped (set by CreateJob)
+        deadline_at: Optional[int] = None
+        # Token budget reservation to settle once the job finishes
+        tenant: Optional[str] = None
+        usage_day: Optional[str] = None
+        reserved_tokens: int = 0
+
+    class JobResponse(BaseModel):
+        job_id: str
+        role: str
+        description: str
+        yoe: int
+        comp: Optional[str]
+        status: str
+        message: str
+        created_at: str
+        deadline_at: Optional[str] = None
+        tenant: Optional[str] = None
+        # Set when the job was deferred past the tenant's daily token budget
+        not_before: Optional[str] = None
+        # From the queue depth and drain rate; null until a rate is known
+        estimated_completion_at: Optional[str] = None
+
+    class ErrorResponse(BaseModel):
+        error: str
+        details: Optional[dict] = None
+
+except ImportError:
+    JobInput = GenerateJobInput = JobResponse = ErrorResponse = None
+
+
+def job_input_schema() -> dict:
+    if JobInput is None:
+        return JOB_INPUT_SCHEMA
+    from pydantic import TypeAdapter
+    return TypeAdapter(JobInput).json_schema()
+
+
+def generate_job_input_schema() -> dict:
+    return GENERATE_JOB_INPUT_SCHEMA if GenerateJobInput is None else GenerateJobInput.model_json_schema()
+
+
+def job_response_schema() -> dict:
+    return JOB_RESPONSE_SCHEMA if JobResponse is None else JobResponse.model_json_schema()
+
+
+def error_response_schema() -> dict:
+    return ERROR_RESPONSE_SCHEMA if ErrorResponse is None else ErrorResponse.model_json_schema()
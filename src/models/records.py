@@ -0,0 +1,242 @@
+"""
+Compact job and todo records
+Slotted record classes with epoch-millisecond timestamps. In state they are
+stored as positional arrays tagged with a format version, which drops the
+repeated field names from every value and avoids parsing ISO strings on
+read. Legacy dict values are still accepted, and API bodies are rendered
+straight from the record in the original shape (ISO timestamps)
+"""
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+
+# ms -> ISO rendering runs twice per record in list endpoints, so it is
+# built from a per-minute "YYYY-MM-DDTHH:MM:" prefix plus lookup tables
+# instead of going through datetime
+_MINUTE_PREFIXES: Dict[int, str] = {}
+_MAX_MINUTE_PREFIXES = 4096
+_SECONDS = [f"{i:02d}" for i in range(60)]
+_FRACTIONS = [f".{i:03d}000+00:00" for i in range(1000)]
+
+
+def now_ms() -> int:
+    return time.time_ns() // 1_000_000
+
+
+def ms_to_iso(value: Optional[int]) -> Optional[str]:
+    """Epoch ms to UTC ISO-8601 with microsecond precision, e.g. 2025-01-01T00:00:00.123000+00:00"""
+    if value is None:
+        return None
+    seconds, millis = divmod(int(value), 1000)
+    minute, second = divmod(seconds, 60)
+    prefix = _MINUTE_PREFIXES.get(minute)
+    if prefix is None:
+        if len(_MINUTE_PREFIXES) >= _MAX_MINUTE_PREFIXES:
+            _MINUTE_PREFIXES.clear()
+        prefix = _MINUTE_PREFIXES[minute] = time.strftime("%Y-%m-%dT%H:%M:", time.gmtime(minute * 60))
+    return prefix + _SECONDS[second] + _FRACTIONS[millis]
+
+
+def iso_to_ms(value: Any) -> Optional[int]:
+    """Accepts epoch ms (new records) or an ISO-8601 string (legacy dicts)"""
+    if value is None or value == "":
+        return None
+    if isinstance(value, (int, float)):
+        return int(value)
+    try:
+        return int(datetime.fromisoformat(value).timestamp() * 1000)
+    except (TypeError, ValueError):
+        return None
+
+
+class Job:
+    """
+    Job record
+
+    State encoding: ["j1", job_id, role, description, yoe, comp, status,
+    created_at, updated_at, file_path, error, reuse, model, deadline_at,
+    tenant, usage, content_hash].
+    New fields must be appended with a default so shorter (older) arrays
+    still decode.
+    """
+
+    TAG = "j1"
+    __slots__ = (
+        "job_id", "role", "description", "yoe", "comp", "status",
+        "created_at", "updated_at", "file_path", "error", "reuse",
+        "model", "deadline_at", "tenant", "usage", "content_hash",
+    )
+
+    def __init__(
+        self,
+        job_id: str,
+        role: str,
+        description: str,
+        yoe: int,
+        comp: Optional[str] = None,
+        status: str = "pending",
+        created_at: Optional[int] = None,
+        updated_at: Optional[int] = None,
+        file_path: Optional[str] = None,
+        error: Optional[str] = None,
+        reuse: Optional[dict] = None,
+        model: Optional[str] = None,
+        deadline_at: Optional[int] = None,
+        tenant: Optional[str] = None,
+        usage: Optional[dict] = None,
+        content_hash: Optional[str] = None
+    ):
+        self.job_id = job_id
+        self.role = role
+        self.description = description
+        self.yoe = yoe
+        self.comp = comp
+        self.status = status
+        self.created_at = created_at if created_at is not None else now_ms()
+        self.updated_at = updated_at if updated_at is not None else self.created_at
+        self.file_path = file_path
+        self.error = error
+        self.reuse = reuse
+        self.model = model
+        self.deadline_at = deadline_at
+        self.tenant = tenant
+        self.usage = usage
+        self.content_hash = content_hash
+
+    def __repr__(self) -> str:
+        return f"Job(job_id={self.job_id!r}, status={self.status!r})"
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Job) and self.to_state() == other.to_state()
+
+    def to_state(self) -> list:
+        return [
+            self.TAG, self.job_id, self.role, self.description, self.yoe, self.comp, self.status,
+            self.created_at, self.updated_at, self.file_path, self.error, self.reuse, self.model,
+            self.deadline_at, self.tenant, self.usage, self.content_hash,
+        ]
+
+    @classmethod
+    def from_state(cls, value: Any) -> Optional["Job"]:
+        """Decode a state value (tagged array or legacy dict); None stays None"""
+        if not value:
+            return None
+        if isinstance(value, list):
+            if value[0] != cls.TAG:
+                raise ValueError(f"Unknown job record format: {value[0]!r}")
+            return cls(*value[1:])
+        return cls(
+            job_id=value.get("job_id"),
+            role=value.get("role"),
+            description=value.get("description"),
+            yoe=value.get("yoe"),
+            comp=value.get("comp"),
+            status=value.get("status", "pending"),
+            created_at=iso_to_ms(value.get("created_at")),
+            updated_at=iso_to_ms(value.get("updated_at")),
+            file_path=value.get("file_path"),
+            error=value.get("error"),
+            reuse=value.get("reuse"),
+            model=value.get("model"),
+            deadline_at=iso_to_ms(value.get("deadline_at")),
+            tenant=value.get("tenant"),
+            usage=value.get("usage"),
+            content_hash=value.get("content_hash")
+        )
+
+    def expired(self, at_ms: Optional[int] = None) -> bool:
+        """True once the job's deadline (if any) has passed"""
+        return self.deadline_at is not None and (at_ms or now_ms()) >= self.deadline_at
+
+    def touch(self, status: Optional[str] = None) -> None:
+        """Set updated_at to now, optionally moving to a new status"""
+        if status is not None:
+            self.status = status
+        self.updated_at = now_ms()
+
+    def to_dict(self) -> dict:
+        """API representation (GET /jobs/:id)"""
+        return {
+            "job_id": self.job_id,
+            "role": self.role,
+            "description": self.description,
+            "yoe": self.yoe,
+            "comp": self.comp,
+            "status": self.status,
+            "created_at": ms_to_iso(self.created_at),
+            "updated_at": ms_to_iso(self.updated_at),
+            "file_path": self.file_path,
+            "error": self.error,
+            "reuse": self.reuse,
+            "model": self.model,
+            "deadline_at": ms_to_iso(self.deadline_at),
+            "tenant": self.tenant,
+            "usage": self.usage,
+            "content_hash": self.content_hash
+        }
+
+
+class Todo:
+    """
+    Todo record
+
+    State encoding: ["t1", id, title, description, completed, createdAt, updatedAt]
+    """
+
+    TAG = "t1"
+    __slots__ = ("id", "title", "description", "completed", "created_at", "updated_at")
+
+    def __init__(
+        self,
+        id: str,
+        title: str,
+        description: str = "",
+        completed: bool = False,
+        created_at: Optional[int] = None,
+        updated_at: Optional[int] = None
+    ):
+        self.id = id
+        self.title = title
+        self.description = description
+        self.completed = completed
+        self.created_at = created_at if created_at is not None else now_ms()
+        self.updated_at = updated_at if updated_at is not None else self.created_at
+
+    def __repr__(self) -> str:
+        return f"Todo(id={self.id!r}, completed={self.completed!r})"
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Todo) and self.to_state() == other.to_state()
+
+    def to_state(self) -> list:
+        return [self.TAG, self.id, self.title, self.description, self.completed, self.created_at, self.updated_at]
+
+    @classmethod
+    def from_state(cls, value: Any) -> Optional["Todo"]:
+        """Decode a state value (tagged array or legacy dict); None stays None"""
+        if not value:
+            return None
+        if isinstance(value, list):
+            if value[0] != cls.TAG:
+                raise ValueError(f"Unknown todo record format: {value[0]!r}")
+            return cls(*value[1:])
+        return cls(
+            id=value.get("id"),
+            title=value.get("title"),
+            description=value.get("description", ""),
+            completed=value.get("completed", False),
+            created_at=iso_to_ms(value.get("createdAt")),
+            updated_at=iso_to_ms(value.get("updatedAt"))
+        )
+
+    def to_dict(self) -> dict:
+        """API representation"""
+        return {
+            "id": self.id,
+            "title": self.title,
+            "description": self.description,
+            "completed": self.completed,
+            "createdAt": ms_to_iso(self.created_at),
+            "updatedAt": ms_to_iso(self.updated_at)
+        }
@@ -0,0 +1,103 @@
+"""
+Todo request/response models
+Single definition used for both the step config schemas and request body
+validation. The plain JSON schemas are the fallback when Pydantic is not
+installed
+"""
+from typing import Optional
+
+
+TODO_INPUT_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "title": {"type": "string", "minLength": 1, "description": "Todo title"},
+        "description": {"type": "string", "description": "Todo description"},
+        "completed": {"type": "boolean", "description": "Completion status"}
+    },
+    "required": ["title"]
+}
+TODO_INPUT_STRIP = ("title",)
+
+TODO_UPDATE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "title": {"type": ["string", "null"], "minLength": 1, "description": "Todo title"},
+        "description": {"type": ["string", "null"], "description": "Todo description"},
+        "completed": {"type": ["boolean", "null"], "description": "Completion status"}
+    }
+}
+
+TODO_RESPONSE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "id": {"type": "string"},
+        "title": {"type": "string"},
+        "description": {"type": "string"},
+        "completed": {"type": "boolean"},
+        "createdAt": {"type": "string"},
+        "updatedAt": {"type": "string"}
+    }
+}
+
+ERROR_RESPONSE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "error": {"type": "string"},
+        "details": {"type": "object"}
+    }
+}
+
+try:
+    from pydantic import BaseModel, ConfigDict, Field, StringConstraints
+    from typing_extensions import Annotated, NotRequired, TypedDict
+
+    class TodoInput(TypedDict):
+        __pydantic_config__ = ConfigDict(strict=True)
+
+        title: Annotated[str, StringConstraints(strip_whitespace=True, min_length=1), Field(description="Todo title")]
+        description: NotRequired[Annotated[str, Field(description="Todo description")]]
+        completed: NotRequired[Annotated[bool, Field(description="Completion status")]]
+
+    class TodoUpdateInput(TypedDict, total=False):
+        __pydantic_config__ = ConfigDict(strict=True)
+
+        title: Annotated[Optional[str], Field(min_length=1, description="Todo title")]
+        description: Annotated[Optional[str], Field(description="Todo description")]
+        completed: Annotated[Optional[bool], Field(description="Completion status")]
+
+    class TodoResponse(BaseModel):
+        id: str
+        title: str
+        description: str
+        completed: bool
+        createdAt: str
+        updatedAt: str
+
+    class ErrorResponse(BaseModel):
+        error: str
+        details: Optional[dict] = None
+
+except ImportError:
+    TodoInput = TodoUpdateInput = TodoResponse = ErrorResponse = None
+
+
+def todo_input_schema() -> dict:
+    if TodoInput is None:
+        return TODO_INPUT_SCHEMA
+    from pydantic import TypeAdapter
+    return TypeAdapter(TodoInput).json_schema()
+
+
+def todo_update_schema() -> dict:
+    if TodoUpdateInput is None:
+        return TODO_UPDATE_SCHEMA
+    from pydantic import TypeAdapter
+    return TypeAdapter(TodoUpdateInput).json_schema()
+
+
+def todo_response_schema() -> dict:
+    return TODO_RESPONSE_SCHEMA if TodoResponse is None else TodoResponse.model_json_schema()
+
+
+def error_response_schema() -> dict:
+    return ERROR_RESPONSE_SCHEMA if ErrorResponse is None else ErrorResponse.model_json_schema()
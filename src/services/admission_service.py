@@ -0,0 +1,121 @@
+"""
+Admission Service for POST /jobs
+CreateJob must stay a single cheap write, so it never counts the backlog
+itself. Each OutboxFlusher run, which reads the outbox and the in-flight
+markers anyway, stores a small snapshot: ready jobs per tenant, jobs in
+flight and the drain rate. The drain rate is an EWMA of jobs finished per
+second, measured from the drop in in-flight jobs between runs and updated
+while there is a backlog, i.e. while generation runs at capacity.
+CreateJob reads the snapshot with one state get and, by Little's law,
+estimates the wait as (jobs ahead + in flight) / drain rate. Because the
+flusher serves tenants round robin, the jobs ahead of a new job are at most
+one round per queued job of its tenant, not the whole backlog.
+"""
+import math
+import os
+from typing import Dict, Optional
+
+from models.records import now_ms
+from services.metrics_service import registry as metrics
+
+
+ADMISSION_GROUP = "job_scheduler"
+ADMISSION_KEY = "admission"
+ALPHA = 0.3
+
+
+def max_wait_s() -> float:
+    """Longest estimated wait to accept; defaults to the job deadline, 0 disables"""
+    return max(0.0, float(os.environ.get("ADMISSION_MAX_WAIT_S", os.environ.get("JOB_DEADLINE_S", "300"))))
+
+
+def tenant_max_queued() -> int:
+    """Ready jobs one tenant may have queued; 0 disables"""
+    return max(0, int(os.environ.get("ADMISSION_TENANT_MAX_QUEUED", "0")))
+
+
+def snapshot_ttl_ms() -> int:
+    """Older snapshots mean the flusher is not running: admit everything"""
+    return int(float(os.environ.get("ADMISSION_SNAPSHOT_TTL_S", "60")) * 1000)
+
+
+async def update_snapshot(
+    state,
+    in_flight_before: int,
+    in_flight: int,
+    queued_by_tenant: Dict[str, int]
+) -> dict:
+    """Record one flusher run; in_flight_before is measured before it published anything"""
+    now = now_ms()
+    previous = await state.get(ADMISSION_GROUP, ADMISSION_KEY) or {}
+    rate = previous.get("drain_rate")
+
+    elapsed = (now - previous.get("updated_at", now)) / 1000
+    if previous and elapsed > 0:
+        finished = max(0, previous.get("in_flight", 0) - in_flight_before)
+        sample = finished / elapsed
+        if previous.get("queued", 0) > 0:
+            # Backlogged for the whole interval: the sample is the capacity
+            rate = sample if rate is None else rate + ALPHA * (sample - rate)
+        elif sample > 0 and (rate is None or sample > rate):
+            # Idle workers finished at least this many
+            rate = sample
+
+    snapshot = {
+        "queued": sum(queued_by_tenant.values()),
+        "queued_by_tenant": queued_by_tenant,
+        "in_flight": in_flight,
+        "drain_rate": rate,
+        "updated_at": now
+    }
+    await state.set(ADMISSION_GROUP, ADMISSION_KEY, snapshot)
+    return snapshot
+
+
+async def admit(state, tenant: str) -> dict:
+    """
+    Decide on one new job
+
+    Returns {"allowed", "status", "reason", "retry_after_s", "wait_s"}.
+    status is 429 when the tenant alone has ADMISSION_TENANT_MAX_QUEUED jobs
+    queued and 503 when the job's estimated wait exceeds
+    ADMISSION_MAX_WAIT_S. wait_s is the estimated time until the job is
+    finished, None while the drain rate is unknown.
+    """
+    decision = {"allowed": True, "status": None, "reason": None, "retry_after_s": None, "wait_s": None}
+    snapshot = await state.get(ADMISSION_GROUP, ADMISSION_KEY)
+    if not snapshot or now_ms() - snapshot.get("updated_at", 0) > snapshot_ttl_ms():
+        return decision
+
+    rate = snapshot.get("drain_rate")
+    queued_by_tenant = snapshot.get("queued_by_tenant") or {}
+    tenant_queued = queued_by_tenant.get(tenant, 0)
+    # Tenants with work queued once this job is added
+    tenants = len(queued_by_tenant) + (0 if tenant_queued else 1)
+    if rate:
+        ahead = min(snapshot.get("queued", 0), tenant_queued * tenants)
+        decision["wait_s"] = (ahead + snapshot.get("in_flight", 0) + 1) / rate
+
+    limit = tenant_max_queued()
+    if limit and tenant_queued >= limit:
+        # The tenant's own queue has to drain below the limit at its round
+        # robin share of the drain rate
+        retry = (tenant_queued - limit + 1) * tenants / rate if rate else snapshot_ttl_ms() / 1000
+        metrics.inc("jobs_admission_rejected_total", reason="tenant_queue")
+        return {**decision, "allowed": False, "status": 429, "reason": "tenant_queue", "retry_after_s": _ceil(retry)}
+
+    wait_limit = max_wait_s()
+    if wait_limit and decision["wait_s"] is not None and decision["wait_s"] > wait_limit:
+        metrics.inc("jobs_admission_rejected_total", reason="backlog")
+        return {
+            **decision,
+            "allowed": False,
+            "status": 503,
+            "reason": "backlog",
+            "retry_after_s": _ceil(decision["wait_s"] - wait_limit)
+        }
+    return decision
+
+
+def _ceil(seconds: Optional[float]) -> int:
+    return max(1, int(math.ceil(seconds or 0)))
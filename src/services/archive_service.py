@@ -0,0 +1,201 @@
+"""
+Archive Service for the cold job tier
+Old terminal jobs are moved out of the jobs state group into immutable,
+gzip-compressed JSONL segments. Each segment is written sorted by job_id in
+independently compressed blocks, with a sidecar index holding the first
+job_id and byte range of every block plus a bloom filter, so a lookup reads
+at most one small block per candidate segment.
+
+    data/archive/segment-000001.jsonl.gz   # concatenated gzip members
+    data/archive/segment-000001.idx.json   # {"count", "min", "max", "blocks", "bloom"}
+
+The members concatenate into a valid .gz file, so `zcat` reads a segment.
+"""
+import bisect
+import gzip
+import hashlib
+import json
+import os
+import re
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from models.records import Job
+
+
+BLOCK_RECORDS = 64
+BLOOM_BITS_PER_KEY = 10
+BLOOM_HASHES = 7
+
+_SEGMENT_RE = re.compile(r"^segment-(\d{6})\.idx\.json$")
+
+# Segment indexes never change once written, so they are cached per process
+_indexes: Dict[str, dict] = {}
+
+
+def archive_dir() -> str:
+    return os.environ.get("JOB_ARCHIVE_DIR", os.path.join("data", "archive"))
+
+
+def _bloom_positions(job_id: str, size: int) -> List[int]:
+    digest = hashlib.blake2b(job_id.encode("utf-8"), digest_size=16).digest()
+    h1 = int.from_bytes(digest[:8], "little")
+    h2 = int.from_bytes(digest[8:], "little") | 1
+    return [(h1 + i * h2) % size for i in range(BLOOM_HASHES)]
+
+
+def _bloom_build(job_ids: List[str]) -> dict:
+    size = max(64, len(job_ids) * BLOOM_BITS_PER_KEY)
+    bits = bytearray((size + 7) // 8)
+    for job_id in job_ids:
+        for pos in _bloom_positions(job_id, size):
+            bits[pos >> 3] |= 1 << (pos & 7)
+    return {"size": size, "bits": bits.hex()}
+
+
+def _bloom_contains(bloom: dict, job_id: str) -> bool:
+    bits = bloom["bytes"]
+    return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in _bloom_positions(job_id, bloom["size"]))
+
+
+def _write_atomic(path: str, data: bytes) -> None:
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class ArchiveService:
+    def __init__(self, base_dir: Optional[str] = None):
+        self.base_dir = base_dir or archive_dir()
+
+    def _segment_names(self) -> List[str]:
+        """Segment names (without extension), newest first"""
+        try:
+            files = os.listdir(self.base_dir)
+        except FileNotFoundError:
+            return []
+        names = [f"segment-{m.group(1)}" for m in map(_SEGMENT_RE.match, files) if m]
+        return sorted(names, reverse=True)
+
+    def _load_index(self, name: str) -> Optional[dict]:
+        path = os.path.join(self.base_dir, f"{name}.idx.json")
+        index = _indexes.get(path)
+        if index is None:
+            try:
+                with open(path) as f:
+                    index = json.load(f)
+            except (OSError, ValueError):
+                return None
+            index["first_ids"] = [block[0] for block in index["blocks"]]
+            index["bloom"]["bytes"] = bytes.fromhex(index["bloom"]["bits"])
+            _indexes[path] = index
+        return index
+
+    def write_segment(self, jobs: List[Job]) -> Optional[str]:
+        """
+        Write jobs to a new segment, returns its name (None for no jobs)
+
+        The data file is renamed into place before its index, and readers only
+        look at segments with an index, so a crash never exposes a partial
+        segment. A job archived twice (crash before the state delete) is
+        harmless: lookups return the newest copy.
+        """
+        if not jobs:
+            return None
+        os.makedirs(self.base_dir, exist_ok=True)
+        existing = self._segment_names()
+        seq = int(existing[0].split("-")[1]) + 1 if existing else 1
+        name = f"segment-{seq:06d}"
+
+        jobs = sorted(jobs, key=lambda job: job.job_id)
+        data = bytearray()
+        blocks = []
+        for start in range(0, len(jobs), BLOCK_RECORDS):
+            chunk = jobs[start:start + BLOCK_RECORDS]
+            lines = "".join(json.dumps(job.to_state(), separators=(",", ":")) + "\n" for job in chunk)
+            member = gzip.compress(lines.encode("utf-8"), mtime=0)
+            blocks.append([chunk[0].job_id, len(data), len(member)])
+            data += member
+
+        job_ids = [job.job_id for job in jobs]
+        index = {
+            "count": len(jobs),
+            "min": job_ids[0],
+            "max": job_ids[-1],
+            "blocks": blocks,
+            "bloom": _bloom_build(job_ids)
+        }
+        _write_atomic(os.path.join(self.base_dir, f"{name}.jsonl.gz"), bytes(data))
+        _write_atomic(os.path.join(self.base_dir, f"{name}.idx.json"), json.dumps(index).encode("utf-8"))
+        return name
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Look up an archived job, newest segment first"""
+        for name in self._segment_names():
+            index = self._load_index(name)
+            if index is None or not (index["min"] <= job_id <= index["max"]):
+                continue
+            if not _bloom_contains(index["bloom"], job_id):
+                continue
+            block = bisect.bisect_right(index["first_ids"], job_id) - 1
+            if block < 0:
+                continue
+            _, offset, length = index["blocks"][block]
+            with open(os.path.join(self.base_dir, f"{name}.jsonl.gz"), "rb") as f:
+                f.seek(offset)
+                lines = gzip.decompress(f.read(length)).decode("utf-8")
+            needle = f'"{job_id}"'
+            for line in lines.splitlines():
+                if needle in line:
+                    job = Job.from_state(json.loads(line))
+                    if job and job.job_id == job_id:
+                        return job
+        return None
+
+    def scan(self, after: Optional[Tuple[str, int]] = None) -> Iterator[Tuple[Tuple[str, int], Job]]:
+        """
+        Stream every archived job with its (segment, line) position, oldest
+        segment first, one line at a time
+
+        after resumes behind a position returned earlier; the segment index
+        locates its block, so only that block's lines are skipped.
+        """
+        for name in reversed(self._segment_names()):
+            first = 0
+            if after is not None:
+                if name < after[0]:
+                    continue
+                if name == after[0]:
+                    first = after[1] + 1
+            block, offset = 0, 0
+            if first:
+                index = self._load_index(name)
+                block = first // BLOCK_RECORDS
+                if index is None or block >= len(index["blocks"]):
+                    continue
+                offset = index["blocks"][block][1]
+            with open(os.path.join(self.base_dir, f"{name}.jsonl.gz"), "rb") as raw:
+                raw.seek(offset)
+                with gzip.open(raw, "rt", encoding="utf-8") as f:
+                    for line_no, line in enumerate(f, block * BLOCK_RECORDS):
+                        if line_no < first:
+                            continue
+                        job = Job.from_state(json.loads(line))
+                        if job:
+                            yield (name, line_no), job
+
+    def stats(self) -> dict:
+        segments = self._segment_names()
+        count = 0
+        for name in segments:
+            index = self._load_index(name)
+            count += index["count"] if index else 0
+        return {"segments": len(segments), "jobs": count}
+
+
+# Factory function for easy instantiation
+def create_archive_service() -> ArchiveService:
+    """Create and return a configured ArchiveService instance"""
+    return ArchiveService()
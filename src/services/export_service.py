@@ -0,0 +1,226 @@
+"""
+Export Service for NDJSON job exports
+Produces one JSON line per job (record plus generated content) from an
+async generator. Jobs are selected from the facet index, so status and
+date filters are applied before any record or description file is read,
+and records/files are fetched through a fixed-size read-ahead window, so
+memory stays constant regardless of how many jobs are exported.
+
+Every line comes with its position: ["archive", segment, line] for cold
+jobs and ["state", created_at, job_id] for jobs in state. An opaque cursor
+built from the last position resumes the export there, so API responses
+are served one bounded page at a time.
+"""
+import asyncio
+import base64
+import binascii
+import gzip
+import json
+import os
+import re
+import time
+from collections import deque
+from typing import AsyncIterator, Awaitable, Callable, Iterable, List, Optional, Tuple
+
+from models.records import Job, ms_to_iso
+from services.file_service import create_file_service
+from services.job_index_service import load_job_index
+
+
+DEFAULT_CONCURRENCY = 8
+
+
+EXPORT_NAME_RE = re.compile(r"^jobs-\d+-[0-9a-f]{8}\.ndjson\.gz$")
+# Finished exports plus the temp files write_export renames into place
+_EXPORT_FILE_RE = re.compile(r"^jobs-\d+-[0-9a-f]{8}\.ndjson\.gz(\.\d+\.tmp)?$")
+
+
+def export_dir() -> str:
+    return os.environ.get("EXPORT_DIR", os.path.join("data", "exports"))
+
+
+def export_path(name: str) -> Optional[str]:
+    """Path of a written export file, None for names this service never produces"""
+    if not EXPORT_NAME_RE.match(name or ""):
+        return None
+    return os.path.join(export_dir(), name)
+
+
+def export_ttl_s() -> float:
+    """How long gzip exports are kept (EXPORT_TTL_HOURS, default 24); 0 keeps them forever"""
+    return max(0.0, float(os.environ.get("EXPORT_TTL_HOURS", "24")) * 3600)
+
+
+def remove_expired_exports(max_age_s: float) -> dict:
+    """
+    Delete export files (and temp files of interrupted writes) older than
+    max_age_s; returns counts of files kept and removed and the bytes freed
+    """
+    stats = {"kept": 0, "removed": 0, "bytes_freed": 0}
+    cutoff = time.time() - max_age_s
+    try:
+        entries = list(os.scandir(export_dir()))
+    except FileNotFoundError:
+        return stats
+    for entry in entries:
+        if not _EXPORT_FILE_RE.match(entry.name):
+            continue
+        try:
+            st = entry.stat()
+            if st.st_mtime < cutoff:
+                os.remove(entry.path)
+                stats["removed"] += 1
+                stats["bytes_freed"] += st.st_size
+                continue
+        except FileNotFoundError:
+            continue
+        stats["kept"] += 1
+    return stats
+
+
+def encode_cursor(position: list) -> str:
+    """URL-safe base64 without padding, so it can go into a query string as is"""
+    data = json.dumps(position, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(data).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> list:
+    """Raises ValueError for anything encode_cursor did not produce"""
+    try:
+        position = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii") + b"=" * (-len(cursor) % 4)))
+    except (binascii.Error, UnicodeError, ValueError):
+        raise ValueError("Invalid cursor")
+    if (
+        not isinstance(position, list) or len(position) != 3
+        or position[0] not in ("archive", "state")
+        or not isinstance(position[1], str)
+        or not isinstance(position[2], int if position[0] == "archive" else str)
+    ):
+        raise ValueError("Invalid cursor")
+    return position
+
+
+async def _read_ahead(items: Iterable, fetch: Callable[..., Awaitable], concurrency: int) -> AsyncIterator:
+    """Yield fetch(item) in input order with at most `concurrency` fetches in flight"""
+    window = deque()
+    try:
+        for item in items:
+            window.append(asyncio.ensure_future(fetch(item)))
+            if len(window) >= concurrency:
+                yield await window.popleft()
+        while window:
+            yield await window.popleft()
+    finally:
+        for task in window:
+            task.cancel()
+
+
+def _in_range(created_at: int, created_from: Optional[int], created_to: Optional[int]) -> bool:
+    if created_from is not None and created_at < created_from:
+        return False
+    return created_to is None or created_at < created_to
+
+
+async def iter_export(
+    state,
+    statuses: Optional[Iterable[str]] = None,
+    created_from: Optional[int] = None,
+    created_to: Optional[int] = None,
+    include_content: bool = True,
+    include_archived: bool = False,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    after: Optional[list] = None
+) -> AsyncIterator[Tuple[list, str]]:
+    """
+    Yield (position, NDJSON line with trailing newline), oldest jobs first
+
+    Args:
+        statuses: Only export these statuses (None = all)
+        created_from / created_to: Epoch-ms created_at range [from, to)
+        include_content: Read and embed each completed job's description file
+        include_archived: Also stream jobs from the cold archive (first)
+        concurrency: Read-ahead window for state reads and file reads
+        after: Resume behind this position (from a decoded cursor)
+    """
+    statuses = tuple(statuses) if statuses else None
+    file_service = create_file_service() if include_content else None
+
+    async def render(job: Job, archived: bool) -> str:
+        body = job.to_dict()
+        body["archived"] = archived
+        if include_content:
+            body["content"] = None
+            if job.status == "completed" and job.file_path:
+                body["content"] = await file_service.read_job_description(job.job_id)
+        return json.dumps(body, separators=(",", ":")) + "\n"
+
+    if include_archived and (after is None or after[0] == "archive"):
+        from services.archive_service import create_archive_service
+
+        archived = (
+            (["archive", *position], job)
+            for position, job in create_archive_service().scan(tuple(after[1:]) if after else None)
+            if (statuses is None or job.status in statuses)
+            and _in_range(job.created_at, created_from, created_to)
+        )
+
+        async def render_archived(item: Tuple[list, Job]) -> Tuple[list, str]:
+            position, job = item
+            return position, await render(job, True)
+
+        async for item in _read_ahead(archived, render_archived, concurrency):
+            yield item
+
+    index = await load_job_index(state)
+    job_ids = index.select(
+        statuses,
+        created_from=ms_to_iso(created_from),
+        created_to=ms_to_iso(created_to),
+        after=tuple(after[1:]) if after and after[0] == "state" else None
+    )
+
+    async def fetch(job_id: str) -> Optional[Tuple[list, str]]:
+        job = Job.from_state(await state.get("jobs", job_id))
+        if not job:
+            return None
+        return ["state", ms_to_iso(job.created_at), job_id], await render(job, False)
+
+    async for item in _read_ahead(job_ids, fetch, concurrency):
+        if item is not None:
+            yield item
+
+
+async def export_page(state, limit: int, cursor: Optional[str] = None, **options) -> Tuple[List[str], Optional[str]]:
+    """
+    One page of at most `limit` lines and the cursor of the next page (None
+    on the last page); raises ValueError for a bad cursor
+    """
+    after = decode_cursor(cursor) if cursor else None
+    lines = iter_export(state, after=after, **options)
+    page: List[str] = []
+    position, more = None, False
+    try:
+        async for next_position, line in lines:
+            if len(page) >= limit:
+                more = True
+                break
+            page.append(line)
+            position = next_position
+    finally:
+        # Cancels the read-ahead window
+        await lines.aclose()
+    return page, encode_cursor(position) if more else None
+
+
+async def write_export(lines: AsyncIterator[Tuple[list, str]], path: str, compress: bool = False) -> dict:
+    """Drain an export into a file (gzip when compress), one line at a time"""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    count = 0
+    opener = gzip.open if compress else open
+    with opener(tmp_path, "wt", encoding="utf-8") as f:
+        async for _, line in lines:
+            f.write(line)
+            count += 1
+    os.replace(tmp_path, path)
+    return {"name": os.path.basename(path), "count": count, "bytes": os.path.getsize(path)}
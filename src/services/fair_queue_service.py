@@ -0,0 +1,189 @@
+"""
+Fair Queue Service for job generation
+The job outbox doubles as one virtual queue per tenant. Instead of
+publishing the oldest entries first, the OutboxFlusher asks this scheduler
+which entries to release: deficit round robin over tenants, where each
+round adds FAIR_QUANTUM x the tenant's weight to its deficit and an entry
+costs its estimated tokens. Released jobs are tracked as in flight until
+GenerateJobDescription finishes them, and no more than
+FAIR_TENANT_MAX_INFLIGHT per tenant and FAIR_MAX_INFLIGHT overall are in
+flight at once. The generate-job-description topic therefore never holds
+more than a bounded amount of work, and a tenant's burst waits in its own
+queue instead of in front of everybody else's jobs.
+"""
+import os
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+from models.records import now_ms
+from services.usage_service import DEFAULT_TENANT
+
+
+INFLIGHT_GROUP = "job_inflight"
+SCHEDULER_GROUP = "job_scheduler"
+DRR_KEY = "drr"
+
+
+def quantum() -> int:
+    return max(1, int(os.environ.get("FAIR_QUANTUM", "1000")))
+
+
+def max_inflight() -> int:
+    """0 means unlimited"""
+    return max(0, int(os.environ.get("FAIR_MAX_INFLIGHT", "64")))
+
+
+def tenant_max_inflight() -> int:
+    """0 means unlimited"""
+    return max(0, int(os.environ.get("FAIR_TENANT_MAX_INFLIGHT", "16")))
+
+
+def inflight_ttl_ms() -> int:
+    """A marker older than this belongs to a job whose worker died"""
+    return int(float(os.environ.get("FAIR_INFLIGHT_TTL_S", "900")) * 1000)
+
+
+def tenant_weight(tenant: str) -> float:
+    """TENANT_WEIGHTS ("acme=4,beta=1"); unlisted tenants weigh 1"""
+    for entry in os.environ.get("TENANT_WEIGHTS", "").split(","):
+        name, _, value = entry.partition("=")
+        if name.strip() == tenant and value.strip():
+            return max(0.01, float(value))
+    return 1.0
+
+
+def entry_tenant(entry: dict) -> str:
+    return entry.get("tenant") or DEFAULT_TENANT
+
+
+def entry_cost(entry: dict) -> int:
+    """Estimated tokens of the queued job; entries without one cost a quantum"""
+    return max(1, int(entry.get("cost") or quantum()))
+
+
+async def mark_inflight(state, job_id: str, tenant: str) -> None:
+    await state.set(INFLIGHT_GROUP, job_id, {"job_id": job_id, "tenant": tenant, "since": now_ms()})
+
+
+async def release_inflight(state, job_id: str) -> None:
+    await state.delete(INFLIGHT_GROUP, job_id)
+
+
+async def inflight_by_tenant(state) -> Dict[str, int]:
+    """Live in-flight jobs per tenant; markers past FAIR_INFLIGHT_TTL_S are dropped"""
+    cutoff = now_ms() - inflight_ttl_ms()
+    counts: Dict[str, int] = {}
+    for marker in await state.get_group(INFLIGHT_GROUP) or []:
+        if not marker:
+            continue
+        if marker.get("since", 0) < cutoff:
+            await state.delete(INFLIGHT_GROUP, marker.get("job_id"))
+            continue
+        tenant = marker.get("tenant") or DEFAULT_TENANT
+        counts[tenant] = counts.get(tenant, 0) + 1
+    return counts
+
+
+def _free(cap: int, used: int) -> Optional[int]:
+    return None if cap <= 0 else max(0, cap - used)
+
+
+def schedule(
+    entries: List[dict],
+    inflight: Dict[str, int],
+    deficits: Dict[str, float],
+    last: Optional[str],
+    limit: int
+) -> Tuple[List[dict], Dict[str, float], Optional[str]]:
+    """
+    Pick up to `limit` entries by deficit round robin
+
+    entries must be ready to publish, oldest first. Returns the picked
+    entries, the deficits to carry into the next run (only for tenants that
+    still have work queued) and the tenant the next round starts after.
+    """
+    queues: Dict[str, deque] = {}
+    for entry in entries:
+        queues.setdefault(entry_tenant(entry), deque()).append(entry)
+    if not queues:
+        return [], {}, last
+
+    overall = _free(max_inflight(), sum(inflight.values()))
+    slots = limit if overall is None else min(limit, overall)
+    tenant_free = {tenant: _free(tenant_max_inflight(), inflight.get(tenant, 0)) for tenant in queues}
+
+    # Resume the rotation after the tenant served last in the previous run
+    order = sorted(queues)
+    if last in order:
+        start = order.index(last) + 1
+        order = order[start:] + order[:start]
+    active = [tenant for tenant in order if tenant_free[tenant] != 0]
+    carried = {tenant: deficits.get(tenant, 0.0) for tenant in active}
+
+    picked: List[dict] = []
+    while slots > 0 and active:
+        for tenant in list(active):
+            queue = queues[tenant]
+            carried[tenant] += quantum() * tenant_weight(tenant)
+            while queue and slots > 0 and tenant_free[tenant] != 0 and carried[tenant] >= entry_cost(queue[0]):
+                entry = queue.popleft()
+                carried[tenant] -= entry_cost(entry)
+                picked.append(entry)
+                last = tenant
+                slots -= 1
+                if tenant_free[tenant] is not None:
+                    tenant_free[tenant] -= 1
+            if not queue or tenant_free[tenant] == 0:
+                # Idle or capped tenants do not bank credit
+                active.remove(tenant)
+                carried[tenant] = 0.0
+            if slots <= 0:
+                break
+
+    remaining = {tenant: value for tenant, value in carried.items() if queues[tenant] and value > 0}
+    return picked, remaining, last
+
+
+async def load_deficits(state) -> Tuple[Dict[str, float], Optional[str]]:
+    value = await state.get(SCHEDULER_GROUP, DRR_KEY) or {}
+    return dict(value.get("deficits") or {}), value.get("last")
+
+
+async def save_deficits(state, deficits: Dict[str, float], last: Optional[str]) -> None:
+    await state.set(SCHEDULER_GROUP, DRR_KEY, {"deficits": deficits, "last": last, "updated_at": now_ms()})
+
+
+async def queue_depths(state, entries: List[dict]) -> List[dict]:
+    """Per-tenant view of the outbox and in-flight jobs (GET /queue/jobs)"""
+    now = now_ms()
+    inflight = await inflight_by_tenant(state)
+    deficits, _ = await load_deficits(state)
+    tenants: Dict[str, dict] = {}
+
+    def row(tenant: str) -> dict:
+        if tenant not in tenants:
+            tenants[tenant] = {
+                "tenant": tenant,
+                "weight": tenant_weight(tenant),
+                "queued": 0,
+                "deferred": 0,
+                "in_flight": inflight.get(tenant, 0),
+                "queued_tokens": 0,
+                "oldest_queued_at": None,
+                "deficit": round(deficits.get(tenant, 0.0), 2)
+            }
+        return tenants[tenant]
+
+    for entry in entries:
+        current = row(entry_tenant(entry))
+        if (entry.get("not_before") or 0) > now:
+            current["deferred"] += 1
+            continue
+        current["queued"] += 1
+        current["queued_tokens"] += entry_cost(entry)
+        queued_at = entry.get("queued_at")
+        if queued_at and (current["oldest_queued_at"] is None or queued_at < current["oldest_queued_at"]):
+            current["oldest_queued_at"] = queued_at
+    for tenant in inflight:
+        row(tenant)
+    return sorted(tenants.values(), key=lambda current: current["tenant"])
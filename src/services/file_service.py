@@ -1,11 +1,164 @@
 """
 File Service for managing job description files
 Reusable service for any file system operations
+
+FILE_WRITE_MODE picks how descriptions are written:
+- direct (default): write the file in place
+- atomic: write a temp file and rename it over the target, so readers and
+  crashes never see a truncated description
+- durable: atomic, plus fsync of the file before the rename and of the
+  directory after it. Directory fsyncs are group-committed: saves that
+  finish their rename within FILE_GROUP_COMMIT_MS share one fsync, and
+  each save returns once the fsync covering its rename is done.
+
+atomic and durable writes run on a pool of FILE_WRITE_THREADS threads:
+concurrent fsyncs are merged into one journal commit by the filesystem, so
+throughput grows with the number of writes in flight.
+
+With FILE_DEDUP enabled, content is stored once per SHA-256 in the .blobs
+directory and each {job_id}.txt is a hard link to its blob, so existing
+file paths and reads keep working. A blob's link count is its reference
+count: deleting a job's file drops one reference, and collect_garbage()
+removes blobs no job links to any more. Identical descriptions cost one
+link instead of a write.
 """
+import asyncio
+import hashlib
 import os
-import aiofiles
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional, Set, Tuple
+
+from services.metrics_service import registry as metrics
+
+WRITE_MODES = ("direct", "atomic", "durable")
+BLOB_DIR = ".blobs"
+
+# Directories already created by this process, so construction skips mkdir
+_created_dirs: Set[str] = set()
+
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _write_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        threads = max(1, int(os.environ.get("FILE_WRITE_THREADS", "16")))
+        _executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="file-write")
+    return _executor
+
+
+def write_mode() -> str:
+    mode = os.environ.get("FILE_WRITE_MODE", "direct").lower()
+    return mode if mode in WRITE_MODES else "direct"
+
+
+def dedup_enabled() -> bool:
+    return os.environ.get("FILE_DEDUP", "false").lower() in ("1", "true", "yes")
+
+
+def content_digest(content: str) -> str:
+    """Content address of a description (SHA-256 of its UTF-8 bytes)"""
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def _write_replace(path: str, data: bytes, durable: bool) -> None:
+    """Temp file in the same directory, optionally fsynced, renamed over path"""
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+            if durable:
+                f.flush()
+                # Data and size; the rename is made durable by the directory fsync
+                getattr(os, "fdatasync", os.fsync)(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _link_blob(blob_path: str, path: str, data: bytes, durable: bool) -> bool:
+    """
+    Point path at the blob for data, writing the blob first if needed
+
+    Returns True when the blob already existed. A blob collected between
+    the existence check and the link is simply written again.
+    """
+    for _ in range(3):
+        hit = os.path.exists(blob_path)
+        if not hit:
+            _write_replace(blob_path, data, durable)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.link(blob_path, tmp_path)
+        except FileNotFoundError:
+            continue
+        except OSError:
+            # No hard links on this filesystem: keep a private copy
+            _write_replace(path, data, durable)
+            return False
+        os.replace(tmp_path, path)
+        return hit
+    raise OSError(f"Blob {blob_path} kept disappearing while linking {path}")
+
+
+def _fsync_dir(path: str) -> None:
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class _DirectorySync:
+    """
+    Group commit for one directory's fsync
+
+    The first caller opens a group and schedules its fsync
+    FILE_GROUP_COMMIT_MS later; callers arriving before the fsync starts
+    join that group. Once it starts, new callers open the next group, so
+    every caller's rename happened before the fsync it waits for.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._group: Optional[asyncio.Future] = None
+
+    async def sync(self) -> None:
+        loop = asyncio.get_running_loop()
+        group = self._group
+        if group is None or group.get_loop() is not loop:
+            group = self._group = loop.create_future()
+            loop.create_task(self._commit(group))
+        await asyncio.shield(group)
+
+    async def _commit(self, group: asyncio.Future) -> None:
+        await asyncio.sleep(float(os.environ.get("FILE_GROUP_COMMIT_MS", "2")) / 1000.0)
+        if self._group is group:
+            self._group = None
+        try:
+            await asyncio.get_running_loop().run_in_executor(_write_executor(), _fsync_dir, self.path)
+            metrics.inc("file_dir_syncs_total")
+            group.set_result(None)
+        except Exception as e:
+            group.set_exception(e)
+
+
+_dir_syncs: Dict[str, _DirectorySync] = {}
+
+
+def _dir_sync(path: str) -> _DirectorySync:
+    sync = _dir_syncs.get(path)
+    if sync is None:
+        sync = _dir_syncs[path] = _DirectorySync(path)
+    return sync
 
 
 class FileService:
@@ -14,12 +167,15 @@ class FileService:
         self._ensure_directory_exists()
     
     def _ensure_directory_exists(self):
-        """Create base directory if it doesn't exist"""
+        """Create base directory if it doesn't exist (once per process)"""
+        if self.base_dir in _created_dirs:
+            return
         Path(self.base_dir).mkdir(parents=True, exist_ok=True)
+        _created_dirs.add(self.base_dir)
     
     async def save_job_description(self, job_id: str, content: str) -> str:
         """
-        Save job description to file system
+        Save job description to file system (see FILE_WRITE_MODE)
         
         Args:
             job_id: Unique job identifier
@@ -30,10 +186,40 @@ class FileService:
         """
         try:
             file_path = self._get_file_path(job_id)
+            started = time.perf_counter()
+            mode = write_mode()
+            data = content.encode("utf-8")
             
-            async with aiofiles.open(file_path, mode='w', encoding='utf-8') as f:
-                await f.write(content)
+            if dedup_enabled():
+                durable = mode == "durable"
+                loop = asyncio.get_running_loop()
+                hit = await loop.run_in_executor(
+                    _write_executor(), _link_blob, self._get_blob_path(content), file_path, data, durable
+                )
+                metrics.inc("cache_lookups_total", cache="content_blob", result="hit" if hit else "miss")
+                if durable:
+                    await asyncio.gather(
+                        _dir_sync(self._blob_dir()).sync(),
+                        _dir_sync(self.base_dir).sync()
+                    )
+                if hit:
+                    # Nothing written, only a link
+                    data = b""
+            elif mode == "direct" and not self._is_shared(file_path):
+                import aiofiles
+                async with aiofiles.open(file_path, mode='w', encoding='utf-8') as f:
+                    await f.write(content)
+            else:
+                # One thread hop for write, fsync and rename; also replaces
+                # a hard link to a blob instead of writing through it
+                durable = mode == "durable"
+                loop = asyncio.get_running_loop()
+                await loop.run_in_executor(_write_executor(), _write_replace, file_path, data, durable)
+                if durable:
+                    await _dir_sync(self.base_dir).sync()
             
+            metrics.observe("job_file_write_duration_seconds", time.perf_counter() - started)
+            metrics.inc("file_bytes_written_total", len(data))
             return file_path
         except Exception as e:
             raise Exception(f"Failed to save job description: {str(e)}")
@@ -54,6 +240,7 @@ class FileService:
             if not os.path.exists(file_path):
                 return None
             
+            import aiofiles
             async with aiofiles.open(file_path, mode='r', encoding='utf-8') as f:
                 content = await f.read()
             
@@ -61,10 +248,49 @@ class FileService:
         except Exception as e:
             raise Exception(f"Failed to read job description: {str(e)}")
     
+    async def read_job_description_range(
+        self,
+        job_id: str,
+        offset: int = 0,
+        length: Optional[int] = None
+    ) -> Optional[Tuple[bytes, int]]:
+        """
+        Read part of a job description without loading the whole file
+        
+        Args:
+            job_id: Unique job identifier
+            offset: First byte to read; negative reads the last -offset bytes
+            length: Bytes to read (None reads to the end)
+            
+        Returns:
+            (bytes read, total file size in bytes) or None if the file doesn't exist
+        """
+        try:
+            file_path = self._get_file_path(job_id)
+            
+            import aiofiles
+            async with aiofiles.open(file_path, mode='rb') as f:
+                total = os.fstat(f.fileno()).st_size
+                if offset < 0:
+                    offset = max(0, total + offset)
+                if offset >= total:
+                    return b"", total
+                await f.seek(offset)
+                data = await f.read(-1 if length is None else length)
+            
+            return data, total
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            raise Exception(f"Failed to read job description: {str(e)}")
+    
     async def delete_job_description(self, job_id: str) -> bool:
         """
         Delete job description file
         
+        With FILE_DEDUP this drops the job's reference to its blob; the blob
+        itself is removed by collect_garbage() once nothing links to it.
+        
         Args:
             job_id: Unique job identifier
             
@@ -82,6 +308,55 @@ class FileService:
         except Exception as e:
             raise Exception(f"Failed to delete job description: {str(e)}")
     
+    def collect_garbage(self, grace_s: float = 60.0) -> dict:
+        """
+        Remove blobs that no job file links to any more
+        
+        Blobs younger than grace_s are kept: a save may be about to link one.
+        
+        Returns:
+            Counts of blobs kept and removed, and the bytes freed
+        """
+        stats = {"blobs": 0, "removed": 0, "bytes_freed": 0}
+        cutoff = time.time() - grace_s
+        try:
+            entries = list(os.scandir(self._blob_dir()))
+        except FileNotFoundError:
+            return stats
+        for entry in entries:
+            if entry.name.endswith(".tmp"):
+                continue
+            try:
+                st = entry.stat()
+                if st.st_nlink <= 1 and st.st_mtime < cutoff:
+                    os.remove(entry.path)
+                    stats["removed"] += 1
+                    stats["bytes_freed"] += st.st_size
+                    continue
+            except FileNotFoundError:
+                continue
+            stats["blobs"] += 1
+        return stats
+    
+    @staticmethod
+    def _is_shared(file_path: str) -> bool:
+        """A hard link left by FILE_DEDUP; writing through it would change every job sharing the blob"""
+        try:
+            return os.stat(file_path).st_nlink > 1
+        except FileNotFoundError:
+            return False
+    
+    def _blob_dir(self) -> str:
+        path = os.path.join(self.base_dir, BLOB_DIR)
+        if path not in _created_dirs:
+            Path(path).mkdir(parents=True, exist_ok=True)
+            _created_dirs.add(path)
+        return path
+    
+    def _get_blob_path(self, content: str) -> str:
+        """Blob path for a description's content"""
+        return os.path.join(self._blob_dir(), f"{content_digest(content)}.txt")
+    
     def _get_file_path(self, job_id: str) -> str:
         """Generate full file path for a job ID"""
         return os.path.join(self.base_dir, f"{job_id}.txt")
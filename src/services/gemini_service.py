@@ -3,66 +3,378 @@ Gemini AI Service for generating job descriptions
 Reusable service for any AI text generation needs
 """
 import os
-from typing import Optional
+import re
+import time
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
 import asyncio
-from google import genai
+
+from models.records import now_ms
+from services.latency_service import get_tracker
+from services.metrics_service import registry as metrics
+
+
+DEFAULT_MODEL = "gemini-2.0-flash-exp"
+
+GENERATION_CONFIG = {
+    "temperature": 0.7,
+    "top_k": 40,
+    "top_p": 0.95,
+    "max_output_tokens": 1024,
+}
+
+
+def _env_flag(name: str) -> bool:
+    return os.environ.get(name, "false").lower() in ("1", "true", "yes")
+
+
+class HedgePolicy:
+    """
+    When to fire a duplicate request
+
+    The delay is the GEMINI_HEDGE_PERCENTILE of recent successful call
+    latencies (never below GEMINI_HEDGE_MIN_DELAY_MS). Hedges are paid for
+    from a credit budget: every request earns GEMINI_HEDGE_MAX_RATE credits
+    and a hedge spends one, so hedges stay below that fraction of traffic.
+    """
+
+    def __init__(self, tracker):
+        self.tracker = tracker
+        self.enabled = _env_flag("GEMINI_HEDGE_ENABLED")
+        self.percentile = float(os.environ.get("GEMINI_HEDGE_PERCENTILE", "0.95"))
+        self.max_rate = float(os.environ.get("GEMINI_HEDGE_MAX_RATE", "0.05"))
+        self.min_samples = int(os.environ.get("GEMINI_HEDGE_MIN_SAMPLES", "20"))
+        self.min_delay = float(os.environ.get("GEMINI_HEDGE_MIN_DELAY_MS", "250")) / 1000.0
+
+    def delay(self) -> Optional[float]:
+        """Seconds to wait before hedging, None when hedging is off or there is no history"""
+        if not self.enabled or self.max_rate <= 0:
+            return None
+        threshold = self.tracker.percentile(self.percentile, self.min_samples)
+        return None if threshold is None else max(self.min_delay, threshold)
+
+    def earn(self) -> None:
+        credits = self.tracker.meta.get("hedge_credits", 0.0) + self.max_rate
+        # Allow a small burst, otherwise a quiet period would bank many hedges
+        self.tracker.meta["hedge_credits"] = min(credits, 1.0 + self.max_rate * 10)
+
+    def spend(self) -> bool:
+        credits = self.tracker.meta.get("hedge_credits", 0.0)
+        if credits < 1.0:
+            return False
+        self.tracker.meta["hedge_credits"] = credits - 1.0
+        return True
+
+
+class DeadlineExceeded(Exception):
+    """The job's deadline passed before a model returned"""
+
+
+@dataclass
+class GenerationResult:
+    text: str
+    model: str
+    # Every model tried, in order; the last one produced the text
+    attempts: List[str] = field(default_factory=list)
+    # From the winning response's usage metadata (estimated when missing)
+    prompt_tokens: int = 0
+    output_tokens: int = 0
+
+
+def estimate_output_tokens(yoe: int, comp: Optional[str]) -> int:
+    """
+    Rough size of the generated posting: senior roles get longer
+    responsibility and qualification lists, and compensation adds a section
+    """
+    return 550 + 25 * min(max(int(yoe or 0), 0), 15) + (60 if comp else 0)
+
+
+def estimate_prompt_tokens(prompt: str) -> int:
+    """About four characters per token for English text"""
+    return max(1, len(prompt) // 4)
+
+
+def _retryable(error: BaseException) -> bool:
+    """Timeouts, rate limits, server errors and transport failures move to the next model"""
+    if isinstance(error, asyncio.TimeoutError):
+        return True
+    code = _error_code(error)
+    if not code.isdigit():
+        return True
+    return code in ("408", "429") or code.startswith("5")
+
+
+class ModelRouter:
+    """
+    Orders the configured model chain for one request
+
+    Each model keeps, next to its latency samples, a latency fit of the form
+    seconds = per_request + per_token * output_tokens (EWMAs of the sample
+    moments, refitted on read) and an EWMA of its error rate, plus a circuit
+    that opens for GEMINI_MODEL_COOLDOWN_S after GEMINI_MODEL_MAX_FAILURES
+    consecutive failures. The first healthy model in the chain is preferred;
+    another healthy model is moved ahead of it when its expected latency for
+    the request's output size is GEMINI_ROUTE_SLACK times lower, so a model
+    with a slow start but fast decoding wins long postings and loses short
+    ones.
+    """
+
+    ALPHA = 0.2
+    # The fit's moments average over more calls than the error rate
+    FIT_ALPHA = 0.1
+    # Output sizes must vary by this much (coefficient of variation) before
+    # the per-request and per-token costs are told apart
+    MIN_SPREAD = 0.05
+
+    def __init__(self, models: List[str]):
+        self.models = models
+        self.trackers = {model: get_tracker(f"gemini-{model}") for model in models}
+        self.slack = float(os.environ.get("GEMINI_ROUTE_SLACK", "1.5"))
+        self.max_failures = int(os.environ.get("GEMINI_MODEL_MAX_FAILURES", "3"))
+        self.cooldown = float(os.environ.get("GEMINI_MODEL_COOLDOWN_S", "30"))
+
+    def latency_model(self, model: str) -> Optional[Tuple[float, float]]:
+        """(seconds per request, seconds per output token), None before the first success"""
+        fit = self.trackers[model].meta.get("latency_fit")
+        if not fit:
+            return None
+        mean_tokens, mean_seconds = fit["tokens"], fit["seconds"]
+        variance = fit["tokens_sq"] - mean_tokens ** 2
+        covariance = fit["tokens_seconds"] - mean_tokens * mean_seconds
+        if variance > (self.MIN_SPREAD * mean_tokens) ** 2 and covariance > 0:
+            per_token = covariance / variance
+            per_request = mean_seconds - per_token * mean_tokens
+            if per_request >= 0:
+                return per_request, per_token
+        # Sizes too alike (or too noisy) to separate: all cost scales with size
+        return 0.0, mean_seconds / max(mean_tokens, 1.0)
+
+    def expected_seconds(self, model: str, output_tokens: int) -> Optional[float]:
+        costs = self.latency_model(model)
+        if costs is None:
+            return None
+        per_request, per_token = costs
+        # Each expected failure costs roughly another attempt
+        return (per_request + per_token * output_tokens) * (1.0 + self.trackers[model].meta.get("error_rate", 0.0))
+
+    def is_open(self, model: str) -> bool:
+        return self.trackers[model].meta.get("open_until", 0.0) > time.time()
+
+    def plan(self, output_tokens: int) -> List[str]:
+        healthy = [model for model in self.models if not self.is_open(model)]
+        if not healthy:
+            # Everything is cooling down: still try, in chain order
+            return list(self.models)
+
+        preferred = healthy[0]
+        preferred_seconds = self.expected_seconds(preferred, output_tokens)
+        if preferred_seconds is not None:
+            known = [(self.expected_seconds(m, output_tokens), i, m) for i, m in enumerate(healthy[1:])]
+            known = [entry for entry in known if entry[0] is not None]
+            if known:
+                best_seconds, _, best = min(known)
+                if best_seconds * self.slack < preferred_seconds:
+                    healthy.remove(best)
+                    healthy.insert(0, best)
+        return healthy
+
+    def record_success(self, model: str, seconds: float, output_tokens: int) -> None:
+        meta = self.trackers[model].meta
+        tokens = float(max(output_tokens, 1))
+        sample = {
+            "tokens": tokens,
+            "seconds": seconds,
+            "tokens_sq": tokens * tokens,
+            "tokens_seconds": tokens * seconds
+        }
+        fit = meta.get("latency_fit")
+        meta["latency_fit"] = sample if not fit else {
+            key: fit[key] + self.FIT_ALPHA * (value - fit[key]) for key, value in sample.items()
+        }
+        meta["error_rate"] = meta.get("error_rate", 0.0) * (1.0 - self.ALPHA)
+        meta["failures"] = 0
+        meta["open_until"] = 0.0
+
+    def record_failure(self, model: str) -> None:
+        meta = self.trackers[model].meta
+        meta["error_rate"] = meta.get("error_rate", 0.0) * (1.0 - self.ALPHA) + self.ALPHA
+        meta["failures"] = meta.get("failures", 0) + 1
+        if meta["failures"] >= self.max_failures:
+            meta["open_until"] = time.time() + self.cooldown
+
+    def save(self) -> None:
+        for tracker in self.trackers.values():
+            tracker.save()
+
+
+def configured_models() -> List[str]:
+    """GEMINI_MODELS: preferred model first, then the fallback chain"""
+    models = [m.strip() for m in os.environ.get("GEMINI_MODELS", DEFAULT_MODEL).split(",") if m.strip()]
+    return models or [DEFAULT_MODEL]
 
 
 class GeminiService:
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None):
         self.api_key = api_key or os.environ.get("GEMINI_API_KEY")
         if not self.api_key:
             raise ValueError("GEMINI_API_KEY environment variable is required")
         
+        # Optional endpoint override, e.g. the local fake server in benchmarks/
+        self.base_url = base_url or os.environ.get("GEMINI_BASE_URL")
+        http_options = {"base_url": self.base_url} if self.base_url else None
+        
+        # Imported here: google.genai dominates the step's cold-start time
+        from google import genai
+        
         # Initialize the Gemini client
-        self.client = genai.Client(api_key=self.api_key)
-        self.model = "gemini-2.0-flash-exp"
+        self.client = genai.Client(api_key=self.api_key, http_options=http_options)
+        self.router = ModelRouter(configured_models())
+        self.timeout = float(os.environ.get("GEMINI_TIMEOUT_S", "60"))
     
     async def generate_job_description(
         self,
         role: str,
         description: str,
         yoe: int,
-        comp: Optional[str] = None
-    ) -> str:
+        comp: Optional[str] = None,
+        deadline_at: Optional[int] = None
+    ) -> GenerationResult:
         """
         Generate a comprehensive job description using Gemini AI
         
+        Models are tried in the order picked by the router; a timeout, rate
+        limit or server error falls back to the next model instead of failing.
+        
         Args:
             role: Job title/role
             description: Brief job description (100-150 chars)
             yoe: Years of experience required
             comp: Optional compensation details
+            deadline_at: Epoch ms; every attempt is capped at the time left
+                and the in-flight request is cancelled when it runs out
             
         Returns:
-            Generated job description as string
+            GenerationResult with the text and the model that produced it
+            
+        Raises:
+            DeadlineExceeded: deadline_at passed before any model returned
         """
         prompt = self._build_prompt(role, description, yoe, comp)
+        output_tokens = estimate_output_tokens(yoe, comp)
+        plan = self.router.plan(output_tokens)
         
+        attempts = []
+        last_error = None
         try:
-            # Generate content using Gemini Client API
-            # Run in executor to make it async-compatible
-            loop = asyncio.get_event_loop()
-            response = await loop.run_in_executor(
-                None,
-                lambda: self.client.models.generate_content(
-                    model=self.model,
-                    contents=prompt,
-                    config={
-                        "temperature": 0.7,
-                        "top_k": 40,
-                        "top_p": 0.95,
-                        "max_output_tokens": 1024,
-                    }
+            for model in plan:
+                timeout = self.timeout
+                if deadline_at is not None:
+                    remaining = (deadline_at - now_ms()) / 1000.0
+                    if remaining <= 0:
+                        raise DeadlineExceeded(f"Deadline passed after trying {attempts or 'no models'}")
+                    timeout = min(timeout, remaining)
+                
+                attempts.append(model)
+                started = time.perf_counter()
+                try:
+                    response = await asyncio.wait_for(self._generate_hedged(prompt, model), timeout)
+                except Exception as e:
+                    if isinstance(e, asyncio.TimeoutError) and timeout < self.timeout:
+                        # Cut short by the job deadline, not the model's fault
+                        raise DeadlineExceeded(f"Deadline passed while waiting for {model}")
+                    last_error = e
+                    self.router.record_failure(model)
+                    code = "timeout" if isinstance(e, asyncio.TimeoutError) else _error_code(e)
+                    if code == "timeout":
+                        metrics.inc("gemini_errors_total", model=model, code=code)
+                    if not _retryable(e):
+                        break
+                    if len(attempts) < len(plan):
+                        metrics.inc("gemini_fallbacks_total", model=model, code=code)
+                    continue
+                
+                elapsed = time.perf_counter() - started
+                response_tokens = _output_tokens(response)
+                request_tokens = _prompt_tokens(response, prompt)
+                self.router.record_success(model, elapsed, response_tokens)
+                metrics.observe("job_generation_duration_seconds", elapsed, model=model)
+                metrics.inc("gemini_tokens_total", request_tokens, model=model, kind="prompt")
+                metrics.inc("gemini_tokens_total", response_tokens, model=model, kind="output")
+                return GenerationResult(
+                    text=response.text.strip(),
+                    model=model,
+                    attempts=attempts,
+                    prompt_tokens=request_tokens,
+                    output_tokens=response_tokens
                 )
-            )
             
-            return response.text.strip()
+            raise last_error
+        except DeadlineExceeded:
+            raise
         except Exception as e:
             raise Exception(f"Failed to generate job description: {str(e)}")
+        finally:
+            self.router.save()
     
+    async def _call(self, prompt: str, model: str):
+        """One generate_content request on the async client (cancellable)"""
+        metrics.inc("gemini_requests_total", model=model)
+        started = time.perf_counter()
+        try:
+            response = await self.client.aio.models.generate_content(
+                model=model,
+                contents=prompt,
+                config=GENERATION_CONFIG
+            )
+        except Exception as e:
+            code = _error_code(e)
+            metrics.inc("gemini_errors_total", model=model, code=code)
+            if code == "429":
+                metrics.inc("gemini_rate_limited_total", model=model)
+            raise
+        self.router.trackers[model].record(time.perf_counter() - started)
+        return response
+    
+    async def _generate_hedged(self, prompt: str, model: str):
+        """
+        Send the request; if it is still running after the hedge delay and
+        the budget allows, send a duplicate. The first successful response
+        wins and the other request is cancelled, as are both when the caller
+        is cancelled (deadline or timeout) at any point.
+        """
+        hedge = HedgePolicy(self.router.trackers[model])
+        hedge.earn()
+        delay = hedge.delay()
+        primary = asyncio.ensure_future(self._call(prompt, model))
+        tasks = [primary]
+        try:
+            if delay is None:
+                return await primary
+            
+            done, _ = await asyncio.wait({primary}, timeout=delay)
+            if done or not hedge.spend():
+                return await primary
+            
+            metrics.inc("gemini_hedges_total", model=model)
+            duplicate = asyncio.ensure_future(self._call(prompt, model))
+            tasks.append(duplicate)
+            pending = {primary, duplicate}
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if not task.cancelled() and task.exception() is None:
+                        if task is duplicate:
+                            metrics.inc("gemini_hedges_won_total", model=model)
+                        return task.result()
+            # Both failed: surface the primary's error
+            return primary.result()
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+    
+    @staticmethod
     def _build_prompt(
-        self, 
         role: str, 
         description: str, 
         yoe: int, 
@@ -92,6 +404,39 @@ Make it professional, engaging, and suitable for posting on job boards.
         return prompt
 
 
+def _output_tokens(response) -> int:
+    """Output token count from usage metadata, estimated from the text when missing"""
+    usage = getattr(response, "usage_metadata", None)
+    count = getattr(usage, "candidates_token_count", None) if usage else None
+    if isinstance(count, int) and count > 0:
+        return count
+    return max(1, len(response.text or "") // 4)
+
+
+def _prompt_tokens(response, prompt: str) -> int:
+    """Prompt token count from usage metadata, estimated from the prompt when missing"""
+    usage = getattr(response, "usage_metadata", None)
+    count = getattr(usage, "prompt_token_count", None) if usage else None
+    if isinstance(count, int) and count > 0:
+        return count
+    return estimate_prompt_tokens(prompt)
+
+
+def _error_code(error: BaseException) -> str:
+    """HTTP status of a Gemini API error, or the exception type when there is none"""
+    code = getattr(error, "code", None)
+    if isinstance(code, int):
+        return str(code)
+    match = re.match(r"\s*(\d{3})\b", str(error))
+    return match.group(1) if match else type(error).__name__
+
+
+def estimate_job_tokens(role: str, description: str, yoe: int, comp: Optional[str] = None) -> int:
+    """Prompt plus expected output tokens for one job, before any call is made"""
+    prompt = GeminiService._build_prompt(role, description, yoe, comp)
+    return estimate_prompt_tokens(prompt) + estimate_output_tokens(yoe, comp)
+
+
 # Factory function for easy instantiation
 def create_gemini_service() -> GeminiService:
     """Create and return a configured GeminiService instance"""
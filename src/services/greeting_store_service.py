@@ -0,0 +1,123 @@
+"""
+Greeting Store Service for the hello-world flow
+GET /hello is a common health-check target, so greetings are kept in fixed
+storage: the latest ones in a ring of GREETINGS_RING_SIZE slots, written in
+turn from a cursor kept in the same group, and per-minute counters in a ring
+of GREETINGS_STATS_MINUTES buckets. A bucket belonging to an older minute is
+reset when its slot comes round again, so neither state group grows with
+traffic.
+"""
+import os
+from typing import Optional
+
+from models.records import iso_to_ms, ms_to_iso, now_ms
+
+
+GREETINGS_GROUP = "greetings"
+STATS_GROUP = "greeting_stats"
+# Next ring slot to write, {"next": n}
+CURSOR_KEY = "cursor"
+
+
+def ring_size() -> int:
+    return max(1, int(os.environ.get("GREETINGS_RING_SIZE", "50")))
+
+
+def stats_minutes() -> int:
+    return max(1, int(os.environ.get("GREETINGS_STATS_MINUTES", "60")))
+
+
+def ttl_seconds() -> float:
+    return float(os.environ.get("GREETINGS_TTL_SECONDS", "3600"))
+
+
+def ring_key(slot: int) -> str:
+    return f"recent-{slot % ring_size()}"
+
+
+def minute_key(minute: int) -> str:
+    return f"minute-{minute % stats_minutes()}"
+
+
+async def record_greeting(state, request_id: str, greeting: str, original_timestamp: Optional[str]) -> None:
+    """
+    Store a greeting in the next ring slot, overwriting the oldest one, and
+    count it in the current minute
+
+    The cursor and the counter are read-modify-writes, so two processes
+    recording at the same instant can share a slot or drop a count; fine for
+    probe statistics.
+    """
+    processed_at = now_ms()
+    cursor = await state.get(GREETINGS_GROUP, CURSOR_KEY) or {}
+    slot = int(cursor.get("next", 0)) % ring_size()
+    await state.set(GREETINGS_GROUP, CURSOR_KEY, {"next": slot + 1})
+    await state.set(GREETINGS_GROUP, ring_key(slot), {
+        "requestId": request_id,
+        "greeting": greeting,
+        "processedAt": ms_to_iso(processed_at),
+        "originalTimestamp": original_timestamp
+    })
+
+    minute = processed_at // 60_000
+    key = minute_key(minute)
+    bucket = await state.get(STATS_GROUP, key)
+    if not bucket or bucket.get("minute") != minute:
+        bucket = {"minute": minute, "count": 0}
+    bucket["count"] += 1
+    bucket["last"] = processed_at
+    await state.set(STATS_GROUP, key, bucket)
+
+
+async def greeting_stats(state) -> dict:
+    """Roll up the live minute buckets (one group read of at most GREETINGS_STATS_MINUTES values)"""
+    current = now_ms() // 60_000
+    oldest = current - stats_minutes() + 1
+    buckets = [
+        bucket for bucket in (await state.get_group(STATS_GROUP) or [])
+        if bucket and oldest <= bucket.get("minute", -1) <= current
+    ]
+    buckets.sort(key=lambda bucket: bucket["minute"])
+    last = max((bucket.get("last", 0) for bucket in buckets), default=None)
+    return {
+        "total": sum(bucket["count"] for bucket in buckets),
+        "window_minutes": stats_minutes(),
+        "last_greeting_at": ms_to_iso(last),
+        "per_minute": [
+            {"minute": ms_to_iso(bucket["minute"] * 60_000), "count": bucket["count"]}
+            for bucket in buckets
+        ]
+    }
+
+
+async def prune_greetings(state) -> dict:
+    """
+    Delete anything outside the rings: records written before retention
+    (one per requestId), ring slots older than GREETINGS_TTL_SECONDS, slots
+    beyond a shrunk ring size and stale minute buckets; the cursor is kept
+    """
+    ttl_cutoff = now_ms() - int(ttl_seconds() * 1000)
+    live_slots = {f"recent-{i}" for i in range(ring_size())}
+    removed = {"greetings": 0, "stats": 0}
+
+    for key in await state.keys(GREETINGS_GROUP) or []:
+        if key == CURSOR_KEY:
+            continue
+        if key in live_slots:
+            value = await state.get(GREETINGS_GROUP, key) or {}
+            processed_at = iso_to_ms(value.get("processedAt"))
+            if processed_at is not None and processed_at >= ttl_cutoff:
+                continue
+        await state.delete(GREETINGS_GROUP, key)
+        removed["greetings"] += 1
+
+    oldest = now_ms() // 60_000 - stats_minutes() + 1
+    live_buckets = {f"minute-{i}" for i in range(stats_minutes())}
+    for key in await state.keys(STATS_GROUP) or []:
+        bucket = await state.get(STATS_GROUP, key) or {}
+        if key in live_buckets and bucket.get("minute", -1) >= oldest:
+            continue
+        await state.delete(STATS_GROUP, key)
+        removed["stats"] += 1
+    return removed
+
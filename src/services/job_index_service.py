@@ -0,0 +1,450 @@
+"""
+Job Index Service for faceted job queries
+Keeps a compact facet row per job in state and answers filter queries
+from in-memory indexes instead of loading every job record. Every row
+write is also appended to a changelog of time buckets (one state group per
+LOG_BUCKET_MS), so a warm process catches up by reading the last few
+buckets instead of reloading the whole index group.
+"""
+import bisect
+import os
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from models.records import Job, ms_to_iso, now_ms
+from services.metrics_service import registry as metrics
+
+
+INDEX_GROUP = "job_index"
+INDEX_LOG_GROUP = "job_index_log"
+LOG_BUCKET_MS = 10_000
+# Changes stamped shortly before a refresh may land after it; re-read them
+LOG_OVERLAP_MS = 2_000
+JOB_STATUSES = ("pending", "processing", "completed", "failed", "timed_out")
+
+# Row layout stored in state: [job_id, status, yoe, role_norm, has_comp, created_at]
+_MAX_KEY = "\uffff"
+# Role prefixes whose aggregated mask is kept up to date between queries
+PREFIX_CACHE_SIZE = 256
+
+
+def normalize_role(role: Optional[str]) -> str:
+    """Lowercase and collapse whitespace so prefixes match regardless of formatting"""
+    return " ".join(str(role or "").lower().split())
+
+
+def job_to_row(job: Job) -> list:
+    """Build the compact facet row for a job record"""
+    return [
+        job.job_id,
+        job.status or "pending",
+        int(job.yoe or 0),
+        normalize_role(job.role),
+        bool(job.comp),
+        # ISO string so rows written before epoch-ms records still sort together
+        ms_to_iso(job.created_at) or "",
+    ]
+
+
+class JobIndex:
+    """
+    Bitset-backed facet index
+
+    Every job gets a bit position (assigned in created_at order, so higher bits
+    are newer jobs). Each facet value maps to an int bitmask; filters are ANDs
+    of masks and facet counts are popcounts, so a query never touches rows.
+    Range and prefix lookups bisect the sorted distinct yoe values and
+    normalized roles, then OR the masks of the values in range. The OR of a
+    role prefix is kept after its first query and updated on every write,
+    like a trie node's aggregate, so repeated prefix filters (typically short
+    ones matching many roles) cost one lookup.
+    """
+
+    def __init__(self):
+        self._slots: Dict[str, int] = {}
+        self._ids: List[Optional[str]] = []
+        self._rows: Dict[str, tuple] = {}
+        self._live = 0
+        self._with_comp = 0
+        self._by_status: Dict[str, int] = {}
+        self._by_yoe: Dict[int, int] = {}
+        self._yoe_values: List[int] = []
+        self._by_role: Dict[str, int] = {}
+        self._role_values: List[str] = []
+        # role prefix -> OR of the role masks under it, oldest query first
+        self._prefix_masks: Dict[str, int] = {}
+        self.loaded_at = 0.0
+        # Wall-clock ms up to which changelog entries have been applied
+        self.synced_at = 0
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, job_id: str) -> bool:
+        return job_id in self._rows
+
+    def bulk_load(self, rows: Iterable) -> None:
+        """Build all masks in one pass, much cheaper than repeated upserts"""
+        rows = sorted((row for row in rows if row and row[0]), key=lambda row: row[5] or "")
+        bitmaps: Dict[tuple, bytearray] = {}
+        size = (len(self._ids) + len(rows)) // 8 + 1
+
+        def mark(key, bit):
+            bitmap = bitmaps.get(key)
+            if bitmap is None:
+                bitmap = bitmaps[key] = bytearray(size)
+            bitmap[bit >> 3] |= 1 << (bit & 7)
+
+        for row in rows:
+            job_id, status, yoe, role, has_comp, created_at = row
+            if job_id in self._rows:
+                self.upsert(row)
+                continue
+            bit = len(self._ids)
+            self._ids.append(job_id)
+            self._slots[job_id] = bit
+            self._rows[job_id] = (status, yoe, role, has_comp, created_at)
+            mark(("live",), bit)
+            mark(("status", status), bit)
+            mark(("yoe", yoe), bit)
+            mark(("role", role), bit)
+            if has_comp:
+                mark(("comp",), bit)
+
+        for key, bitmap in bitmaps.items():
+            mask = int.from_bytes(bitmap, "little")
+            if key[0] == "live":
+                self._live |= mask
+            elif key[0] == "comp":
+                self._with_comp |= mask
+            elif key[0] == "status":
+                self._by_status[key[1]] = self._by_status.get(key[1], 0) | mask
+            elif key[0] == "yoe":
+                self._add_value(self._by_yoe, self._yoe_values, key[1], mask)
+            else:
+                self._add_value(self._by_role, self._role_values, key[1], mask)
+        # Rebuilt lazily from the role masks
+        self._prefix_masks.clear()
+
+    def upsert(self, row: Iterable) -> None:
+        """Insert or replace a facet row"""
+        job_id, status, yoe, role, has_comp, created_at = row
+        bit = self._slots.get(job_id)
+        if bit is None:
+            bit = len(self._ids)
+            self._ids.append(job_id)
+            self._slots[job_id] = bit
+        else:
+            self._clear(job_id, bit)
+
+        flag = 1 << bit
+        self._rows[job_id] = (status, yoe, role, has_comp, created_at)
+        self._live |= flag
+        self._by_status[status] = self._by_status.get(status, 0) | flag
+        self._add_value(self._by_yoe, self._yoe_values, yoe, flag)
+        self._add_value(self._by_role, self._role_values, role, flag)
+        self._update_prefixes(role, flag, True)
+        if has_comp:
+            self._with_comp |= flag
+
+    def remove(self, job_id: str) -> bool:
+        """Drop a job from every index, returns False if it was not indexed"""
+        bit = self._slots.pop(job_id, None)
+        if bit is None:
+            return False
+        self._clear(job_id, bit)
+        self._ids[bit] = None
+        return True
+
+    def select(
+        self,
+        statuses: Optional[Iterable[str]] = None,
+        created_from: Optional[str] = None,
+        created_to: Optional[str] = None,
+        after: Optional[Tuple[str, str]] = None
+    ) -> List[str]:
+        """
+        job_ids by status and ISO created_at range [created_from, created_to)
+
+        Returned oldest first by (created_at, job_id); after skips every job
+        up to and including that key, for keyset pagination. Only facet rows
+        are read, so callers can filter before loading any record.
+        """
+        if statuses is None:
+            mask = self._live
+        else:
+            mask = self._union(self._by_status, [s for s in statuses if s in self._by_status])
+        keys = []
+        while mask:
+            low = mask & -mask
+            mask ^= low
+            job_id = self._ids[low.bit_length() - 1]
+            created_at = self._rows[job_id][4]
+            if created_from is not None and created_at < created_from:
+                continue
+            if created_to is not None and created_at >= created_to:
+                continue
+            keys.append((created_at, job_id))
+        keys.sort()
+        if after is not None:
+            keys = keys[bisect.bisect_right(keys, tuple(after)):]
+        return [job_id for _, job_id in keys]
+
+    def status_counts(self) -> Dict[str, int]:
+        """Status summary over all indexed jobs"""
+        counts = {status: 0 for status in JOB_STATUSES}
+        for status, mask in self._by_status.items():
+            counts[status] = mask.bit_count()
+        return counts
+
+    def query(
+        self,
+        status: Optional[str] = None,
+        yoe_min: Optional[int] = None,
+        yoe_max: Optional[int] = None,
+        role_prefix: Optional[str] = None,
+        has_comp: Optional[bool] = None,
+        limit: int = 50,
+        offset: int = 0
+    ) -> dict:
+        """
+        Run a faceted query against the indexes
+
+        Returns:
+            Dict with the page of matching job_ids (newest first), total
+            match count and facet counts over the matched set
+        """
+        mask = self._live
+
+        if status is not None:
+            mask &= self._by_status.get(status, 0)
+
+        if yoe_min is not None or yoe_max is not None:
+            lo = bisect.bisect_left(self._yoe_values, yoe_min) if yoe_min is not None else 0
+            hi = (
+                bisect.bisect_right(self._yoe_values, yoe_max)
+                if yoe_max is not None else len(self._yoe_values)
+            )
+            mask &= self._union(self._by_yoe, self._yoe_values[lo:hi])
+
+        if role_prefix:
+            mask &= self._role_prefix_mask(normalize_role(role_prefix))
+
+        if has_comp is True:
+            mask &= self._with_comp
+        elif has_comp is False:
+            mask &= ~self._with_comp
+
+        with_comp = (mask & self._with_comp).bit_count()
+        total = mask.bit_count()
+        facets = {
+            "status": {s: 0 for s in JOB_STATUSES},
+            "has_comp": {"true": with_comp, "false": total - with_comp}
+        }
+        for s, status_mask in self._by_status.items():
+            facets["status"][s] = (mask & status_mask).bit_count()
+
+        return {
+            "job_ids": self._newest(mask, offset, limit),
+            "total": total,
+            "facets": facets
+        }
+
+    def _newest(self, mask: int, offset: int, limit: int) -> List[str]:
+        """Walk set bits from the top (newest) down"""
+        page = []
+        skipped = 0
+        while mask and len(page) < limit:
+            bit = mask.bit_length() - 1
+            mask ^= 1 << bit
+            if skipped < offset:
+                skipped += 1
+                continue
+            page.append(self._ids[bit])
+        return page
+
+    def _clear(self, job_id: str, bit: int) -> None:
+        row = self._rows.pop(job_id, None)
+        if row is None:
+            return
+        status, yoe, role, has_comp, _ = row
+        flag = 1 << bit
+        self._live &= ~flag
+        self._by_status[status] = self._by_status.get(status, 0) & ~flag
+        self._remove_value(self._by_yoe, self._yoe_values, yoe, flag)
+        self._remove_value(self._by_role, self._role_values, role, flag)
+        self._update_prefixes(role, flag, False)
+        if has_comp:
+            self._with_comp &= ~flag
+
+    def _role_prefix_mask(self, prefix: str) -> int:
+        mask = self._prefix_masks.get(prefix)
+        if mask is None:
+            lo = bisect.bisect_left(self._role_values, prefix)
+            hi = bisect.bisect_left(self._role_values, prefix + _MAX_KEY)
+            mask = self._union(self._by_role, self._role_values[lo:hi])
+            if len(self._prefix_masks) >= PREFIX_CACHE_SIZE:
+                del self._prefix_masks[next(iter(self._prefix_masks))]
+            self._prefix_masks[prefix] = mask
+        return mask
+
+    def _update_prefixes(self, role: str, flag: int, add: bool) -> None:
+        """Set or clear a job's bit in every cached prefix of its role"""
+        if not self._prefix_masks:
+            return
+        for end in range(len(role) + 1):
+            prefix = role[:end]
+            mask = self._prefix_masks.get(prefix)
+            if mask is not None:
+                self._prefix_masks[prefix] = mask | flag if add else mask & ~flag
+
+    @staticmethod
+    def _union(masks: dict, values: list) -> int:
+        result = 0
+        for value in values:
+            result |= masks[value]
+        return result
+
+    @staticmethod
+    def _add_value(masks: dict, values: list, value, flag: int) -> None:
+        if value not in masks:
+            bisect.insort(values, value)
+            masks[value] = flag
+        else:
+            masks[value] |= flag
+
+    @staticmethod
+    def _remove_value(masks: dict, values: list, value, flag: int) -> None:
+        mask = masks.get(value, 0) & ~flag
+        if mask:
+            masks[value] = mask
+            return
+        masks.pop(value, None)
+        pos = bisect.bisect_left(values, value)
+        if pos < len(values) and values[pos] == value:
+            del values[pos]
+
+
+# Process-wide index, caught up from the changelog once it is older than the TTL
+_index: Optional[JobIndex] = None
+
+
+def _ttl_seconds() -> float:
+    return float(os.environ.get("JOB_INDEX_TTL_MS", "1000")) / 1000.0
+
+
+def _log_retention_ms() -> int:
+    """Changelog buckets older than this are trimmed by the OutboxFlusher"""
+    return int(float(os.environ.get("JOB_INDEX_LOG_RETENTION_S", "600")) * 1000)
+
+
+def _log_group(bucket: int) -> str:
+    return f"{INDEX_LOG_GROUP}:{bucket}"
+
+
+async def _store_row(state, job_id: str, row: Optional[list]) -> None:
+    """Write (or delete, row=None) a facet row and record the change"""
+    at = now_ms()
+    if row is None:
+        await state.delete(INDEX_GROUP, job_id)
+    else:
+        await state.set(INDEX_GROUP, job_id, row)
+    await state.set(_log_group(at // LOG_BUCKET_MS), job_id, {"job_id": job_id, "row": row, "at": at})
+
+
+async def _catch_up(state, index: JobIndex) -> int:
+    """Apply changelog entries since the index was last synced, oldest first"""
+    now = now_ms()
+    since = index.synced_at - LOG_OVERLAP_MS
+    changes = []
+    for bucket in range(since // LOG_BUCKET_MS, now // LOG_BUCKET_MS + 1):
+        for change in await state.get_group(_log_group(bucket)) or []:
+            if change and change.get("at", 0) >= since:
+                changes.append(change)
+
+    changes.sort(key=lambda change: change["at"])
+    for change in changes:
+        if change.get("row"):
+            index.upsert(change["row"])
+        else:
+            index.remove(change["job_id"])
+    index.synced_at = now
+    return len(changes)
+
+
+async def load_job_index(state) -> JobIndex:
+    """
+    Return the in-process job index, caught up with changes from other processes
+
+    Within JOB_INDEX_TTL_MS the cached index is returned as is; after that
+    only the changelog buckets written since the last sync are read. The
+    whole index group is loaded only by a cold process or one that has not
+    synced within the changelog retention. The first load on an empty index
+    group backfills rows from the jobs group, so existing deployments get
+    facets without a migration step.
+    """
+    global _index
+
+    if _index is not None:
+        if time.monotonic() - _index.loaded_at < _ttl_seconds():
+            metrics.inc("cache_lookups_total", cache="job_index", result="hit")
+            return _index
+        # One bucket of slack in case the trimmer runs while we read
+        if now_ms() - _index.synced_at + LOG_OVERLAP_MS + LOG_BUCKET_MS <= _log_retention_ms():
+            await _catch_up(state, _index)
+            _index.loaded_at = time.monotonic()
+            metrics.inc("cache_lookups_total", cache="job_index", result="hit")
+            return _index
+    metrics.inc("cache_lookups_total", cache="job_index", result="miss")
+
+    index = JobIndex()
+    # Changes made while the group is read are replayed by the next catch-up
+    index.synced_at = now_ms()
+    rows = await state.get_group(INDEX_GROUP) or []
+
+    if not rows:
+        for key in await state.keys("jobs") or []:
+            job = Job.from_state(await state.get("jobs", key))
+            if job:
+                row = job_to_row(job)
+                await _store_row(state, row[0], row)
+                rows.append(row)
+
+    index.bulk_load(rows)
+
+    index.loaded_at = time.monotonic()
+    _index = index
+    return index
+
+
+async def index_job(state, job: Job) -> None:
+    """Write-through update of a job's facet row (state + in-process index)"""
+    row = job_to_row(job)
+    await _store_row(state, row[0], row)
+    if _index is not None:
+        _index.upsert(row)
+
+
+async def unindex_job(state, job_id: str) -> None:
+    """Remove a job's facet row (state + in-process index)"""
+    await _store_row(state, job_id, None)
+    if _index is not None:
+        _index.remove(job_id)
+
+
+async def trim_index_log(state, max_buckets: int = 360) -> int:
+    """
+    Clear changelog buckets older than JOB_INDEX_LOG_RETENTION_S
+
+    Buckets are cleared in order from the last trimmed one, at most
+    max_buckets per call; returns how many were cleared.
+    """
+    cutoff = (now_ms() - _log_retention_ms()) // LOG_BUCKET_MS
+    marker = await state.get(INDEX_LOG_GROUP, "trimmed_through")
+    start = marker["bucket"] + 1 if marker else cutoff
+    end = min(cutoff, start + max_buckets)
+    for bucket in range(start, end):
+        await state.clear(_log_group(bucket))
+    if not marker or end > start:
+        await state.set(INDEX_LOG_GROUP, "trimmed_through", {"bucket": end - 1})
+    return max(0, end - start)
@@ -0,0 +1,22 @@
+"""
+Job Lookup Service
+Finds a job wherever it currently lives: the jobs state group, the outbox
+(accepted but not yet published) or the cold archive. A job in state costs
+one state read; the other places are only tried on a miss.
+"""
+from typing import Optional, Tuple
+
+from models.records import Job
+from services.archive_service import create_archive_service
+from services.outbox_service import get_queued_job
+
+
+async def find_job(state, job_id: str) -> Tuple[Optional[Job], bool]:
+    """The job (or None) and whether it came from the archive"""
+    job = Job.from_state(await state.get("jobs", job_id))
+    if not job:
+        job = await get_queued_job(state, job_id)
+    if not job:
+        job = create_archive_service().get(job_id)
+        return job, job is not None
+    return job, False
@@ -0,0 +1,82 @@
+"""
+Latency Service for adaptive timeouts
+Keeps a ring of recent latency samples per operation. Step handlers run in
+short-lived processes, so the ring (plus a small metadata dict for callers,
+e.g. a hedge budget) is persisted to a JSON file per operation and shared by
+every process on the host. Writes are last-writer-wins; losing a sample to a
+concurrent writer only makes the percentile slightly less fresh.
+"""
+import json
+import os
+import re
+from typing import Dict, List, Optional
+
+
+DEFAULT_SIZE = 200
+
+_SAFE_NAME_RE = re.compile(r"[^A-Za-z0-9_.-]+")
+
+# Per-process cache so repeated lookups in one process skip the file read
+_trackers: Dict[str, "LatencyTracker"] = {}
+
+
+def latency_dir() -> str:
+    return os.environ.get("LATENCY_DIR", os.path.join("data", "latency"))
+
+
+class LatencyTracker:
+    def __init__(self, name: str, size: int = DEFAULT_SIZE, path: Optional[str] = None):
+        self.name = name
+        self.size = size
+        self.path = path or os.path.join(latency_dir(), f"{_SAFE_NAME_RE.sub('_', name)}.json")
+        self.samples: List[float] = []
+        self.meta: dict = {}
+        self._next = 0
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        self.samples = [float(s) for s in data.get("samples", [])][-self.size:]
+        self._next = int(data.get("next", len(self.samples))) % self.size
+        self.meta = data.get("meta") or {}
+
+    def save(self) -> None:
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump({"samples": self.samples, "next": self._next, "meta": self.meta}, f)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            # Read-only filesystem: the tracker still works within this process
+            pass
+
+    def __len__(self) -> int:
+        return len(self.samples)
+
+    def record(self, seconds: float) -> None:
+        if len(self.samples) < self.size:
+            self.samples.append(seconds)
+        else:
+            self.samples[self._next] = seconds
+        self._next = (self._next + 1) % self.size
+
+    def percentile(self, q: float, min_samples: int = 1) -> Optional[float]:
+        """q in [0, 1] by nearest rank; None until min_samples are recorded"""
+        if len(self.samples) < max(1, min_samples):
+            return None
+        ordered = sorted(self.samples)
+        rank = min(len(ordered) - 1, max(0, int(round(q * len(ordered))) - 1))
+        return ordered[rank]
+
+
+def get_tracker(name: str, size: int = DEFAULT_SIZE) -> LatencyTracker:
+    """Process-wide tracker for an operation, loaded from disk on first use"""
+    tracker = _trackers.get(name)
+    if tracker is None:
+        tracker = _trackers[name] = LatencyTracker(name, size)
+    return tracker
@@ -0,0 +1,134 @@
+"""
+Log Service for sampled, level-gated step logging
+Wraps context.logger with per-step sampling and lazy payloads so hot read
+paths do no logging work when a line is dropped, while errors and slow
+invocations are always logged
+"""
+import os
+import random
+import time
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+
+LEVELS = {"debug": 10, "info": 20, "warn": 30, "error": 40}
+MAX_BUFFERED = 32
+
+Payload = Union[None, dict, Callable[[], dict]]
+
+
+@lru_cache(maxsize=8)
+def _parse_rates(raw: str) -> Dict[str, float]:
+    """LOG_SAMPLE_RATES="ListJobs=0.01,GetJob=0.05" -> {"ListJobs": 0.01, ...}"""
+    rates = {}
+    for item in raw.split(","):
+        name, _, value = item.partition("=")
+        if name.strip() and value.strip():
+            try:
+                rates[name.strip()] = min(1.0, max(0.0, float(value)))
+            except ValueError:
+                continue
+    return rates
+
+
+def sample_rate(step: str) -> float:
+    rates = _parse_rates(os.environ.get("LOG_SAMPLE_RATES", ""))
+    if step in rates:
+        return rates[step]
+    try:
+        return min(1.0, max(0.0, float(os.environ.get("LOG_SAMPLE_RATE", "1"))))
+    except ValueError:
+        return 1.0
+
+
+def log_level() -> int:
+    return LEVELS.get(os.environ.get("LOG_LEVEL", "info").lower(), LEVELS["info"])
+
+
+def slow_threshold_ms() -> float:
+    try:
+        return float(os.environ.get("LOG_SLOW_MS", "1000"))
+    except ValueError:
+        return 1000.0
+
+
+def _build(payload: Payload) -> Optional[dict]:
+    return payload() if callable(payload) else payload
+
+
+class StepLogger:
+    """
+    Per-invocation logger for a step
+
+    The sampling decision is made once per invocation, so a sampled request
+    keeps all of its lines. Lines from unsampled requests are buffered
+    unbuilt (message plus payload callable) and only rendered if the request
+    turns out to be slow or fails.
+    """
+
+    def __init__(self, context, step: str, rate: Optional[float] = None, slow_ms: Optional[float] = None):
+        self.logger = context.logger
+        self.step = step
+        self.rate = sample_rate(step) if rate is None else rate
+        self.level = log_level()
+        self.slow_ms = slow_threshold_ms() if slow_ms is None else slow_ms
+        self.sampled = self.rate >= 1.0 or random.random() < self.rate
+        self._buffer: List[Tuple[str, str, Payload]] = []
+        self._start = time.perf_counter()
+
+    def _emit(self, level: str, message: str, payload: Payload) -> None:
+        data = _build(payload)
+        if self.rate < 1.0:
+            data = {**(data or {}), "log_sample_rate": self.rate}
+        getattr(self.logger, level)(message, data)
+
+    def _log(self, level: str, message: str, payload: Payload) -> None:
+        if LEVELS[level] < self.level:
+            return
+        if self.sampled:
+            self._emit(level, message, payload)
+        elif self.slow_ms > 0 and len(self._buffer) < MAX_BUFFERED:
+            self._buffer.append((level, message, payload))
+
+    def debug(self, message: str, payload: Payload = None) -> None:
+        self._log("debug", message, payload)
+
+    def info(self, message: str, payload: Payload = None) -> None:
+        self._log("info", message, payload)
+
+    def warn(self, message: str, payload: Payload = None) -> None:
+        """Warnings are level-gated but never sampled"""
+        if LEVELS["warn"] >= self.level:
+            self.logger.warn(message, _build(payload))
+
+    def error(self, message: str, payload: Payload = None) -> None:
+        """Errors are always logged, along with any lines dropped by sampling"""
+        self._flush_buffer()
+        self.logger.error(message, _build(payload))
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self._start) * 1000
+
+    def finish(self, **attributes: Any) -> None:
+        """Log the buffered lines and a slow-request warning if over LOG_SLOW_MS"""
+        elapsed = self.elapsed_ms()
+        if self.slow_ms <= 0 or elapsed < self.slow_ms:
+            self._buffer.clear()
+            return
+        self._flush_buffer()
+        self.logger.warn("Slow request", {
+            "step": self.step,
+            "duration_ms": round(elapsed, 3),
+            "threshold_ms": self.slow_ms,
+            **attributes
+        })
+
+    def _flush_buffer(self) -> None:
+        buffered, self._buffer = self._buffer, []
+        for level, message, payload in buffered:
+            getattr(self.logger, level)(message, _build(payload))
+
+
+def step_logger(context, step: str) -> StepLogger:
+    """Create a StepLogger for one handler invocation"""
+    return StepLogger(context, step)
@@ -0,0 +1,227 @@
+"""
+Metrics Service for the /metrics endpoint
+In-process counters, gauges and histograms that are flushed as deltas into a
+small number of state shards; a scrape reads the shards and renders the
+Prometheus text format without touching job records
+"""
+import os
+import socket
+import time
+from typing import Dict, List, Optional, Tuple
+
+
+METRICS_GROUP = "metrics"
+SHARDS = 8
+
+LATENCY_BUCKETS = (0.5, 1.0, 2.0, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0, 300.0)
+STAGE_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+# name -> (type, help, histogram buckets)
+METRICS: Dict[str, Tuple[str, str, Optional[tuple]]] = {
+    "jobs_created_total": ("counter", "Jobs accepted by POST /jobs", None),
+    "jobs_admission_rejected_total": ("counter", "POST /jobs turned away by admission control, by reason", None),
+    "jobs_by_status": ("gauge", "Jobs currently in each status", None),
+    "outbox_published_total": ("counter", "Queued job events published by the outbox flusher", None),
+    "outbox_lag_seconds": ("histogram", "Time from POST /jobs to the generate event being emitted", LATENCY_BUCKETS),
+    "jobs_archived_total": ("counter", "Jobs moved from state to the cold archive", None),
+    "jobs_timed_out_total": ("counter", "Jobs that passed their deadline, by stage (queued/generating)", None),
+    "job_generation_duration_seconds": ("histogram", "Gemini generation latency", LATENCY_BUCKETS),
+    "job_time_to_completion_seconds": ("histogram", "Time from job creation to a terminal status", LATENCY_BUCKETS),
+    "job_file_write_duration_seconds": ("histogram", "Description file write latency", STAGE_BUCKETS),
+    "gemini_requests_total": ("counter", "Gemini generate_content calls", None),
+    "gemini_errors_total": ("counter", "Failed Gemini calls by error code", None),
+    "gemini_fallbacks_total": ("counter", "Gemini attempts that failed over to the next model", None),
+    "gemini_hedges_total": ("counter", "Duplicate Gemini requests fired after the hedge delay", None),
+    "gemini_hedges_won_total": ("counter", "Hedged requests that returned before the original", None),
+    "gemini_rate_limited_total": ("counter", "Gemini calls rejected with 429", None),
+    "gemini_tokens_total": ("counter", "Gemini tokens by model and kind (prompt/output)", None),
+    "token_budget_decisions_total": ("counter", "Jobs over a tenant's daily token budget, by result (rejected/deferred)", None),
+    "file_bytes_written_total": ("counter", "Bytes of generated descriptions written to disk", None),
+    "file_dir_syncs_total": ("counter", "Group-committed directory fsyncs (FILE_WRITE_MODE=durable)", None),
+    "cache_lookups_total": ("counter", "Cache/index lookups by cache and result (hit/miss)", None),
+    "cache_hit_ratio": ("gauge", "Hit ratio derived from cache_lookups_total", None),
+    "job_generation_backlog": ("gauge", "Jobs waiting for the generation step (pending)", None),
+}
+
+
+def series_key(name: str, labels: Optional[dict] = None) -> str:
+    """Prometheus series identifier, e.g. jobs_by_status{status="pending"}"""
+    if not labels:
+        return name
+    rendered = ",".join(f'{k}="{_escape(v)}"' for k, v in sorted(labels.items()))
+    return f"{name}{{{rendered}}}"
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _split_key(key: str) -> Tuple[str, str]:
+    name, _, labels = key.partition("{")
+    return name, labels.rstrip("}")
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self.counters: Dict[str, float] = {}
+        self.gauges: Dict[str, float] = {}
+        self.histograms: Dict[str, dict] = {}
+        self._last_flush = 0.0
+
+    def inc(self, name: str, value: float = 1.0, **labels) -> None:
+        key = series_key(name, labels)
+        self.counters[key] = self.counters.get(key, 0.0) + value
+
+    def gauge_add(self, name: str, delta: float, **labels) -> None:
+        """Gauges are kept as deltas so shards from many processes can be summed"""
+        key = series_key(name, labels)
+        self.gauges[key] = self.gauges.get(key, 0.0) + delta
+
+    def observe(self, name: str, value: float, **labels) -> None:
+        buckets = METRICS[name][2]
+        key = series_key(name, labels)
+        hist = self.histograms.get(key)
+        if hist is None:
+            hist = self.histograms[key] = {"buckets": [0] * len(buckets), "sum": 0.0, "count": 0}
+        for i, bound in enumerate(buckets):
+            if value <= bound:
+                hist["buckets"][i] += 1
+                break
+        hist["sum"] += value
+        hist["count"] += 1
+
+    def transition(self, old_status: Optional[str], new_status: str) -> None:
+        """Move one job between jobs_by_status gauges"""
+        if old_status == new_status:
+            return
+        if old_status:
+            self.gauge_add("jobs_by_status", -1, status=old_status)
+        self.gauge_add("jobs_by_status", 1, status=new_status)
+
+    def is_empty(self) -> bool:
+        return not (self.counters or self.gauges or self.histograms)
+
+    async def flush(self, state) -> None:
+        """
+        Merge pending deltas into this process's state shard
+
+        Shards are keyed by pid so concurrent workers rarely share one; the
+        read-modify-write is not atomic, so two processes hashing to the same
+        shard at the same instant can drop an increment. That is acceptable
+        for monitoring data and keeps scrapes to SHARDS small reads.
+        """
+        if self.is_empty():
+            return
+        interval = float(os.environ.get("METRICS_FLUSH_INTERVAL_MS", "0")) / 1000.0
+        if interval and time.monotonic() - self._last_flush < interval:
+            return
+
+        counters, gauges, histograms = self.counters, self.gauges, self.histograms
+        self.counters, self.gauges, self.histograms = {}, {}, {}
+        self._last_flush = time.monotonic()
+
+        shard_key = f"shard-{os.getpid() % SHARDS}"
+        shard = await state.get(METRICS_GROUP, shard_key) or {}
+        merge_snapshot(shard, {"counters": counters, "gauges": gauges, "histograms": histograms})
+        shard["host"] = socket.gethostname()
+        shard["updated_at"] = time.time()
+        await state.set(METRICS_GROUP, shard_key, shard)
+
+
+def merge_snapshot(target: dict, source: dict) -> dict:
+    """Add counters/gauges/histograms of source into target (in place)"""
+    for section in ("counters", "gauges"):
+        merged = target.setdefault(section, {})
+        for key, value in (source.get(section) or {}).items():
+            merged[key] = merged.get(key, 0.0) + value
+
+    merged_hist = target.setdefault("histograms", {})
+    for key, hist in (source.get("histograms") or {}).items():
+        existing = merged_hist.get(key)
+        if existing is None:
+            merged_hist[key] = {"buckets": list(hist["buckets"]), "sum": hist["sum"], "count": hist["count"]}
+            continue
+        existing["buckets"] = [a + b for a, b in zip(existing["buckets"], hist["buckets"])]
+        existing["sum"] += hist["sum"]
+        existing["count"] += hist["count"]
+    return target
+
+
+async def collect(state) -> dict:
+    """Sum all shards (including the status baseline) into one snapshot"""
+    snapshot = {"counters": {}, "gauges": {}, "histograms": {}}
+    for shard in await state.get_group(METRICS_GROUP) or []:
+        if shard:
+            merge_snapshot(snapshot, shard)
+    return snapshot
+
+
+async def ensure_status_baseline(state, status_counts_loader) -> None:
+    """
+    Seed jobs_by_status once for jobs created before metrics existed
+
+    The loader is only called when no baseline shard exists yet, so normal
+    scrapes never scan jobs. Jobs that already moved through the shards
+    (created or transitioned since the deploy) are subtracted, so the
+    baseline plus the shards add up to the index counts instead of counting
+    those jobs twice.
+    """
+    if await state.get(METRICS_GROUP, "baseline"):
+        return
+    counts = await status_counts_loader()
+    target = {series_key("jobs_by_status", {"status": s}): float(n) for s, n in counts.items()}
+    recorded = {
+        key: value for key, value in (await collect(state))["gauges"].items()
+        if _split_key(key)[0] == "jobs_by_status"
+    }
+    baseline = {key: target.get(key, 0.0) - recorded.get(key, 0.0) for key in {*target, *recorded}}
+    await state.set(METRICS_GROUP, "baseline", {
+        "gauges": {key: value for key, value in baseline.items() if value},
+        "created_at": time.time()
+    })
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def render_prometheus(snapshot: dict, extra_gauges: Optional[Dict[str, float]] = None) -> str:
+    """Render a snapshot in the Prometheus text exposition format (0.0.4)"""
+    families: Dict[str, List[str]] = {}
+
+    for section in ("counters", "gauges"):
+        for key, value in sorted(snapshot.get(section, {}).items()):
+            families.setdefault(_split_key(key)[0], []).append(f"{key} {_format_value(value)}")
+
+    for key, value in sorted((extra_gauges or {}).items()):
+        families.setdefault(_split_key(key)[0], []).append(f"{key} {_format_value(value)}")
+
+    for key, hist in sorted(snapshot.get("histograms", {}).items()):
+        name, labels = _split_key(key)
+        bounds = METRICS.get(name, ("histogram", "", ()))[2] or ()
+        prefix = f"{labels}," if labels else ""
+        lines = families.setdefault(name, [])
+        cumulative = 0
+        for bound, count in zip(bounds, hist["buckets"]):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{prefix}le="{_format_value(bound)}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{{prefix}le="+Inf"}} {hist["count"]}')
+        suffix = f"{{{labels}}}" if labels else ""
+        lines.append(f"{name}_sum{suffix} {_format_value(hist['sum'])}")
+        lines.append(f"{name}_count{suffix} {hist['count']}")
+
+    out = []
+    for name in sorted(families):
+        metric_type, help_text, _ = METRICS.get(name, ("gauge", "", None))
+        out.append(f"# HELP {name} {help_text}")
+        out.append(f"# TYPE {name} {metric_type}")
+        out.extend(families[name])
+    return "\n".join(out) + "\n"
+
+
+# Process-wide registry shared by steps and services
+registry = MetricsRegistry()
@@ -0,0 +1,129 @@
+"""
+Outbox Service for job creation
+CreateJob stores the job record and its generate event as one outbox value,
+a single state write, and returns. The OutboxFlusher cron step publishes
+queued entries in batches: it writes the job record and index row, emits
+the event and only then deletes the entry. A crash at any point leaves the
+entry queued, so it is retried and no job is orphaned; the generate step
+ignores duplicate events for jobs that are no longer pending. Entries with
+a not_before (jobs deferred past a tenant's token budget) stay queued until
+that time. Which ready entries are published, and when, is decided per
+tenant by the fair queue scheduler.
+"""
+import asyncio
+import os
+from typing import Awaitable, Callable, Dict, Optional
+
+from models.records import Job, now_ms
+from services.fair_queue_service import (
+    entry_tenant, inflight_by_tenant, load_deficits, mark_inflight, save_deficits, schedule
+)
+from services.job_index_service import index_job
+from services.metrics_service import registry as metrics
+
+
+OUTBOX_GROUP = "job_outbox"
+
+
+def batch_size() -> int:
+    return max(1, int(os.environ.get("OUTBOX_BATCH_SIZE", "100")))
+
+
+async def enqueue_job(
+    state,
+    job: Job,
+    topic: str,
+    data: dict,
+    not_before: Optional[int] = None,
+    cost: Optional[int] = None
+) -> None:
+    """
+    Queue a new job and its event in its tenant's queue
+
+    not_before (epoch ms) holds it back until then; cost (estimated tokens)
+    is what the scheduler charges the tenant for it.
+    """
+    entry = {
+        "job_id": job.job_id,
+        "job": job.to_state(),
+        "event": {"topic": topic, "data": data},
+        "queued_at": now_ms(),
+        "tenant": job.tenant,
+        "cost": cost
+    }
+    if not_before is not None:
+        entry["not_before"] = not_before
+    await state.set(OUTBOX_GROUP, job.job_id, entry)
+
+
+async def queued_entries(state) -> list:
+    """Every outbox entry, oldest first"""
+    entries = [entry for entry in (await state.get_group(OUTBOX_GROUP) or []) if entry and entry.get("job")]
+    entries.sort(key=lambda entry: entry.get("queued_at", 0))
+    return entries
+
+
+async def get_queued_job(state, job_id: str) -> Optional[Job]:
+    """A job that was accepted but not yet published"""
+    entry = await state.get(OUTBOX_GROUP, job_id)
+    return Job.from_state(entry["job"]) if entry else None
+
+
+async def _publish(state, emit: Callable[[dict], Awaitable], entry: dict) -> None:
+    job = Job.from_state(entry["job"])
+    # On a retry the record may exist and already be past pending; never
+    # overwrite it with the queued copy
+    if not await state.get("jobs", job.job_id):
+        await state.set("jobs", job.job_id, entry["job"])
+        await index_job(state, job)
+        metrics.inc("jobs_created_total")
+        metrics.transition(None, "pending")
+    # Counted against the tenant's in-flight cap until the generate step
+    # finishes the job
+    await mark_inflight(state, job.job_id, entry_tenant(entry))
+    await emit(entry["event"])
+    await state.delete(OUTBOX_GROUP, job.job_id)
+    metrics.inc("outbox_published_total")
+    released_at = max(entry.get("queued_at", 0), entry.get("not_before") or 0) or now_ms()
+    metrics.observe("outbox_lag_seconds", (now_ms() - released_at) / 1000)
+
+
+async def flush_outbox(state, emit: Callable[[dict], Awaitable], limit: Optional[int] = None) -> dict:
+    """
+    Publish up to `limit` ready entries, chosen by the fair queue
+    scheduler, concurrently
+
+    Returns counts of published and failed entries plus the remaining backlog;
+    failed entries stay queued for the next run. Entries whose not_before
+    has not been reached are counted as deferred, not as backlog.
+    """
+    now = now_ms()
+    entries = await queued_entries(state)
+    deferred = sum(1 for entry in entries if (entry.get("not_before") or 0) > now)
+    entries = [entry for entry in entries if (entry.get("not_before") or 0) <= now]
+
+    inflight = await inflight_by_tenant(state)
+    deficits, last = await load_deficits(state)
+    batch, deficits, last = schedule(entries, inflight, deficits, last, limit or batch_size())
+    await save_deficits(state, deficits, last)
+
+    results = await asyncio.gather(*[_publish(state, emit, entry) for entry in batch], return_exceptions=True)
+    errors = [(entry["job_id"], result) for entry, result in zip(batch, results) if isinstance(result, Exception)]
+
+    published_ids = {entry["job_id"] for entry, result in zip(batch, results) if not isinstance(result, Exception)}
+    queued_by_tenant: Dict[str, int] = {}
+    for entry in entries:
+        if entry["job_id"] not in published_ids:
+            tenant = entry_tenant(entry)
+            queued_by_tenant[tenant] = queued_by_tenant.get(tenant, 0) + 1
+    return {
+        "published": len(published_ids),
+        "failed": errors,
+        "backlog": len(entries) - len(published_ids),
+        "deferred": deferred,
+        # For admission control: in-flight jobs before and after this batch
+        # and the ready entries still queued per tenant
+        "in_flight_before": sum(inflight.values()),
+        "in_flight": sum(inflight.values()) + len(published_ids),
+        "queued_by_tenant": queued_by_tenant
+    }
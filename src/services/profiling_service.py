@@ -0,0 +1,249 @@
+"""
+Profiling Service for opt-in per-invocation profiles
+Wraps a step handler so selected invocations run under a sampling or
+deterministic profiler and leave a speedscope / collapsed-stack file tagged
+with the step name and trace id
+"""
+import functools
+import hmac
+import json
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Callable, Dict, Optional, Tuple
+
+
+PROFILE_MODES = ("sample", "trace")
+
+Stack = Tuple[Tuple[str, str, int], ...]
+
+# Both profilers see the whole event-loop thread (sys.setprofile is process
+# wide for that thread), so only one invocation per process is profiled at a
+# time; overlapping ones run unprofiled instead of corrupting each other
+_active = threading.Lock()
+
+
+def profiling_enabled() -> bool:
+    return os.environ.get("PROFILE_ENABLED", "false").lower() in ("1", "true", "yes")
+
+
+def _float_env(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+def _frame_key(code) -> Tuple[str, str, int]:
+    return (code.co_qualname if hasattr(code, "co_qualname") else code.co_name,
+            code.co_filename, code.co_firstlineno)
+
+
+class SamplingProfiler:
+    """
+    Samples the handler's thread from a background thread
+
+    Cost is bounded by the interval (one stack walk per tick) regardless of
+    how much Python code the handler runs.
+    """
+
+    unit = "milliseconds"
+
+    def __init__(self, interval_ms: float = 2.0):
+        self.interval = max(0.0005, interval_ms / 1000.0)
+        self.weights: Counter = Counter()
+        self._thread_id = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self) -> None:
+        self._thread_id = threading.get_ident()
+        self._thread = threading.Thread(target=self._run, name="step-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        interval_ms = self.interval * 1000
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(_frame_key(frame.f_code))
+                frame = frame.f_back
+            if stack:
+                self.weights[tuple(reversed(stack))] += interval_ms
+
+
+class TracingProfiler:
+    """
+    Deterministic profiler on sys.setprofile, weighting stacks by self time
+
+    Stacks are relative to where profiling started. While the handler is
+    suspended on I/O the event loop's own frames are recorded at the root,
+    which shows up as idle/wait time, as do other coroutines the loop runs
+    in the meantime.
+    """
+
+    unit = "nanoseconds"
+
+    def __init__(self):
+        self.weights: Counter = Counter()
+        self._stack = []
+        self._last = 0
+
+    def start(self) -> None:
+        self._last = time.perf_counter_ns()
+        sys.setprofile(self._event)
+
+    def stop(self) -> None:
+        sys.setprofile(None)
+
+    def _event(self, frame, event, arg) -> None:
+        now = time.perf_counter_ns()
+        if self._stack:
+            self.weights[tuple(self._stack)] += now - self._last
+        if event == "call":
+            self._stack.append(_frame_key(frame.f_code))
+        elif event == "c_call":
+            self._stack.append((getattr(arg, "__qualname__", repr(arg)), "<builtin>", 0))
+        elif self._stack:
+            # return / c_return / c_exception
+            self._stack.pop()
+        self._last = time.perf_counter_ns()
+
+
+def to_collapsed(weights: Dict[Stack, float]) -> str:
+    """Brendan Gregg collapsed-stack format: frame;frame;frame weight"""
+    lines = []
+    for stack, weight in sorted(weights.items()):
+        lines.append(";".join(f"{name} ({os.path.basename(path)}:{line})" for name, path, line in stack)
+                     + f" {int(round(weight))}")
+    return "\n".join(lines) + "\n"
+
+
+def to_speedscope(weights: Dict[Stack, float], name: str, unit: str) -> dict:
+    """speedscope 'sampled' profile with one aggregated sample per distinct stack"""
+    frame_index: Dict[Tuple[str, str, int], int] = {}
+    frames, samples, sample_weights = [], [], []
+    for stack, weight in weights.items():
+        indexes = []
+        for key in stack:
+            if key not in frame_index:
+                frame_index[key] = len(frames)
+                frames.append({"name": key[0], "file": key[1], "line": key[2]})
+            indexes.append(frame_index[key])
+        samples.append(indexes)
+        sample_weights.append(weight)
+    total = sum(sample_weights)
+    return {
+        "$schema": "https://www.speedscope.app/file-format-schema.json",
+        "name": name,
+        "exporter": "job-generator profiling_service",
+        "activeProfileIndex": 0,
+        "shared": {"frames": frames},
+        "profiles": [{
+            "type": "sampled",
+            "name": name,
+            "unit": unit,
+            "startValue": 0,
+            "endValue": total,
+            "samples": samples,
+            "weights": sample_weights
+        }]
+    }
+
+
+def _header(req, name: str) -> Optional[str]:
+    headers = req.get("headers") if isinstance(req, dict) else None
+    if not headers:
+        return None
+    value = headers.get(name)
+    if value is None:
+        for key, candidate in headers.items():
+            if key.lower() == name:
+                value = candidate
+                break
+    if isinstance(value, list):
+        value = value[0] if value else None
+    return value
+
+
+def _requested_mode(args) -> Optional[str]:
+    """Profiling mode for this invocation, or None to run unprofiled"""
+    default_mode = os.environ.get("PROFILE_MODE", "sample")
+    if len(args) == 2:
+        requested = _header(args[0], "x-profile")
+        if requested:
+            # Header triggers are off unless PROFILE_TOKEN is set and matched
+            token = os.environ.get("PROFILE_TOKEN")
+            sent = _header(args[0], "x-profile-token")
+            if not token or not sent or not hmac.compare_digest(str(sent), token):
+                return None
+            return requested if requested in PROFILE_MODES else default_mode
+    rate = _float_env("PROFILE_SAMPLE_RATE", 0.0)
+    if rate > 0 and random.random() < rate:
+        return default_mode
+    return None
+
+
+def _write_profile(profiler, step: str, trace_id: str, mode: str) -> str:
+    base_dir = os.environ.get("PROFILE_DIR", os.path.join("data", "profiles"))
+    os.makedirs(base_dir, exist_ok=True)
+    fmt = os.environ.get("PROFILE_FORMAT", "speedscope")
+    stem = f"{step}-{trace_id}-{int(time.time() * 1000)}-{mode}"
+    if fmt == "collapsed":
+        path = os.path.join(base_dir, stem + ".collapsed.txt")
+        with open(path, "w") as f:
+            f.write(to_collapsed(profiler.weights))
+    else:
+        path = os.path.join(base_dir, stem + ".speedscope.json")
+        with open(path, "w") as f:
+            json.dump(to_speedscope(profiler.weights, f"{step} {trace_id} ({mode})", profiler.unit), f)
+    return path
+
+
+def profiled(step: str) -> Callable:
+    """
+    Decorator for step handlers (api, event and cron signatures)
+
+    Returns the handler unchanged unless PROFILE_ENABLED is set when the step
+    module is imported, so there is no per-call cost when profiling is off.
+    """
+    def decorator(handler: Callable) -> Callable:
+        if not profiling_enabled():
+            return handler
+
+        @functools.wraps(handler)
+        async def wrapper(*args):
+            mode = _requested_mode(args)
+            if mode is None:
+                return await handler(*args)
+
+            context = args[-1]
+            trace_id = getattr(context, "trace_id", None) or "no-trace"
+            if not _active.acquire(blocking=False):
+                context.logger.info("Profile skipped, another one is running", {"step": step, "trace_id": trace_id})
+                return await handler(*args)
+
+            profiler = TracingProfiler() if mode == "trace" else SamplingProfiler(_float_env("PROFILE_INTERVAL_MS", 2.0))
+            profiler.start()
+            try:
+                return await handler(*args)
+            finally:
+                profiler.stop()
+                _active.release()
+                try:
+                    path = _write_profile(profiler, step, trace_id, mode)
+                    context.logger.info("Profile written", {"step": step, "trace_id": trace_id, "mode": mode, "path": path})
+                except Exception as e:
+                    context.logger.warn("Failed to write profile", {"step": step, "error": str(e)})
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,255 @@
+"""
+Prompt Index Service for near-duplicate job submissions
+MinHash signatures with LSH banding over normalized (role, description)
+shingles, persisted in state so the index survives restarts
+"""
+import asyncio
+import hashlib
+import os
+import random
+import re
+import zlib
+from dataclasses import dataclass
+from typing import List, Optional
+
+
+SIGNATURE_GROUP = "prompt_signatures"
+BUCKET_GROUP = "prompt_lsh"
+
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+SHINGLE_SIZE = 5
+MAX_BUCKET_SIZE = 50
+
+_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_rng = random.Random(0x5EED)
+_PERMUTATIONS = [
+    (_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERM)
+]
+
+REUSE_MODES = ("off", "reuse", "adapt")
+
+
+def normalize_text(text: Optional[str]) -> str:
+    """Lowercase, drop punctuation and collapse whitespace"""
+    text = re.sub(r"[^\w\s]", " ", str(text or "").lower())
+    return " ".join(text.split())
+
+
+def shingles(role: str, description: str) -> set:
+    """Character shingles of the normalized role and description"""
+    text = f"{normalize_text(role)} | {normalize_text(description)}"
+    if len(text) <= SHINGLE_SIZE:
+        return {text}
+    return {text[i:i + SHINGLE_SIZE] for i in range(len(text) - SHINGLE_SIZE + 1)}
+
+
+def minhash(shingle_set: set) -> List[int]:
+    """MinHash signature using universal hashing over crc32 shingle hashes"""
+    hashes = [zlib.crc32(s.encode("utf-8")) for s in shingle_set]
+    return [
+        min(((a * h + b) % _PRIME) & _MAX_HASH for h in hashes)
+        for a, b in _PERMUTATIONS
+    ]
+
+
+def band_keys(signature: List[int]) -> List[str]:
+    """LSH bucket keys, one per band"""
+    keys = []
+    for band in range(BANDS):
+        chunk = signature[band * ROWS:(band + 1) * ROWS]
+        digest = hashlib.blake2b(repr(chunk).encode("ascii"), digest_size=8).hexdigest()
+        keys.append(f"{band}-{digest}")
+    return keys
+
+
+def similarity(a: List[int], b: List[int]) -> float:
+    """Estimated Jaccard similarity of two signatures"""
+    return sum(1 for x, y in zip(a, b) if x == y) / NUM_PERM
+
+
+@dataclass
+class PromptMatch:
+    job_id: str
+    similarity: float
+    role: str
+    yoe: int
+    comp: Optional[str]
+
+
+class PromptIndexService:
+    def __init__(self, state, mode: Optional[str] = None, threshold: Optional[float] = None):
+        self.state = state
+        self.mode = (mode or os.environ.get("PROMPT_REUSE_MODE", "off")).lower()
+        if self.mode not in REUSE_MODES:
+            raise ValueError(f"PROMPT_REUSE_MODE must be one of {', '.join(REUSE_MODES)}")
+        self.threshold = threshold if threshold is not None else float(
+            os.environ.get("PROMPT_REUSE_THRESHOLD", "0.85")
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != "off"
+
+    async def find_similar(
+        self,
+        role: str,
+        description: str,
+        yoe: int,
+        comp: Optional[str] = None,
+        exclude: Optional[str] = None
+    ) -> Optional[PromptMatch]:
+        """
+        Find the most similar previously completed job above the threshold
+
+        In "reuse" mode the match must also share role, yoe and compensation,
+        since all three appear verbatim in the generated text; "adapt" mode
+        accepts any match and leaves the rewrite to adapt_content().
+
+        Returns:
+            Best PromptMatch or None
+        """
+        signature = minhash(shingles(role, description))
+        buckets = await asyncio.gather(*[
+            self.state.get(BUCKET_GROUP, key) for key in band_keys(signature)
+        ])
+
+        candidate_ids = {job_id for bucket in buckets if bucket for job_id in bucket}
+        candidate_ids.discard(exclude)
+        if not candidate_ids:
+            return None
+
+        candidate_ids = list(candidate_ids)
+        entries = await asyncio.gather(*[
+            self.state.get(SIGNATURE_GROUP, job_id) for job_id in candidate_ids
+        ])
+
+        best = None
+        for job_id, entry in zip(candidate_ids, entries):
+            if not entry:
+                continue
+            if self.mode == "reuse" and (
+                normalize_text(entry.get("role")) != normalize_text(role)
+                or entry.get("yoe") != yoe
+                or normalize_text(entry.get("comp")) != normalize_text(comp)
+            ):
+                continue
+            score = similarity(signature, entry["signature"])
+            if score >= self.threshold and (best is None or score > best.similarity):
+                best = PromptMatch(
+                    job_id=job_id,
+                    similarity=score,
+                    role=entry.get("role"),
+                    yoe=entry.get("yoe"),
+                    comp=entry.get("comp")
+                )
+
+        return best
+
+    async def add(
+        self,
+        job_id: str,
+        role: str,
+        description: str,
+        yoe: int,
+        comp: Optional[str] = None
+    ) -> None:
+        """Record a completed job's signature and add it to its LSH buckets"""
+        signature = minhash(shingles(role, description))
+        await self.state.set(SIGNATURE_GROUP, job_id, {
+            "signature": signature,
+            "role": role,
+            "yoe": yoe,
+            "comp": comp
+        })
+
+        keys = band_keys(signature)
+        buckets = await asyncio.gather(*[self.state.get(BUCKET_GROUP, key) for key in keys])
+        updates = []
+        for key, bucket in zip(keys, buckets):
+            bucket = [j for j in (bucket or []) if j != job_id]
+            bucket.append(job_id)
+            updates.append(self.state.set(BUCKET_GROUP, key, bucket[-MAX_BUCKET_SIZE:]))
+        await asyncio.gather(*updates)
+
+    async def remove(self, job_id: str) -> None:
+        """Drop a job from the index (e.g. when its description file is purged)"""
+        entry = await self.state.get(SIGNATURE_GROUP, job_id)
+        if not entry:
+            return
+
+        keys = band_keys(entry["signature"])
+        buckets = await asyncio.gather(*[self.state.get(BUCKET_GROUP, key) for key in keys])
+        updates = []
+        for key, bucket in zip(keys, buckets):
+            if bucket and job_id in bucket:
+                remaining = [j for j in bucket if j != job_id]
+                if remaining:
+                    updates.append(self.state.set(BUCKET_GROUP, key, remaining))
+                else:
+                    updates.append(self.state.delete(BUCKET_GROUP, key))
+        await asyncio.gather(*updates)
+        await self.state.delete(SIGNATURE_GROUP, job_id)
+
+
+_COMP_HEADING_RE = re.compile(
+    r"^\W*(compensation|salary|pay)(\s*(&|and)\s*benefits|\s+range)?\W*$",
+    re.IGNORECASE
+)
+
+
+def _strip_comp(content: str, comp: str) -> str:
+    """Drop the lines stating comp, and a compensation heading left without a body"""
+    kept = []
+    for line in content.splitlines():
+        if comp in line:
+            while kept and not kept[-1].strip():
+                kept.pop()
+            if kept and _COMP_HEADING_RE.match(kept[-1]):
+                kept.pop()
+            continue
+        kept.append(line)
+    return re.sub(r"\n{3,}", "\n\n", "\n".join(kept)).strip() + "\n"
+
+
+def adapt_content(
+    content: str,
+    match: PromptMatch,
+    role: str,
+    yoe: int,
+    comp: Optional[str]
+) -> Optional[str]:
+    """
+    Rewrite the role, years of experience and compensation of a reused description
+
+    A compensation line is replaced, removed or appended to match the new
+    job. Returns None when the source's compensation was reworded by the
+    model and cannot be found verbatim; the caller then generates instead.
+    """
+    if match.role and match.role != role:
+        content = re.sub(re.escape(match.role), lambda _: role, content, flags=re.IGNORECASE)
+    if match.yoe is not None and match.yoe != yoe:
+        content = re.sub(
+            rf"\b{match.yoe}(\+?\s*(?:years?|yrs?))",
+            rf"{yoe}\g<1>",
+            content,
+            flags=re.IGNORECASE
+        )
+    if normalize_text(match.comp) != normalize_text(comp):
+        if match.comp and match.comp not in content:
+            return None
+        if match.comp and comp:
+            content = content.replace(match.comp, comp)
+        elif match.comp:
+            content = _strip_comp(content, match.comp)
+        else:
+            content = content.rstrip() + f"\n\nCompensation: {comp}\n"
+    return content
+
+
+# Factory function for easy instantiation
+def create_prompt_index_service(state) -> PromptIndexService:
+    """Create and return a PromptIndexService bound to the given state"""
+    return PromptIndexService(state)
@@ -0,0 +1,113 @@
+"""
+Schema Cache for step configs
+Step configs embed JSON schemas generated from Pydantic models, which costs
+a pydantic import plus model compilation on every cold start. Built schemas
+are cached per step in a small JSON artifact keyed by the hash of the step
+source, so warm starts read one file and never import pydantic
+
+    python src/services/schema_cache.py    # prebuild for every step
+"""
+import hashlib
+import json
+import os
+from typing import Callable, Dict, Iterable, Optional
+
+CACHE_VERSION = 1
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+def cache_dir() -> str:
+    return os.environ.get("SCHEMA_CACHE_DIR", os.path.join("data", "schema_cache"))
+
+
+def cache_enabled() -> bool:
+    return os.environ.get("SCHEMA_CACHE", "true").lower() not in ("0", "false", "no")
+
+
+def _source_hash(paths: Iterable[str]) -> str:
+    digest = hashlib.sha1(f"v{CACHE_VERSION}".encode())
+    for path in paths:
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def _cache_path(step_file: str) -> str:
+    relative = os.path.relpath(os.path.abspath(step_file), SRC_DIR)
+    name = relative.replace(os.sep, "__").replace("/", "__")
+    return os.path.join(cache_dir(), name[:-3] + ".json")
+
+
+def _restore_int_keys(schemas: dict) -> dict:
+    """JSON turns response-schema status codes into strings; turn them back"""
+    restored = {}
+    for name, value in schemas.items():
+        if isinstance(value, dict) and value and all(str(k).isdigit() for k in value):
+            value = {int(k): v for k, v in value.items()}
+        restored[name] = value
+    return restored
+
+
+def load_step_schemas(
+    step_file: str,
+    build: Callable[[], Dict[str, dict]],
+    depends: Optional[Iterable[str]] = None
+) -> Dict[str, dict]:
+    """
+    Return the step's schemas, building and caching them on a miss
+
+    Args:
+        step_file: The step's __file__
+        build: Builds {name: schema}; only called on a cache miss
+        depends: Extra source files (relative to src/) whose changes
+            invalidate the entry, e.g. ["models/jobs.py"]
+    """
+    if not cache_enabled():
+        return build()
+
+    try:
+        key = _source_hash([step_file, *(os.path.join(SRC_DIR, d) for d in depends or ())])
+    except OSError:
+        return build()
+
+    path = _cache_path(step_file)
+    try:
+        with open(path) as f:
+            entry = json.load(f)
+        if entry.get("hash") == key:
+            return _restore_int_keys(entry["schemas"])
+    except (OSError, ValueError, KeyError, AttributeError):
+        pass
+
+    schemas = build()
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"hash": key, "schemas": schemas}, f)
+        os.replace(tmp_path, path)
+    except OSError:
+        # A read-only deploy still works, it just builds on every start
+        pass
+    return schemas
+
+
+def build_all() -> int:
+    """Import every step under src/ so each one populates its cache entry"""
+    import importlib.util
+
+    count = 0
+    for root, _, files in os.walk(SRC_DIR):
+        for filename in sorted(files):
+            if not filename.endswith("_step.py"):
+                continue
+            path = os.path.join(root, filename)
+            spec = importlib.util.spec_from_file_location(f"schema_build_{count}", path)
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+            count += 1
+    return count
+
+
+if __name__ == "__main__":
+    print(f"Built schema cache for {build_all()} steps in {cache_dir()}")
@@ -0,0 +1,98 @@
+"""
+Tracing Service for stage-level latency spans
+Collects spans for one handler invocation and emits them as a single
+structured log line keyed by the Motia trace id, so the observability
+plugin's log view groups them with the rest of the trace
+"""
+import os
+import time
+import uuid
+from contextlib import contextmanager
+from typing import List, Optional
+
+
+def tracing_enabled() -> bool:
+    return os.environ.get("TRACE_SPANS", "true").lower() not in ("0", "false", "no")
+
+
+class Tracer:
+    def __init__(self, context, name: str, **attributes):
+        self.context = context
+        self.name = name
+        self.trace_id = getattr(context, "trace_id", None) or uuid.uuid4().hex
+        self.attributes = attributes
+        self.enabled = tracing_enabled()
+        self.spans: List[dict] = []
+        self.root_id = uuid.uuid4().hex[:16]
+        self._stack = [self.root_id]
+        self.started_at = time.time()
+        self._start_perf = time.perf_counter()
+        self._finished = False
+
+    @contextmanager
+    def span(self, name: str, **attributes):
+        """Time a stage; nested spans get the enclosing span as parent"""
+        if not self.enabled:
+            yield
+            return
+
+        span_id = uuid.uuid4().hex[:16]
+        parent_id = self._stack[-1]
+        self._stack.append(span_id)
+        start = time.time()
+        start_perf = time.perf_counter()
+        status = "ok"
+        try:
+            yield
+        except BaseException as e:
+            status = "error"
+            attributes["error"] = str(e)
+            raise
+        finally:
+            self._stack.pop()
+            self.spans.append({
+                "name": name,
+                "span_id": span_id,
+                "parent_id": parent_id,
+                "start": start,
+                "duration_ms": round((time.perf_counter() - start_perf) * 1000, 3),
+                "status": status,
+                **({"attributes": attributes} if attributes else {})
+            })
+
+    def record(self, name: str, start: float, end: Optional[float] = None, **attributes) -> None:
+        """Add a span measured elsewhere, e.g. queue wait derived from timestamps"""
+        if not self.enabled or start is None:
+            return
+        end = end if end is not None else time.time()
+        self.spans.append({
+            "name": name,
+            "span_id": uuid.uuid4().hex[:16],
+            "parent_id": self.root_id,
+            "start": start,
+            "duration_ms": round(max(0.0, end - start) * 1000, 3),
+            "status": "ok",
+            **({"attributes": attributes} if attributes else {})
+        })
+
+    def finish(self, status: str = "ok", **attributes) -> None:
+        """Emit the root span and all child spans as one log line"""
+        if not self.enabled or self._finished:
+            return
+        self._finished = True
+        self.context.logger.info("Trace spans", {
+            "trace_id": self.trace_id,
+            "span_id": self.root_id,
+            "name": self.name,
+            "start": self.started_at,
+            "duration_ms": round((time.perf_counter() - self._start_perf) * 1000, 3),
+            "status": status,
+            **self.attributes,
+            **attributes,
+            "spans": self.spans
+        })
+
+
+def start_trace(context, name: str, **attributes) -> Tracer:
+    """Create a Tracer for one handler invocation"""
+    return Tracer(context, name, **attributes)
@@ -0,0 +1,224 @@
+"""
+Usage Service for Gemini token accounting
+Tokens are counted per tenant per UTC day in the token_usage state group,
+one value per {tenant}:{YYYY-MM-DD}. CreateJob reserves a job's estimated
+tokens against the tenant's daily budget before anything is queued, and
+GenerateJobDescription settles the reservation with the counts from the
+response's usage metadata, so a bulk import is stopped at admission and not
+after the shared quota has been spent.
+"""
+import hashlib
+import os
+from typing import Optional
+
+from models.records import ms_to_iso, now_ms
+from services.metrics_service import registry as metrics
+
+
+USAGE_GROUP = "token_usage"
+DEFAULT_TENANT = "default"
+DAY_MS = 86_400_000
+
+
+def tenant_from_request(req) -> str:
+    """
+    The tenant of an API key, else x-tenant-id, else the shared default tenant
+
+    A key is identified by a hash (the key itself is never stored), mapped to
+    a name through API_KEY_TENANTS ("key-1f2e...=acme"). x-tenant-id is only
+    honoured for requests without a key, so a key holder cannot pick a fresh
+    tenant, and with it a fresh budget and queue, per request.
+    """
+    headers = (req.get("headers") if isinstance(req, dict) else None) or {}
+    headers = {str(key).lower(): value for key, value in headers.items()}
+    api_key = str(headers.get("x-api-key") or "").strip()
+    if api_key:
+        key_id = "key-" + hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]
+        return _key_tenants().get(key_id, key_id)
+    tenant = str(headers.get("x-tenant-id") or "").strip()
+    if tenant:
+        return tenant[:64]
+    return DEFAULT_TENANT
+
+
+def _key_tenants() -> dict:
+    """API_KEY_TENANTS: key id (as returned for an unmapped key) -> tenant"""
+    mapping = {}
+    for entry in os.environ.get("API_KEY_TENANTS", "").split(","):
+        key_id, _, tenant = entry.partition("=")
+        if key_id.strip() and tenant.strip():
+            mapping[key_id.strip()] = tenant.strip()[:64]
+    return mapping
+
+
+def daily_budget(tenant: str) -> int:
+    """
+    Tokens per UTC day; 0 means unlimited
+
+    TOKEN_BUDGETS ("acme=200000,key-1f2e...=50000") overrides
+    TOKEN_BUDGET_DAILY for individual tenants.
+    """
+    for entry in os.environ.get("TOKEN_BUDGETS", "").split(","):
+        name, _, value = entry.partition("=")
+        if name.strip() == tenant and value.strip():
+            return max(0, int(value))
+    return max(0, int(os.environ.get("TOKEN_BUDGET_DAILY", "0")))
+
+
+def budget_mode() -> str:
+    """reject (429 until the next UTC day) or queue (run on the next UTC day)"""
+    mode = os.environ.get("TOKEN_BUDGET_MODE", "reject").lower()
+    return mode if mode in ("reject", "queue") else "reject"
+
+
+def usage_day(at_ms: Optional[int] = None) -> str:
+    return ms_to_iso(at_ms if at_ms is not None else now_ms())[:10]
+
+
+def next_day_ms(at_ms: Optional[int] = None) -> int:
+    """Start of the UTC day after at_ms"""
+    return ((at_ms if at_ms is not None else now_ms()) // DAY_MS + 1) * DAY_MS
+
+
+def usage_key(tenant: str, day: str) -> str:
+    return f"{tenant}:{day}"
+
+
+def _empty(tenant: str, day: str) -> dict:
+    return {
+        "tenant": tenant,
+        "day": day,
+        "prompt_tokens": 0,
+        "output_tokens": 0,
+        "reserved_tokens": 0,
+        "jobs": 0,
+        "rejected": 0
+    }
+
+
+async def get_usage(state, tenant: str, day: str) -> dict:
+    return {**_empty(tenant, day), **(await state.get(USAGE_GROUP, usage_key(tenant, day)) or {})}
+
+
+def spent(record: dict) -> int:
+    """Tokens counted against the budget: used plus still reserved"""
+    return record["prompt_tokens"] + record["output_tokens"] + record["reserved_tokens"]
+
+
+async def reserve(state, tenant: str, estimate: int, at_ms: Optional[int] = None) -> dict:
+    """
+    Admit a job of `estimate` tokens for a tenant
+
+    Returns {"allowed", "day", "reserved", "not_before", "retry_after_s",
+    "budget", "spent"}. Without a budget nothing is read or written. In
+    queue mode a job over today's budget is reserved against the next UTC
+    day instead and carries that day's start as not_before; it is rejected
+    if that day is full as well. Like the metrics shards, the record is a
+    read-modify-write, so concurrent requests can overshoot a budget by a
+    few jobs.
+    """
+    at_ms = at_ms if at_ms is not None else now_ms()
+    day = usage_day(at_ms)
+    budget = daily_budget(tenant)
+    decision = {
+        "allowed": True,
+        "day": day,
+        "reserved": 0,
+        "not_before": None,
+        "retry_after_s": None,
+        "budget": budget,
+        "spent": None
+    }
+    if budget <= 0:
+        return decision
+
+    record = await get_usage(state, tenant, day)
+    decision["spent"] = spent(record)
+    if decision["spent"] + estimate <= budget:
+        record["reserved_tokens"] += estimate
+        await state.set(USAGE_GROUP, usage_key(tenant, day), record)
+        decision["reserved"] = estimate
+        return decision
+
+    tomorrow = next_day_ms(at_ms)
+    if budget_mode() == "queue" and estimate <= budget:
+        next_record = await get_usage(state, tenant, usage_day(tomorrow))
+        if spent(next_record) + estimate <= budget:
+            next_record["reserved_tokens"] += estimate
+            await state.set(USAGE_GROUP, usage_key(tenant, next_record["day"]), next_record)
+            metrics.inc("token_budget_decisions_total", result="deferred")
+            return {**decision, "day": next_record["day"], "reserved": estimate, "not_before": tomorrow}
+
+    record["rejected"] += 1
+    await state.set(USAGE_GROUP, usage_key(tenant, day), record)
+    metrics.inc("token_budget_decisions_total", result="rejected")
+    return {**decision, "allowed": False, "retry_after_s": max(1, (tomorrow - at_ms + 999) // 1000)}
+
+
+async def settle(
+    state,
+    tenant: Optional[str],
+    day: Optional[str],
+    reserved: int = 0,
+    prompt_tokens: int = 0,
+    output_tokens: int = 0
+) -> None:
+    """
+    Release a job's reservation and count the tokens it actually used
+
+    Called once per job that reached a terminal status; a job that failed or
+    timed out before a response just gives its reservation back.
+    """
+    tenant = tenant or DEFAULT_TENANT
+    day = day or usage_day()
+    record = await get_usage(state, tenant, day)
+    record["reserved_tokens"] = max(0, record["reserved_tokens"] - int(reserved or 0))
+    record["prompt_tokens"] += int(prompt_tokens or 0)
+    record["output_tokens"] += int(output_tokens or 0)
+    record["jobs"] += 1
+    await state.set(USAGE_GROUP, usage_key(tenant, day), record)
+
+
+async def release(state, tenant: Optional[str], day: Optional[str], reserved: int) -> None:
+    """Give back the reservation of a job that was never queued"""
+    if not reserved:
+        return
+    tenant = tenant or DEFAULT_TENANT
+    day = day or usage_day()
+    record = await get_usage(state, tenant, day)
+    record["reserved_tokens"] = max(0, record["reserved_tokens"] - int(reserved))
+    await state.set(USAGE_GROUP, usage_key(tenant, day), record)
+
+
+def summarize(record: dict) -> dict:
+    """API representation of one tenant-day"""
+    budget = daily_budget(record["tenant"])
+    used = record["prompt_tokens"] + record["output_tokens"]
+    return {
+        **record,
+        "total_tokens": used,
+        "budget": budget or None,
+        "remaining": max(0, budget - spent(record)) if budget else None
+    }
+
+
+async def list_usage(state, tenant: Optional[str] = None, days: int = 1) -> list:
+    """
+    The last `days` UTC days, newest first
+
+    One state read per day for a single tenant; without a tenant the whole
+    group is read and filtered.
+    """
+    today = now_ms()
+    wanted = [usage_day(today - i * DAY_MS) for i in range(max(1, days))]
+    if tenant:
+        records = [await get_usage(state, tenant, day) for day in wanted]
+    else:
+        records = [
+            {**_empty(record.get("tenant"), record.get("day")), **record}
+            for record in (await state.get_group(USAGE_GROUP) or [])
+            if record and record.get("day") in wanted
+        ]
+        records.sort(key=lambda record: record["tenant"] or "")
+        records.sort(key=lambda record: record["day"], reverse=True)
+    return [summarize(record) for record in records]
@@ -0,0 +1,174 @@
+"""
+Validation Service for request bodies
+One cached validator per body model: a pydantic-core TypeAdapter when
+Pydantic is installed, otherwise a pure-Python validator compiled once from
+the model's fallback JSON schema. Both backends return the same structured
+error list, so handlers have a single validation path
+"""
+import importlib
+import os
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+# body name -> (models module, TypedDict name, fallback schema name, strip fields name)
+BODIES = {
+    "job": ("models.jobs", "JobInput", "JOB_INPUT_SCHEMA", "JOB_INPUT_STRIP"),
+    "todo": ("models.todos", "TodoInput", "TODO_INPUT_SCHEMA", "TODO_INPUT_STRIP"),
+    "todo_update": ("models.todos", "TodoUpdateInput", "TODO_UPDATE_SCHEMA", None),
+}
+
+ValidationResult = Tuple[Optional[dict], List[dict]]
+
+_validators: Dict[Tuple[str, str], Callable[[Any], ValidationResult]] = {}
+
+
+def _error(field: str, error_type: str, **ctx) -> dict:
+    return {"field": field, "type": error_type, "message": _message(field, error_type, ctx)}
+
+
+def _message(field: str, error_type: str, ctx: dict) -> str:
+    if error_type == "missing":
+        return f"{field} is required"
+    if error_type == "string_type":
+        return f"{field} must be a string"
+    if error_type == "int_type":
+        return f"{field} must be an integer"
+    if error_type == "bool_type":
+        return f"{field} must be a boolean"
+    if error_type == "string_too_short":
+        if ctx.get("min_length") == 1:
+            return f"{field} cannot be empty"
+        return f"{field} must be at least {ctx.get('min_length')} characters"
+    if error_type == "string_too_long":
+        return f"{field} must be at most {ctx.get('max_length')} characters"
+    if error_type == "greater_than_equal":
+        return f"{field} must be >= {ctx.get('ge')}"
+    if error_type in ("dict_type", "model_type"):
+        return "Request body must be a JSON object"
+    return ctx.get("msg") or f"{field} is invalid"
+
+
+def _pydantic_validator(model) -> Callable[[Any], ValidationResult]:
+    from pydantic import TypeAdapter, ValidationError
+
+    adapter = TypeAdapter(model)
+
+    def validate(body: Any) -> ValidationResult:
+        try:
+            return adapter.validate_python(body), []
+        except ValidationError as e:
+            errors = []
+            for item in e.errors(include_url=False, include_input=False):
+                field = ".".join(str(part) for part in item["loc"])
+                errors.append(_error(field, item["type"], msg=item["msg"], **(item.get("ctx") or {})))
+            return None, errors
+
+    return validate
+
+
+# Exact type match: JSON bodies never contain subclasses, and it keeps bool
+# out of "integer" the same way pydantic's strict mode does
+_JSON_TYPES = {"string": str, "integer": int, "boolean": bool, "null": type(None)}
+_TYPE_ERRORS = {"string": "string_type", "integer": "int_type", "boolean": "bool_type"}
+
+
+def _compile_field(name: str, spec: dict, strip: bool) -> Callable[[Any], Tuple[Any, Optional[dict]]]:
+    """Pre-build the checks for one property; returns (value, error)"""
+    types = spec.get("type", [])
+    types = [types] if isinstance(types, str) else list(types)
+    allowed = frozenset(_JSON_TYPES[t] for t in types if t in _JSON_TYPES)
+    main_type = next((t for t in types if t != "null"), None)
+    min_length = spec.get("minLength")
+    max_length = spec.get("maxLength")
+    minimum = spec.get("minimum")
+
+    def check(value):
+        value_type = type(value)
+        if allowed and value_type not in allowed:
+            return None, _error(name, _TYPE_ERRORS.get(main_type, "type_error"))
+        if value_type is str:
+            if strip:
+                value = value.strip()
+            if min_length is not None and len(value) < min_length:
+                return None, _error(name, "string_too_short", min_length=min_length)
+            if max_length is not None and len(value) > max_length:
+                return None, _error(name, "string_too_long", max_length=max_length)
+        elif minimum is not None and value is not None and value < minimum:
+            return None, _error(name, "greater_than_equal", ge=minimum)
+        return value, None
+
+    return check
+
+
+def _python_validator(schema: dict, strip_fields=()) -> Callable[[Any], ValidationResult]:
+    """Pure-Python fallback compiled once from a flat object JSON schema"""
+    required = tuple(schema.get("required", ()))
+    fields = tuple(
+        (name, _compile_field(name, spec, name in strip_fields))
+        for name, spec in schema.get("properties", {}).items()
+    )
+
+    def validate(body: Any) -> ValidationResult:
+        if not isinstance(body, dict):
+            return None, [_error("", "dict_type")]
+        data, errors = {}, []
+        for name, check in fields:
+            if name not in body:
+                if name in required:
+                    errors.append(_error(name, "missing"))
+                continue
+            value, error = check(body[name])
+            if error:
+                errors.append(error)
+            else:
+                data[name] = value
+        return (None, errors) if errors else (data, [])
+
+    return validate
+
+
+def default_backend() -> str:
+    return os.environ.get("VALIDATION_BACKEND", "auto")
+
+
+def get_validator(name: str, backend: Optional[str] = None) -> Callable[[Any], ValidationResult]:
+    """
+    Return the cached validator for a body model, building it on first use
+
+    backend: "auto" (pydantic when installed), "pydantic" or "python"
+    """
+    backend = backend or default_backend()
+    key = (name, backend)
+    validator = _validators.get(key)
+    if validator is not None:
+        return validator
+
+    module_name, model_name, schema_name, strip_name = BODIES[name]
+    module = importlib.import_module(module_name)
+    model = getattr(module, model_name)
+    if backend == "pydantic" or (backend == "auto" and model is not None):
+        if model is None:
+            raise RuntimeError("pydantic is not installed")
+        validator = _pydantic_validator(model)
+    else:
+        strip_fields = getattr(module, strip_name) if strip_name else ()
+        validator = _python_validator(getattr(module, schema_name), strip_fields)
+
+    _validators[key] = validator
+    return validator
+
+
+def validate_body(name: str, body: Any) -> ValidationResult:
+    """Validate a request body; returns (clean data, []) or (None, errors)"""
+    return get_validator(name)(body)
+
+
+def error_response(errors: List[dict]) -> dict:
+    """400 response for a failed validation"""
+    return {
+        "status": 400,
+        "body": {
+            "error": errors[0]["message"] if errors else "Invalid request body",
+            "details": {"errors": errors}
+        }
+    }
@@ -0,0 +1,190 @@
+"""
+Vector Index Service for similar-job recommendations
+Local hashing-vectorizer embeddings stored as a contiguous float32 matrix,
+memory-mapped from disk and queried with vectorized cosine similarity.
+Every GenerateJobDescription run is its own process, so writers take an
+exclusive flock on the index directory's lock file around each append or
+overwrite; row i of ids.txt then always names row i of vectors.f32.
+"""
+import asyncio
+import fcntl
+import os
+import re
+import zlib
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# numpy is imported on first use; it is the bulk of this module's import time
+np = None
+_numpy_missing = False
+
+
+DIM = 256
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#.]*")
+
+
+def is_available() -> bool:
+    """numpy is an optional dependency, the index is disabled without it"""
+    global np, _numpy_missing
+    if np is None and not _numpy_missing:
+        try:
+            import numpy
+            np = numpy
+        except ImportError:
+            _numpy_missing = True
+    return np is not None
+
+
+def embed(text: str, dim: int = DIM):
+    """
+    Hashing-vectorizer embedding of unigrams and bigrams
+
+    Each feature is hashed to a bucket with a sign bit (to cancel collisions
+    on average), term frequencies are log-scaled, and the result is L2
+    normalized so a dot product is the cosine similarity.
+    """
+    tokens = _TOKEN_RE.findall(str(text or "").lower())
+    features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+
+    vector = np.zeros(dim, dtype=np.float32)
+    for feature in features:
+        h = zlib.crc32(feature.encode("utf-8"))
+        vector[h % dim] += 1.0 if h & 0x80000000 else -1.0
+
+    vector = np.sign(vector) * np.log1p(np.abs(vector))
+    norm = float(np.linalg.norm(vector))
+    if norm > 0:
+        vector /= norm
+    return vector.astype(np.float32, copy=False)
+
+
+class VectorIndexService:
+    def __init__(self, base_dir: Optional[str] = None, dim: int = DIM):
+        if not is_available():
+            raise RuntimeError("numpy is required for the vector index")
+        self.base_dir = Path(base_dir or os.environ.get("VECTOR_INDEX_DIR", "data/vectors"))
+        self.dim = dim
+        self.vectors_path = self.base_dir / "vectors.f32"
+        self.ids_path = self.base_dir / "ids.txt"
+        self.lock_path = self.base_dir / ".lock"
+        self._ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._ids_offset = 0
+        self._matrix = None
+        self._lock = asyncio.Lock()
+
+    def _refresh(self) -> None:
+        """Pick up rows appended since the last refresh (ids tail + remap)"""
+        if not self.ids_path.exists():
+            return
+
+        with open(self.ids_path, "r", encoding="utf-8") as f:
+            f.seek(self._ids_offset)
+            tail = f.read()
+            # Only consume complete lines, a writer may be mid-append
+            complete = tail[:tail.rfind("\n") + 1]
+            self._ids_offset += len(complete.encode("utf-8"))
+
+        for job_id in complete.splitlines():
+            if job_id not in self._rows:
+                self._rows[job_id] = len(self._ids)
+            self._ids.append(job_id)
+
+        rows = min(len(self._ids), self._stored_rows())
+        if self._matrix is None or self._matrix.shape[0] != rows:
+            self._matrix = (
+                np.memmap(self.vectors_path, dtype=np.float32, mode="r", shape=(rows, self.dim))
+                if rows else None
+            )
+
+    def _stored_rows(self) -> int:
+        if not self.vectors_path.exists():
+            return 0
+        return self.vectors_path.stat().st_size // (self.dim * 4)
+
+    def _write(self, job_id: str, vector) -> None:
+        self.base_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.lock_path, "a") as lock:
+            # Serializes writers across processes; readers need no lock
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                self._write_locked(job_id, vector)
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _write_locked(self, job_id: str, vector) -> None:
+        self._refresh()
+
+        row = self._rows.get(job_id)
+        if row is not None and row < self._stored_rows():
+            # Re-generated job: overwrite its row in place
+            with open(self.vectors_path, "r+b") as f:
+                f.seek(row * self.dim * 4)
+                f.write(vector.tobytes())
+            self._matrix = None
+            self._refresh()
+            return
+
+        # Vector first, then id: readers only map rows that have an id. A
+        # writer that died between the two left a vector without an id; drop it
+        if self._stored_rows() > len(self._ids):
+            os.truncate(self.vectors_path, len(self._ids) * self.dim * 4)
+        with open(self.vectors_path, "ab") as f:
+            f.write(vector.tobytes())
+        with open(self.ids_path, "a", encoding="utf-8") as f:
+            f.write(job_id + "\n")
+        self._refresh()
+
+    async def add(self, job_id: str, content: str) -> None:
+        """Embed generated content and append/overwrite the job's row"""
+        vector = embed(content, self.dim)
+        async with self._lock:
+            await asyncio.get_event_loop().run_in_executor(None, self._write, job_id, vector)
+
+    def _row_count(self) -> int:
+        return 0 if self._matrix is None else self._matrix.shape[0]
+
+    def similar(self, job_id: str, k: int = 10) -> Optional[List[Tuple[str, float]]]:
+        """
+        Top-k most similar jobs by cosine similarity
+
+        Returns:
+            List of (job_id, score) pairs, best first, or None if the job
+            has no vector yet
+        """
+        self._refresh()
+        row = self._rows.get(job_id)
+        if row is None or row >= self._row_count():
+            return None
+
+        matrix = self._matrix
+        scores = np.asarray(matrix) @ np.asarray(matrix[row])
+        scores[row] = -np.inf
+
+        k = max(0, min(k, matrix.shape[0] - 1))
+        if k == 0:
+            return []
+
+        top = np.argpartition(scores, -k)[-k:]
+        top = top[np.argsort(scores[top])[::-1]]
+
+        results = []
+        for i in top:
+            other = self._ids[i]
+            # Stale rows of re-indexed ids point at a newer row, skip them
+            if self._rows.get(other) == i and other != job_id:
+                results.append((other, float(scores[i])))
+        return results
+
+
+# Process-wide instance so the id map and memmap are reused across calls
+_service: Optional[VectorIndexService] = None
+
+
+# Factory function for easy instantiation
+def create_vector_index_service() -> VectorIndexService:
+    """Create (once per process) and return the VectorIndexService"""
+    global _service
+    if _service is None:
+        _service = VectorIndexService()
+    return _service
@@ -1,60 +1,31 @@
+import os
+import sys
 import uuid
-from datetime import datetime, timezone
 
-try:
-    from pydantic import BaseModel, Field
-    
-    class TodoInput(BaseModel):
-        title: str = Field(..., min_length=1, description="Todo title")
-        description: str = Field(default="", description="Todo description")
-        completed: bool = Field(default=False, description="Completion status")
-    
-    class TodoResponse(BaseModel):
-        id: str
-        title: str
-        description: str
-        completed: bool
-        createdAt: str
-        updatedAt: str
-    
-    class ErrorResponse(BaseModel):
-        error: str
-    
-    body_schema = TodoInput.model_json_schema()
-    response_schema = {
-        201: TodoResponse.model_json_schema(),
-        400: ErrorResponse.model_json_schema()
-    }
-except ImportError:
-    body_schema = {
-        "type": "object",
-        "properties": {
-            "title": {"type": "string", "minLength": 1},
-            "description": {"type": "string"},
-            "completed": {"type": "boolean"}
-        },
-        "required": ["title"]
-    }
-    response_schema = {
-        201: {
-            "type": "object",
-            "properties": {
-                "id": {"type": "string"},
-                "title": {"type": "string"},
-                "description": {"type": "string"},
-                "completed": {"type": "boolean"},
-                "createdAt": {"type": "string"},
-                "updatedAt": {"type": "string"}
-            }
-        },
-        400: {
-            "type": "object",
-            "properties": {
-                "error": {"type": "string"}
-            }
+# Add src to path for service imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from models.records import Todo
+from services.schema_cache import load_step_schemas
+from services.validation_service import error_response, validate_body
+
+
+def _build_schemas():
+    """Schemas for the step config (only runs on a schema cache miss)"""
+    from models.todos import error_response_schema, todo_input_schema, todo_response_schema
+    return {
+        "body_schema": todo_input_schema(),
+        "response_schema": {
+            201: todo_response_schema(),
+            400: error_response_schema()
         }
     }
 
+
+_schemas = load_step_schemas(__file__, _build_schemas, depends=["models/todos.py"])
+body_schema = _schemas["body_schema"]
+response_schema = _schemas["response_schema"]
+
 config = {
     "name": "CreateTodo",
     "type": "api",
@@ -69,36 +40,28 @@ config = {
 
 async def handler(req, context):
     try:
-        body = req.get("body", {})
-        title = body.get("title", "").strip()
-        
-        if not title:
-            return {
-                "status": 400,
-                "body": {"error": "Title is required"}
-            }
+        body, errors = validate_body("todo", req.get("body"))
+        if errors:
+            return error_response(errors)
+        title = body["title"]
         
         # Create new todo
         todo_id = str(uuid.uuid4())
-        timestamp = datetime.now(timezone.utc).isoformat()
-        
-        todo = {
-            "id": todo_id,
-            "title": title,
-            "description": body.get("description", ""),
-            "completed": body.get("completed", False),
-            "createdAt": timestamp,
-            "updatedAt": timestamp
-        }
+        todo = Todo(
+            id=todo_id,
+            title=title,
+            description=body.get("description", ""),
+            completed=body.get("completed", False)
+        )
         
         # Store in state
-        await context.state.set("todos", todo_id, todo)
+        await context.state.set("todos", todo_id, todo.to_state())
         
         context.logger.info("Todo created", {"id": todo_id, "title": title})
         
         return {
             "status": 201,
-            "body": todo
+            "body": todo.to_dict()
         }
         
     except Exception as e:
@@ -1,3 +1,11 @@
+import os
+import sys
+
+# Add src to path for service imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from models.records import Todo
+
 config = {
     "name": "GetTodo",
     "type": "api",
@@ -39,7 +47,7 @@ async def handler(req, context):
             }
         
         # Get todo from state
-        todo = await context.state.get("todos", todo_id)
+        todo = Todo.from_state(await context.state.get("todos", todo_id))
         
         if not todo:
             context.logger.warn("Todo not found", {"id": todo_id})
@@ -52,7 +60,7 @@ async def handler(req, context):
         
         return {
             "status": 200,
-            "body": todo
+            "body": todo.to_dict()
         }
         
     except Exception as e:
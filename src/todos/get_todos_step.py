@@ -1,3 +1,11 @@
+import os
+import sys
+
+# Add src to path for service imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from models.records import Todo
+
 config = {
     "name": "GetTodos",
     "type": "api",
@@ -36,14 +44,15 @@ async def handler(req, context):
         # Note: state.keys() returns all keys in the "todos" group
         todo_keys = await context.state.keys("todos")
         
-        todos = []
+        records = []
         for key in todo_keys:
-            todo = await context.state.get("todos", key)
+            todo = Todo.from_state(await context.state.get("todos", key))
             if todo:
-                todos.append(todo)
+                records.append(todo)
         
         # Sort by creation date (newest first)
-        todos.sort(key=lambda x: x.get("createdAt", ""), reverse=True)
+        records.sort(key=lambda todo: todo.created_at, reverse=True)
+        todos = [todo.to_dict() for todo in records]
         
         context.logger.info("Retrieved todos", {"count": len(todos)})
         
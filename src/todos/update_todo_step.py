@@ -1,24 +1,21 @@
-from datetime import datetime, timezone
+import os
+import sys
+
+# Add src to path for service imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from models.records import Todo, now_ms
+from services.schema_cache import load_step_schemas
+from services.validation_service import error_response, validate_body
 
-try:
-    from pydantic import BaseModel, Field
-    from typing import Optional
-    
-    class TodoUpdateInput(BaseModel):
-        title: Optional[str] = Field(None, min_length=1, description="Todo title")
-        description: Optional[str] = Field(None, description="Todo description")
-        completed: Optional[bool] = Field(None, description="Completion status")
-    
-    body_schema = TodoUpdateInput.model_json_schema()
-except ImportError:
-    body_schema = {
-        "type": "object",
-        "properties": {
-            "title": {"type": "string", "minLength": 1},
-            "description": {"type": "string"},
-            "completed": {"type": "boolean"}
-        }
-    }
+
+def _build_schemas():
+    """Schemas for the step config (only runs on a schema cache miss)"""
+    from models.todos import todo_update_schema
+    return {"body_schema": todo_update_schema()}
+
+
+body_schema = load_step_schemas(__file__, _build_schemas, depends=["models/todos.py"])["body_schema"]
 
 config = {
     "name": "UpdateTodo",
@@ -67,8 +64,12 @@ async def handler(req, context):
                 "body": {"error": "Todo ID is required"}
             }
         
+        body, errors = validate_body("todo_update", req.get("body"))
+        if errors:
+            return error_response(errors)
+        
         # Get existing todo
-        todo = await context.state.get("todos", todo_id)
+        todo = Todo.from_state(await context.state.get("todos", todo_id))
         
         if not todo:
             context.logger.warn("Todo not found for update", {"id": todo_id})
@@ -78,24 +79,23 @@ async def handler(req, context):
             }
         
         # Update fields
-        body = req.get("body", {})
         if "title" in body:
-            todo["title"] = body["title"]
+            todo.title = body["title"]
         if "description" in body:
-            todo["description"] = body["description"]
+            todo.description = body["description"]
         if "completed" in body:
-            todo["completed"] = body["completed"]
+            todo.completed = body["completed"]
         
-        todo["updatedAt"] = datetime.now(timezone.utc).isoformat()
+        todo.updated_at = now_ms()
         
         # Save updated todo
-        await context.state.set("todos", todo_id, todo)
+        await context.state.set("todos", todo_id, todo.to_state())
         
         context.logger.info("Todo updated", {"id": todo_id})
         
         return {
             "status": 200,
-            "body": todo
+            "body": todo.to_dict()
         }
         
     except Exception as e:
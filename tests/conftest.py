@@ -0,0 +1,54 @@
+"""
+Shared test setup
+Puts src/ and benchmarks/ (for the in-memory FakeContext) on sys.path and
+runs every test in a temp working directory, so description files, archive
+segments and caches never land in the checkout
+"""
+import asyncio
+import importlib.util
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+os.environ.setdefault("SCHEMA_CACHE", "false")
+
+from fake_context import FakeContext  # noqa: E402
+
+
+def load_step(relative_path: str):
+    """Import a step module from src/ by path, as Motia does"""
+    path = os.path.join(ROOT, "src", relative_path)
+    name = "step_" + relative_path.replace("/", "_")[:-3]
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+@pytest.fixture(autouse=True)
+def isolated(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    # Per-process caches would outlive the temp directory
+    import services.archive_service as archive_service
+    import services.file_service as file_service
+    import services.job_index_service as job_index_service
+    import services.latency_service as latency_service
+    monkeypatch.setattr(archive_service, "_indexes", {})
+    monkeypatch.setattr(file_service, "_created_dirs", set())
+    monkeypatch.setattr(job_index_service, "_index", None)
+    monkeypatch.setattr(latency_service, "_trackers", {})
+    yield
+
+
+@pytest.fixture
+def context():
+    return FakeContext()
@@ -0,0 +1,87 @@
+import pytest
+
+import services.admission_service as admission_service
+from conftest import load_step, run
+from models.records import now_ms
+from services.admission_service import ADMISSION_GROUP, ADMISSION_KEY, admit, update_snapshot
+
+create_step = load_step("jobs/create_job_step.py")
+
+
+def store_snapshot(context, queued_by_tenant, in_flight=0, drain_rate=None, age_ms=0):
+    context.state.groups.setdefault(ADMISSION_GROUP, {})[ADMISSION_KEY] = {
+        "queued": sum(queued_by_tenant.values()),
+        "queued_by_tenant": queued_by_tenant,
+        "in_flight": in_flight,
+        "drain_rate": drain_rate,
+        "updated_at": now_ms() - age_ms
+    }
+
+
+def test_without_snapshot_everything_is_admitted(context):
+    decision = run(admit(context.state, "acme"))
+    assert decision["allowed"] and decision["wait_s"] is None
+
+
+def test_stale_snapshot_is_ignored(context, monkeypatch):
+    monkeypatch.setenv("ADMISSION_MAX_WAIT_S", "1")
+    store_snapshot(context, {"acme": 1000}, in_flight=10, drain_rate=1.0, age_ms=120_000)
+    assert run(admit(context.state, "acme"))["allowed"]
+
+
+def test_wait_counts_one_round_per_queued_job_of_the_tenant(context):
+    # Three tenants queued; acme's 2 jobs put it 2 rounds of 3 behind
+    store_snapshot(context, {"acme": 2, "beta": 50, "gamma": 50}, in_flight=4, drain_rate=2.0)
+    decision = run(admit(context.state, "acme"))
+    assert decision["allowed"]
+    assert decision["wait_s"] == pytest.approx((2 * 3 + 4 + 1) / 2.0)
+    # A new tenant goes first in the next round
+    assert run(admit(context.state, "delta"))["wait_s"] == pytest.approx((4 + 1) / 2.0)
+
+
+def test_tenant_queue_limit_is_429(context, monkeypatch):
+    monkeypatch.setenv("ADMISSION_TENANT_MAX_QUEUED", "5")
+    store_snapshot(context, {"acme": 6, "beta": 1}, drain_rate=1.0)
+    decision = run(admit(context.state, "acme"))
+    assert (decision["allowed"], decision["status"], decision["reason"]) == (False, 429, "tenant_queue")
+    assert decision["retry_after_s"] == 4
+    assert run(admit(context.state, "beta"))["allowed"]
+
+
+def test_backlog_past_max_wait_is_503(context, monkeypatch):
+    monkeypatch.setenv("ADMISSION_MAX_WAIT_S", "10")
+    store_snapshot(context, {"acme": 30}, in_flight=9, drain_rate=1.0)
+    decision = run(admit(context.state, "acme"))
+    assert (decision["allowed"], decision["status"], decision["reason"]) == (False, 503, "backlog")
+    assert decision["retry_after_s"] == 30
+
+
+def test_drain_rate_is_measured_while_backlogged(context, monkeypatch):
+    clock = [1_000_000]
+    monkeypatch.setattr(admission_service, "now_ms", lambda: clock[0])
+
+    async def scenario():
+        await update_snapshot(context.state, 0, 10, {"acme": 5})
+        clock[0] += 2_000
+        # 6 of the 10 in flight finished in 2 s
+        return await update_snapshot(context.state, 4, 10, {"acme": 3})
+
+    snapshot = run(scenario())
+    assert snapshot["drain_rate"] == pytest.approx(3.0)
+    assert (snapshot["queued"], snapshot["in_flight"]) == (3, 10)
+
+
+def test_create_job_returns_retry_after_when_rejected(context, monkeypatch):
+    monkeypatch.setenv("ADMISSION_TENANT_MAX_QUEUED", "1")
+    store_snapshot(context, {"acme": 3}, drain_rate=1.0)
+    request = {"headers": {"x-tenant-id": "acme"}, "body": {
+        "role": "Engineer",
+        "description": "Builds and operates the data platform; owns pipelines, reviews designs and mentors the wider team on quality.",
+        "yoe": 3
+    }}
+
+    response = run(create_step.handler(request, context))
+    assert response["status"] == 429
+    assert response["headers"]["Retry-After"] == "3"
+    assert response["body"]["details"]["reason"] == "tenant_queue"
+    assert "jobs" not in context.state.groups
@@ -0,0 +1,70 @@
+import os
+
+from models.records import Job
+from services.archive_service import BLOCK_RECORDS, ArchiveService, _bloom_build, _bloom_contains
+
+
+def make_jobs(ids, status="completed"):
+    return [Job(job_id=job_id, role="Engineer", description="d", yoe=3, status=status) for job_id in ids]
+
+
+def ids(n, prefix="job"):
+    return [f"{prefix}-{i:05d}" for i in range(n)]
+
+
+def test_segment_is_split_into_sorted_blocks(tmp_path):
+    archive = ArchiveService(str(tmp_path))
+    name = archive.write_segment(make_jobs(reversed(ids(150))))
+    index = archive._load_index(name)
+    assert name == "segment-000001"
+    assert (index["count"], index["min"], index["max"]) == (150, "job-00000", "job-00149")
+    assert len(index["blocks"]) == 3
+    assert index["first_ids"] == ["job-00000", f"job-{BLOCK_RECORDS:05d}", f"job-{2 * BLOCK_RECORDS:05d}"]
+
+
+def test_get_finds_jobs_in_every_block(tmp_path):
+    archive = ArchiveService(str(tmp_path))
+    archive.write_segment(make_jobs(ids(150)))
+    for job_id in ("job-00000", "job-00063", "job-00064", "job-00149"):
+        assert archive.get(job_id).job_id == job_id
+    assert archive.get("job-00150") is None
+    assert archive.get("job-00010x") is None
+
+
+def test_bloom_has_no_false_negatives_and_few_false_positives():
+    present = ids(1000)
+    bloom = _bloom_build(present)
+    bloom["bytes"] = bytes.fromhex(bloom["bits"])
+    assert all(_bloom_contains(bloom, job_id) for job_id in present)
+    false_positives = sum(_bloom_contains(bloom, job_id) for job_id in ids(10_000, prefix="other"))
+    assert false_positives < 300
+
+
+def test_newest_segment_wins(tmp_path):
+    archive = ArchiveService(str(tmp_path))
+    archive.write_segment(make_jobs(["job-1"], status="failed"))
+    assert archive.write_segment(make_jobs(["job-1"])) == "segment-000002"
+    assert archive.get("job-1").status == "completed"
+    assert archive.stats() == {"segments": 2, "jobs": 2}
+
+
+def test_segment_without_index_is_invisible(tmp_path):
+    archive = ArchiveService(str(tmp_path))
+    archive.write_segment(make_jobs(["job-1"]))
+    os.replace(tmp_path / "segment-000001.idx.json", tmp_path / "segment-000001.idx.json.tmp")
+    assert archive.get("job-1") is None
+    assert list(archive.scan()) == []
+
+
+def test_scan_resumes_after_a_position(tmp_path):
+    archive = ArchiveService(str(tmp_path))
+    archive.write_segment(make_jobs(ids(100, prefix="a")))
+    archive.write_segment(make_jobs(ids(10, prefix="b")))
+    everything = [(position, job.job_id) for position, job in archive.scan()]
+    assert len(everything) == 110
+    assert everything[0] == (("segment-000001", 0), "a-00000")
+    assert everything[-1] == (("segment-000002", 9), "b-00009")
+
+    resumed = [(position, job.job_id) for position, job in archive.scan(after=("segment-000001", 70))]
+    assert resumed == everything[71:]
+    assert [job.job_id for _, job in archive.scan(after=("segment-000001", 99))] == ids(10, prefix="b")
@@ -0,0 +1,121 @@
+import json
+import os
+import time
+
+import pytest
+
+from conftest import load_step, run
+from models.records import Job
+from services.archive_service import ArchiveService
+from services.export_service import decode_cursor, encode_cursor, export_page, remove_expired_exports
+from services.job_index_service import index_job
+
+export_step = load_step("jobs/export_jobs_step.py")
+cleanup_step = load_step("jobs/cleanup_exports_step.py")
+
+BASE_MS = 1_750_000_000_000
+
+
+def make_job(i, status="pending"):
+    job = Job(job_id=f"job-{i:03d}", role="Engineer", description="d", yoe=3, status=status)
+    job.created_at = BASE_MS + i * 1000
+    return job
+
+
+async def seed_state(state, jobs):
+    for job in jobs:
+        await state.set("jobs", job.job_id, job.to_state())
+        await index_job(state, job)
+
+
+async def read_all(state, limit, **options):
+    pages, cursor = [], None
+    while True:
+        lines, cursor = await export_page(state, limit, cursor, **options)
+        pages.append([json.loads(line)["job_id"] for line in lines])
+        if cursor is None:
+            return pages
+
+
+@pytest.mark.parametrize("position", [["archive", "segment-000001", 63], ["state", "2025-06-15T00:00:00+00:00", "job-1"]])
+def test_cursor_round_trip(position):
+    cursor = encode_cursor(position)
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == position
+
+
+@pytest.mark.parametrize("cursor", ["not base64!", encode_cursor(["state", "x"]), encode_cursor(["archive", "seg", "1"]), encode_cursor({"a": 1})])
+def test_bad_cursor_is_rejected(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+def test_pages_cover_archive_then_state_exactly_once(context, monkeypatch, tmp_path):
+    monkeypatch.setenv("JOB_ARCHIVE_DIR", str(tmp_path / "archive"))
+    ArchiveService().write_segment([make_job(i, status="completed") for i in range(70)])
+    run(seed_state(context.state, [make_job(i) for i in range(100, 112)]))
+
+    pages = run(read_all(context.state, 25, include_content=False, include_archived=True))
+    exported = [job_id for page in pages for job_id in page]
+    assert [len(page) for page in pages] == [25, 25, 25, 7]
+    assert exported == [f"job-{i:03d}" for i in range(70)] + [f"job-{i:03d}" for i in range(100, 112)]
+
+
+def test_filters_apply_across_pages(context):
+    jobs = [make_job(i, status="completed" if i % 2 else "failed") for i in range(10)]
+    run(seed_state(context.state, jobs))
+
+    pages = run(read_all(context.state, 2, statuses=["completed"], include_content=False, created_from=BASE_MS + 3000))
+    assert [job_id for page in pages for job_id in page] == ["job-003", "job-005", "job-007", "job-009"]
+
+
+def test_handler_returns_next_cursor_until_the_last_page(context):
+    run(seed_state(context.state, [make_job(i) for i in range(5)]))
+    query = {"limit": "3", "include_content": "false"}
+
+    first = run(export_step.handler({"queryParams": query}, context))
+    assert first["status"] == 200 and first["headers"]["X-Export-Count"] == "3"
+    second = run(export_step.handler({"queryParams": {**query, "cursor": first["headers"]["X-Next-Cursor"]}}, context))
+    assert second["headers"]["X-Export-Count"] == "2"
+    assert "X-Next-Cursor" not in second["headers"]
+    assert [json.loads(line)["job_id"] for line in second["body"].splitlines()] == ["job-003", "job-004"]
+
+
+@pytest.mark.parametrize("query", [{"cursor": "garbage"}, {"gzip": "true", "limit": "10"}, {"limit": "0"}])
+def test_handler_rejects_bad_parameters(context, query):
+    assert run(export_step.handler({"queryParams": query}, context))["status"] == 400
+
+
+def test_expired_exports_are_removed(monkeypatch, tmp_path):
+    monkeypatch.setenv("EXPORT_DIR", str(tmp_path / "exports"))
+    os.makedirs(tmp_path / "exports")
+    old = time.time() - 2 * 3600
+    files = {
+        "jobs-1-0123abcd.ndjson.gz": old,
+        "jobs-2-0123abcd.ndjson.gz.4242.tmp": old,
+        "jobs-3-0123abcd.ndjson.gz": time.time(),
+        "notes.txt": old,
+    }
+    for name, mtime in files.items():
+        path = tmp_path / "exports" / name
+        path.write_bytes(b"x" * 10)
+        os.utime(path, (mtime, mtime))
+
+    assert remove_expired_exports(3600) == {"kept": 1, "removed": 2, "bytes_freed": 20}
+    assert sorted(os.listdir(tmp_path / "exports")) == ["jobs-3-0123abcd.ndjson.gz", "notes.txt"]
+
+
+def test_cleanup_cron_uses_export_ttl(context, monkeypatch, tmp_path):
+    monkeypatch.setenv("EXPORT_DIR", str(tmp_path / "exports"))
+    run(seed_state(context.state, [make_job(1)]))
+    created = run(export_step.handler({"queryParams": {"gzip": "true"}}, context))
+    path = tmp_path / "exports" / created["body"]["name"]
+
+    monkeypatch.setenv("EXPORT_TTL_HOURS", "0")
+    run(cleanup_step.handler(context))
+    assert path.exists()
+
+    monkeypatch.setenv("EXPORT_TTL_HOURS", "1")
+    os.utime(path, (time.time() - 7200, time.time() - 7200))
+    run(cleanup_step.handler(context))
+    assert not path.exists()
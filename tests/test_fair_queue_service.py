@@ -0,0 +1,100 @@
+from collections import Counter
+
+from conftest import run
+from services import fair_queue_service
+from services.fair_queue_service import schedule
+from services.outbox_service import OUTBOX_GROUP, enqueue_job, flush_outbox
+from models.records import Job
+
+
+def entries(tenant, count, cost=1000, start=0):
+    return [
+        {"job_id": f"{tenant}-{i}", "tenant": tenant, "cost": cost, "queued_at": start + i}
+        for i in range(count)
+    ]
+
+
+def tenants(picked):
+    return [entry["tenant"] for entry in picked]
+
+
+def test_equal_weights_alternate_between_tenants(monkeypatch):
+    monkeypatch.setenv("FAIR_MAX_INFLIGHT", "0")
+    monkeypatch.setenv("FAIR_TENANT_MAX_INFLIGHT", "0")
+    picked, _, _ = schedule(entries("a", 10) + entries("b", 10), {}, {}, None, 6)
+    assert tenants(picked) == ["a", "b", "a", "b", "a", "b"]
+
+
+def test_burst_does_not_delay_other_tenant(monkeypatch):
+    monkeypatch.setenv("FAIR_MAX_INFLIGHT", "0")
+    monkeypatch.setenv("FAIR_TENANT_MAX_INFLIGHT", "0")
+    # b's single job was queued after all of a's
+    picked, _, _ = schedule(entries("a", 500) + entries("b", 1, start=1000), {}, {}, None, 2)
+    assert sorted(tenants(picked)) == ["a", "b"]
+
+
+def test_weights_split_slots_proportionally(monkeypatch):
+    monkeypatch.setenv("FAIR_MAX_INFLIGHT", "0")
+    monkeypatch.setenv("FAIR_TENANT_MAX_INFLIGHT", "0")
+    monkeypatch.setenv("TENANT_WEIGHTS", "a=3,b=1")
+    picked, _, _ = schedule(entries("a", 50) + entries("b", 50), {}, {}, None, 40)
+    assert Counter(tenants(picked)) == {"a": 30, "b": 10}
+
+
+def test_cost_is_charged_against_deficit(monkeypatch):
+    monkeypatch.setenv("FAIR_MAX_INFLIGHT", "0")
+    monkeypatch.setenv("FAIR_TENANT_MAX_INFLIGHT", "0")
+    # a's jobs cost two quanta each, so b gets two jobs for each of a's
+    picked, _, _ = schedule(entries("a", 10, cost=2000) + entries("b", 10), {}, {}, None, 9)
+    assert Counter(tenants(picked)) == {"a": 3, "b": 6}
+
+
+def test_deficit_and_rotation_carry_over_between_runs(monkeypatch):
+    monkeypatch.setenv("FAIR_MAX_INFLIGHT", "0")
+    monkeypatch.setenv("FAIR_TENANT_MAX_INFLIGHT", "0")
+    queued = entries("a", 5, cost=1500) + entries("b", 5)
+
+    picked, deficits, last = schedule(queued, {}, {}, None, 1)
+    assert tenants(picked) == ["b"]
+    assert deficits == {"a": 1000.0}
+
+    # The next run starts after b and a now has enough credit
+    picked, deficits, last = schedule(queued, {}, deficits, last, 1)
+    assert tenants(picked) == ["a"]
+    assert last == "a"
+
+
+def test_tenant_cap_skips_saturated_tenant(monkeypatch):
+    monkeypatch.setenv("FAIR_MAX_INFLIGHT", "0")
+    monkeypatch.setenv("FAIR_TENANT_MAX_INFLIGHT", "2")
+    picked, deficits, _ = schedule(entries("a", 10) + entries("b", 10), {"a": 2, "b": 1}, {}, None, 10)
+    assert tenants(picked) == ["b"]
+    # Capped tenants do not bank credit while they wait
+    assert "a" not in deficits
+
+
+def test_overall_cap_limits_batch(monkeypatch):
+    monkeypatch.setenv("FAIR_MAX_INFLIGHT", "5")
+    monkeypatch.setenv("FAIR_TENANT_MAX_INFLIGHT", "0")
+    picked, _, _ = schedule(entries("a", 10) + entries("b", 10), {"c": 3}, {}, None, 10)
+    assert len(picked) == 2
+
+
+def test_flush_outbox_publishes_fairly_across_tenants(monkeypatch, context):
+    monkeypatch.setenv("FAIR_MAX_INFLIGHT", "0")
+    monkeypatch.setenv("FAIR_TENANT_MAX_INFLIGHT", "0")
+
+    async def scenario():
+        for tenant, count in (("bulk", 20), ("small", 2)):
+            for i in range(count):
+                job = Job(job_id=f"{tenant}-{i}", role="Engineer", description="d", yoe=1, tenant=tenant)
+                await enqueue_job(context.state, job, "generate-job-description", {"job_id": job.job_id}, cost=1000)
+        return await flush_outbox(context.state, context.emit, limit=4)
+
+    result = run(scenario())
+    published = [event["data"]["job_id"].split("-")[0] for event in context.emit.events]
+    assert result["published"] == 4
+    assert Counter(published) == {"bulk": 2, "small": 2}
+    assert result["queued_by_tenant"] == {"bulk": 18}
+    assert run(fair_queue_service.inflight_by_tenant(context.state)) == {"bulk": 2, "small": 2}
+    assert len(context.state.groups[OUTBOX_GROUP]) == 18
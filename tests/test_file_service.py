@@ -0,0 +1,71 @@
+import os
+
+import pytest
+
+from conftest import run
+from services.file_service import BLOB_DIR, FileService, content_digest
+
+
+@pytest.fixture
+def dedup(monkeypatch):
+    monkeypatch.setenv("FILE_DEDUP", "true")
+    return FileService("descriptions")
+
+
+def blob_path(content):
+    return os.path.join("descriptions", BLOB_DIR, f"{content_digest(content)}.txt")
+
+
+def test_identical_descriptions_share_one_blob(dedup):
+    async def scenario():
+        for job_id in ("a", "b"):
+            await dedup.save_job_description(job_id, "same text")
+        await dedup.save_job_description("c", "other text")
+        return [await dedup.read_job_description(job_id) for job_id in ("a", "b", "c")]
+
+    assert run(scenario()) == ["same text", "same text", "other text"]
+    shared = os.stat(blob_path("same text"))
+    assert shared.st_nlink == 3
+    assert os.stat("descriptions/a.txt").st_ino == os.stat("descriptions/b.txt").st_ino == shared.st_ino
+    assert os.stat(blob_path("other text")).st_nlink == 2
+
+
+def test_garbage_collection_waits_for_the_last_reference(dedup):
+    run(dedup.save_job_description("a", "same text"))
+    run(dedup.save_job_description("b", "same text"))
+
+    assert run(dedup.delete_job_description("a"))
+    assert dedup.collect_garbage(grace_s=0) == {"blobs": 1, "removed": 0, "bytes_freed": 0}
+    assert run(dedup.read_job_description("b")) == "same text"
+
+    assert run(dedup.delete_job_description("b"))
+    assert dedup.collect_garbage(grace_s=0) == {"blobs": 0, "removed": 1, "bytes_freed": len("same text")}
+    assert not os.path.exists(blob_path("same text"))
+
+
+def test_grace_period_keeps_fresh_blobs(dedup):
+    run(dedup.save_job_description("a", "same text"))
+    run(dedup.delete_job_description("a"))
+    assert dedup.collect_garbage(grace_s=60)["removed"] == 0
+    assert os.path.exists(blob_path("same text"))
+
+
+def test_rewriting_a_shared_file_leaves_other_jobs_alone(dedup, monkeypatch):
+    run(dedup.save_job_description("a", "same text"))
+    run(dedup.save_job_description("b", "same text"))
+    monkeypatch.setenv("FILE_DEDUP", "false")
+
+    run(dedup.save_job_description("a", "new text"))
+    assert run(dedup.read_job_description("a")) == "new text"
+    assert run(dedup.read_job_description("b")) == "same text"
+    assert os.stat(blob_path("same text")).st_nlink == 2
+
+
+def test_collected_blob_is_written_again(dedup):
+    run(dedup.save_job_description("a", "same text"))
+    run(dedup.delete_job_description("a"))
+    dedup.collect_garbage(grace_s=0)
+
+    run(dedup.save_job_description("b", "same text"))
+    assert run(dedup.read_job_description("b")) == "same text"
+    assert os.stat(blob_path("same text")).st_nlink == 2
@@ -0,0 +1,193 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from conftest import run
+from services.gemini_service import GeminiService, HedgePolicy, ModelRouter
+
+
+class ApiError(Exception):
+    def __init__(self, code):
+        super().__init__(f"{code} error")
+        self.code = code
+
+
+class FakeModels:
+    """generate_content by model: an exception to raise or text to return"""
+
+    def __init__(self, outcomes):
+        self.outcomes = outcomes
+        self.calls = []
+
+    async def generate_content(self, model, contents, config):
+        self.calls.append(model)
+        outcome = self.outcomes[model]
+        if isinstance(outcome, Exception):
+            raise outcome
+        return SimpleNamespace(text=outcome, usage_metadata=SimpleNamespace(
+            prompt_token_count=100, candidates_token_count=600
+        ))
+
+
+def make_service(monkeypatch, outcomes):
+    monkeypatch.setenv("GEMINI_MODELS", ",".join(outcomes))
+    service = GeminiService(api_key="test")
+    service.client = SimpleNamespace(aio=SimpleNamespace(models=FakeModels(outcomes)))
+    return service
+
+
+def train(router, model, per_request, per_token, sizes=(500, 700, 900, 1100) * 5):
+    for tokens in sizes:
+        router.record_success(model, per_request + per_token * tokens, tokens)
+
+
+def test_fit_recovers_per_request_and_per_token_cost():
+    router = ModelRouter(["a"])
+    train(router, "a", 2.0, 0.004)
+    per_request, per_token = router.latency_model("a")
+    assert per_request == pytest.approx(2.0)
+    assert per_token == pytest.approx(0.004)
+    assert router.expected_seconds("a", 1000) == pytest.approx(6.0)
+
+
+def test_uniform_sizes_fall_back_to_per_token_cost():
+    router = ModelRouter(["a"])
+    train(router, "a", 1.0, 0.002, sizes=(600,) * 10)
+    assert router.latency_model("a") == (0.0, pytest.approx(2.2 / 600))
+
+
+def test_route_depends_on_output_size():
+    # a: slow start, fast decoding; b: fast start, slow decoding
+    router = ModelRouter(["a", "b"])
+    train(router, "a", 3.0, 0.001)
+    train(router, "b", 0.2, 0.004)
+    assert router.plan(200) == ["b", "a"]
+    assert router.plan(1000) == ["a", "b"]
+
+
+def test_unknown_models_keep_chain_order():
+    router = ModelRouter(["a", "b"])
+    train(router, "b", 0.1, 0.0001)
+    assert router.plan(600) == ["a", "b"]
+
+
+def test_open_circuit_skips_model(monkeypatch):
+    monkeypatch.setenv("GEMINI_MODEL_MAX_FAILURES", "2")
+    router = ModelRouter(["a", "b"])
+    router.record_failure("a")
+    assert router.plan(600) == ["a", "b"]
+    router.record_failure("a")
+    assert router.plan(600) == ["b"]
+    router.record_failure("b")
+    router.record_failure("b")
+    # Everything cooling down: chain order
+    assert router.plan(600) == ["a", "b"]
+
+
+def test_retryable_error_falls_back_to_next_model(monkeypatch):
+    service = make_service(monkeypatch, {"a": ApiError(503), "b": "Role Overview"})
+    result = run(service.generate_job_description("Engineer", "d", 3))
+    assert result.text == "Role Overview"
+    assert (result.model, result.attempts) == ("b", ["a", "b"])
+    assert (result.prompt_tokens, result.output_tokens) == (100, 600)
+    assert service.router.trackers["a"].meta["failures"] == 1
+    assert service.router.trackers["b"].meta["latency_fit"]["tokens"] == 600
+
+
+def test_client_error_does_not_fall_back(monkeypatch):
+    service = make_service(monkeypatch, {"a": ApiError(400), "b": "Role Overview"})
+    with pytest.raises(Exception, match="400"):
+        run(service.generate_job_description("Engineer", "d", 3))
+    assert service.client.aio.models.calls == ["a"]
+
+
+class ScriptedModels:
+    """Each call sleeps for the next scripted delay, then answers with its call number"""
+
+    def __init__(self, delays):
+        self.delays = list(delays)
+        self.started = 0
+        self.cancelled = 0
+
+    async def generate_content(self, model, contents, config):
+        call = self.started
+        self.started += 1
+        try:
+            await asyncio.sleep(self.delays[call])
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        return SimpleNamespace(text=f"call {call}", usage_metadata=None)
+
+
+def make_hedged_service(monkeypatch, delays, credits=1.0):
+    monkeypatch.setenv("GEMINI_MODELS", "m")
+    monkeypatch.setenv("GEMINI_HEDGE_ENABLED", "true")
+    monkeypatch.setenv("GEMINI_HEDGE_MIN_SAMPLES", "1")
+    monkeypatch.setenv("GEMINI_HEDGE_MIN_DELAY_MS", "10")
+    service = GeminiService(api_key="test")
+    service.client = SimpleNamespace(aio=SimpleNamespace(models=ScriptedModels(delays)))
+    tracker = service.router.trackers["m"]
+    tracker.record(0.02)
+    tracker.meta["hedge_credits"] = credits
+    return service
+
+
+def test_policy_waits_for_history_and_credits(monkeypatch):
+    monkeypatch.setenv("GEMINI_HEDGE_ENABLED", "true")
+    monkeypatch.setenv("GEMINI_HEDGE_MIN_SAMPLES", "2")
+    monkeypatch.setenv("GEMINI_HEDGE_MAX_RATE", "0.5")
+    tracker = SimpleNamespace(meta={}, percentile=lambda q, n: None)
+    policy = HedgePolicy(tracker)
+    assert policy.delay() is None
+    policy.earn()
+    assert not policy.spend()
+    policy.earn()
+    assert policy.spend()
+    assert tracker.meta["hedge_credits"] == 0.0
+
+
+def test_hedging_is_off_by_default(monkeypatch):
+    monkeypatch.delenv("GEMINI_HEDGE_ENABLED", raising=False)
+    tracker = SimpleNamespace(meta={}, percentile=lambda q, n: 1.0)
+    assert HedgePolicy(tracker).delay() is None
+
+
+def test_slow_primary_is_hedged_and_cancelled(monkeypatch):
+    service = make_hedged_service(monkeypatch, [1.0, 0.0])
+    models = service.client.aio.models
+
+    response = run(service._generate_hedged("prompt", "m"))
+    assert response.text == "call 1"
+    assert models.started == 2 and models.cancelled == 1
+
+
+def test_fast_primary_is_not_hedged(monkeypatch):
+    service = make_hedged_service(monkeypatch, [0.0, 0.0])
+    response = run(service._generate_hedged("prompt", "m"))
+    assert response.text == "call 0"
+    assert service.client.aio.models.started == 1
+
+
+def test_no_hedge_without_credits(monkeypatch):
+    service = make_hedged_service(monkeypatch, [0.1, 0.0], credits=0.0)
+    response = run(service._generate_hedged("prompt", "m"))
+    assert response.text == "call 0"
+    assert service.client.aio.models.started == 1
+
+
+def test_caller_timeout_cancels_both_requests(monkeypatch):
+    service = make_hedged_service(monkeypatch, [1.0, 1.0])
+    models = service.client.aio.models
+
+    async def scenario():
+        try:
+            await asyncio.wait_for(service._generate_hedged("prompt", "m"), 0.1)
+        except asyncio.TimeoutError:
+            pass
+        # Let the cancellations land
+        await asyncio.sleep(0)
+
+    run(scenario())
+    assert models.started == 2 and models.cancelled == 2
@@ -0,0 +1,49 @@
+from conftest import load_step, run
+from fake_context import FakeContext, FakeState
+from models.records import Job
+from services.gemini_service import GenerationResult
+from services.prompt_index_service import SIGNATURE_GROUP
+
+generate_step = load_step("jobs/generate_description_step.py")
+
+
+class FakeGemini:
+    def __init__(self):
+        self.calls = 0
+
+    async def generate_job_description(self, role, description, yoe, comp=None, deadline_at=None):
+        self.calls += 1
+        return GenerationResult(text=f"{role} with {yoe}+ years\n", model="fake", attempts=["fake"],
+                                prompt_tokens=10, output_tokens=20)
+
+
+class FailingSignatureState(FakeState):
+    """Prompt index writes fail after the job has been completed"""
+
+    async def set(self, group_id, key, value):
+        if group_id == SIGNATURE_GROUP:
+            raise RuntimeError("state unavailable")
+        return await super().set(group_id, key, value)
+
+
+def event_data(job):
+    return {"job_id": job.job_id, "role": job.role, "description": job.description, "yoe": job.yoe}
+
+
+def test_prompt_index_failure_keeps_job_completed(monkeypatch):
+    monkeypatch.setenv("PROMPT_REUSE_MODE", "reuse")
+    gemini = FakeGemini()
+    monkeypatch.setattr(generate_step, "create_gemini_service", lambda: gemini)
+    context = FakeContext(state=FailingSignatureState())
+    job = Job(job_id="job-1", role="Engineer", description="d", yoe=3)
+
+    async def scenario():
+        await context.state.set("jobs", job.job_id, job.to_state())
+        await generate_step.handler(event_data(job), context)
+
+    run(scenario())
+    stored = Job.from_state(context.state.groups["jobs"][job.job_id])
+    assert gemini.calls == 1
+    assert stored.status == "completed"
+    assert stored.error is None
+    assert stored.file_path
@@ -0,0 +1,95 @@
+import pytest
+
+from conftest import load_step, run
+from models.records import Job
+from services.file_service import FileService
+
+get_job_step = load_step("jobs/get_job_step.py")
+
+CONTENT = "Role Overview\n" + "0123456789" * 10
+
+
+def request(job_id="job-1", query=None, headers=None):
+    return {"pathParams": {"id": job_id}, "queryParams": query or {}, "headers": headers or {}}
+
+
+@pytest.mark.parametrize("query, headers, expected", [
+    ({}, {}, (None, None)),
+    ({}, {"Range": "bytes=0-9"}, ((0, 10), None)),
+    ({}, {"range": "bytes=5-"}, ((5, None), None)),
+    ({}, {"Range": "bytes=-7"}, ((-7, None), None)),
+    # Unsatisfiable or unsupported Range headers are ignored
+    ({}, {"Range": "bytes=9-3"}, (None, None)),
+    ({}, {"Range": "bytes=0-1,4-5"}, (None, None)),
+    ({}, {"Range": "items=0-5"}, (None, None)),
+    # offset/length win over a Range header
+    ({"offset": "3", "length": "4"}, {"Range": "bytes=0-9"}, ((3, 4), None)),
+    ({"offset": ["2"]}, {}, ((2, None), None)),
+    ({"length": "5"}, {}, ((0, 5), None)),
+    ({"offset": "x"}, {}, (None, "offset and length must be integers")),
+    ({"offset": "-1"}, {}, (None, "offset must be >= 0 and length > 0")),
+    ({"length": "0"}, {}, (None, "offset must be >= 0 and length > 0")),
+])
+def test_requested_range(query, headers, expected):
+    assert get_job_step._requested_range(request(query=query, headers=headers)) == expected
+
+
+@pytest.fixture
+def completed_job(context):
+    async def setup():
+        path = await FileService().save_job_description("job-1", CONTENT)
+        job = Job(job_id="job-1", role="Engineer", description="d", yoe=3, status="completed", file_path=path)
+        await context.state.set("jobs", job.job_id, job.to_state())
+    run(setup())
+    return context
+
+
+def test_status_poll_does_not_return_content(completed_job):
+    response = run(get_job_step.handler(request(), completed_job))
+    assert response["status"] == 200
+    assert "content" not in response["body"]
+
+
+def test_include_content_returns_whole_description(completed_job):
+    response = run(get_job_step.handler(request(query={"include": "content"}), completed_job))
+    assert response["status"] == 200
+    assert response["body"]["content"] == CONTENT
+
+
+def test_range_header_returns_partial_content(completed_job):
+    response = run(get_job_step.handler(request(headers={"Range": "bytes=0-12"}), completed_job))
+    assert response["status"] == 206
+    assert response["body"]["content"] == "Role Overview"
+    assert response["body"]["content_range"] == {"offset": 0, "length": 13, "total": len(CONTENT)}
+    assert response["headers"]["Content-Range"] == f"bytes 0-12/{len(CONTENT)}"
+
+
+def test_suffix_range_returns_the_tail(completed_job):
+    response = run(get_job_step.handler(request(headers={"Range": "bytes=-4"}), completed_job))
+    assert response["status"] == 206
+    assert response["body"]["content"] == "6789"
+    total = len(CONTENT)
+    assert response["headers"]["Content-Range"] == f"bytes {total - 4}-{total - 1}/{total}"
+
+
+def test_length_past_the_end_is_clamped(completed_job):
+    response = run(get_job_step.handler(request(query={"offset": "110", "length": "100"}), completed_job))
+    assert response["status"] == 206
+    assert response["body"]["content"] == CONTENT[110:]
+
+
+def test_offset_past_the_end_is_416(completed_job):
+    response = run(get_job_step.handler(request(query={"offset": "5000"}), completed_job))
+    assert response["status"] == 416
+    assert response["headers"]["Content-Range"] == f"bytes */{len(CONTENT)}"
+
+
+def test_bad_range_parameters_are_400(completed_job):
+    response = run(get_job_step.handler(request(query={"offset": "abc"}), completed_job))
+    assert response["status"] == 400
+
+
+def test_unknown_job_is_404(context, monkeypatch, tmp_path):
+    monkeypatch.setenv("JOB_ARCHIVE_DIR", str(tmp_path / "archive"))
+    response = run(get_job_step.handler(request(job_id="missing", query={"include": "content"}), context))
+    assert response["status"] == 404
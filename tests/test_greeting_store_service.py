@@ -0,0 +1,34 @@
+from conftest import run
+from services.greeting_store_service import CURSOR_KEY, GREETINGS_GROUP, prune_greetings, record_greeting
+
+
+def test_ring_keeps_the_latest_greetings(context, monkeypatch):
+    monkeypatch.setenv("GREETINGS_RING_SIZE", "3")
+
+    async def scenario():
+        for i in range(5):
+            await record_greeting(context.state, f"req-{i}", f"Hello {i}", None)
+
+    run(scenario())
+    group = context.state.groups[GREETINGS_GROUP]
+    kept = sorted(value["requestId"] for key, value in group.items() if key != CURSOR_KEY)
+    assert kept == ["req-2", "req-3", "req-4"]
+    assert group["recent-1"]["requestId"] == "req-4"
+    assert group[CURSOR_KEY] == {"next": 2}
+
+
+def test_prune_keeps_the_cursor_and_drops_shrunk_slots(context, monkeypatch):
+    monkeypatch.setenv("GREETINGS_RING_SIZE", "4")
+
+    async def scenario():
+        for i in range(4):
+            await record_greeting(context.state, f"req-{i}", "Hello", None)
+        monkeypatch.setenv("GREETINGS_RING_SIZE", "2")
+        removed = await prune_greetings(context.state)
+        await record_greeting(context.state, "req-4", "Hello", None)
+        return removed
+
+    assert run(scenario())["greetings"] == 2
+    group = context.state.groups[GREETINGS_GROUP]
+    assert sorted(group) == [CURSOR_KEY, "recent-0", "recent-1"]
+    assert group["recent-0"]["requestId"] == "req-4"
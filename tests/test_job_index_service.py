@@ -0,0 +1,139 @@
+from conftest import run
+from models.records import Job
+from services import job_index_service
+from services.job_index_service import JobIndex, index_job, job_to_row, load_job_index, unindex_job
+
+
+ROWS = [
+    # job_id, status, yoe, role, has_comp, created_at
+    ["j1", "completed", 2, "data engineer", True, "2025-01-01T00:00:01+00:00"],
+    ["j2", "completed", 5, "senior software engineer", False, "2025-01-01T00:00:02+00:00"],
+    ["j3", "failed", 7, "senior data engineer", True, "2025-01-01T00:00:03+00:00"],
+    ["j4", "pending", 5, "senior software engineer", True, "2025-01-01T00:00:04+00:00"],
+    ["j5", "completed", 10, "staff engineer", False, "2025-01-01T00:00:05+00:00"],
+]
+
+
+def build():
+    index = JobIndex()
+    index.bulk_load([list(row) for row in ROWS])
+    return index
+
+
+def test_status_filter_returns_newest_first():
+    result = build().query(status="completed")
+    assert result["job_ids"] == ["j5", "j2", "j1"]
+    assert result["total"] == 3
+
+
+def test_yoe_range_is_inclusive():
+    assert build().query(yoe_min=5, yoe_max=7)["job_ids"] == ["j4", "j3", "j2"]
+    assert build().query(yoe_min=8)["job_ids"] == ["j5"]
+    assert build().query(yoe_max=2)["job_ids"] == ["j1"]
+
+
+def test_role_prefix_is_normalized():
+    assert build().query(role_prefix="  Senior   SOFTWARE")["job_ids"] == ["j4", "j2"]
+    assert build().query(role_prefix="senior")["total"] == 3
+    assert build().query(role_prefix="principal")["total"] == 0
+
+
+def test_has_comp_and_combined_filters():
+    index = build()
+    assert index.query(has_comp=True)["job_ids"] == ["j4", "j3", "j1"]
+    assert index.query(has_comp=False)["job_ids"] == ["j5", "j2"]
+    assert index.query(status="completed", has_comp=True, yoe_max=5)["job_ids"] == ["j1"]
+
+
+def test_facets_count_the_matched_set():
+    facets = build().query(role_prefix="senior")["facets"]
+    assert facets["status"]["completed"] == 1
+    assert facets["status"]["failed"] == 1
+    assert facets["status"]["pending"] == 1
+    assert facets["has_comp"] == {"true": 2, "false": 1}
+
+
+def test_limit_and_offset_page_newest_first():
+    index = build()
+    assert index.query(limit=2)["job_ids"] == ["j5", "j4"]
+    assert index.query(limit=2, offset=2)["job_ids"] == ["j3", "j2"]
+    assert index.query(limit=2, offset=4)["total"] == 5
+
+
+def test_upsert_and_remove_update_every_facet():
+    index = build()
+    index.upsert(["j4", "completed", 1, "intern", False, ROWS[3][5]])
+    assert index.query(status="pending")["total"] == 0
+    assert index.query(status="completed", yoe_max=1)["job_ids"] == ["j4"]
+    assert index.query(role_prefix="senior software")["job_ids"] == ["j2"]
+
+    assert index.remove("j1")
+    assert not index.remove("j1")
+    assert "j1" not in index
+    assert index.query(has_comp=True)["job_ids"] == ["j3"]
+    assert index.status_counts()["completed"] == 3
+
+
+def test_cached_prefix_masks_follow_writes(monkeypatch):
+    monkeypatch.setattr(job_index_service, "PREFIX_CACHE_SIZE", 2)
+    index = build()
+    assert index.query(role_prefix="senior")["total"] == 3
+    assert index.query(role_prefix="s")["total"] == 4
+
+    index.upsert(["j6", "pending", 1, "senior data engineer", False, "2025-01-01T00:00:06+00:00"])
+    index.upsert(["j2", "completed", 5, "principal engineer", False, "2025-01-01T00:00:02+00:00"])
+    index.remove("j5")
+    assert index.query(role_prefix="senior")["job_ids"] == ["j6", "j4", "j3"]
+    assert index.query(role_prefix="s")["job_ids"] == ["j6", "j4", "j3"]
+
+    # Evicts the oldest cached prefix; results are unchanged
+    assert index.query(role_prefix="p")["job_ids"] == ["j2"]
+    assert list(index._prefix_masks) == ["s", "p"]
+    assert index.query(role_prefix="senior")["job_ids"] == ["j6", "j4", "j3"]
+
+
+def test_select_orders_by_created_at_and_resumes_after_key():
+    index = build()
+    assert index.select(("completed", "failed")) == ["j1", "j2", "j3", "j5"]
+    assert index.select(created_from="2025-01-01T00:00:02+00:00", created_to="2025-01-01T00:00:04+00:00") == ["j2", "j3"]
+    assert index.select(after=(ROWS[1][5], "j2")) == ["j3", "j4", "j5"]
+
+
+def test_warm_index_catches_up_from_changelog(monkeypatch, context):
+    monkeypatch.setenv("JOB_INDEX_TTL_MS", "0")
+
+    async def scenario():
+        for row in ROWS:
+            await context.state.set(job_index_service.INDEX_GROUP, row[0], row)
+        index = await load_job_index(context.state)
+
+        # Another process updates and removes jobs: not through this index
+        monkeypatch.setattr(job_index_service, "_index", None)
+        job = Job(job_id="j6", role="Data Engineer", description="d", yoe=3, comp="$1")
+        await index_job(context.state, job)
+        await unindex_job(context.state, "j1")
+        monkeypatch.setattr(job_index_service, "_index", index)
+
+        reads_before = context.state.calls.get("get_group", 0)
+        refreshed = await load_job_index(context.state)
+        return index, refreshed, context.state.calls.get("get_group", 0) - reads_before
+
+    index, refreshed, reads = run(scenario())
+    assert refreshed is index
+    assert "j6" in refreshed and "j1" not in refreshed
+    assert refreshed.query(role_prefix="data")["job_ids"] == ["j6"]
+    # Only changelog buckets were read, not the index group
+    assert reads <= 2
+
+
+def test_cold_load_backfills_from_jobs(context):
+    async def scenario():
+        for i in range(3):
+            job = Job(job_id=f"k{i}", role="Engineer", description="d", yoe=i, status="completed")
+            await context.state.set("jobs", job.job_id, job.to_state())
+        return await load_job_index(context.state)
+
+    index = run(scenario())
+    assert len(index) == 3
+    assert sorted(context.state.groups[job_index_service.INDEX_GROUP]) == ["k0", "k1", "k2"]
+    assert job_to_row(Job.from_state(context.state.groups["jobs"]["k1"]))[2] == 1
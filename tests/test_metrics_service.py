@@ -0,0 +1,117 @@
+from conftest import load_step, run
+from models.records import Job
+from services.job_index_service import index_job
+from services.metrics_service import METRICS_GROUP, MetricsRegistry, collect, render_prometheus, series_key
+
+create_step = load_step("jobs/create_job_step.py")
+flusher_step = load_step("jobs/outbox_flusher_step.py")
+metrics_step = load_step("jobs/metrics_step.py")
+
+PENDING = series_key("jobs_by_status", {"status": "pending"})
+COMPLETED = series_key("jobs_by_status", {"status": "completed"})
+
+
+def job_request(i):
+    return {"headers": {}, "body": {
+        "role": f"Engineer {i}",
+        "description": "Builds and operates the data platform; owns pipelines, reviews designs and mentors the wider team on quality.",
+        "yoe": 3
+    }}
+
+
+def sample(body, key):
+    for line in body.splitlines():
+        if line.startswith(key + " "):
+            return float(line.split()[-1])
+    return None
+
+
+def test_first_scrape_does_not_count_new_jobs_twice(context):
+    # One job from before metrics existed: only the index knows about it
+    legacy = Job(job_id="legacy", role="Engineer", description="d", yoe=3, status="completed")
+
+    async def scenario():
+        await context.state.set("jobs", legacy.job_id, legacy.to_state())
+        await index_job(context.state, legacy)
+        for i in range(3):
+            response = await create_step.handler(job_request(i), context)
+            assert response["status"] == 201
+        await flusher_step.handler(context)
+        return await metrics_step.handler({"headers": {}}, context)
+
+    response = run(scenario())
+    assert response["status"] == 200
+    assert sample(response["body"], PENDING) == 3
+    assert sample(response["body"], COMPLETED) == 1
+    assert sample(response["body"], "job_generation_backlog") == 3
+
+
+def test_baseline_is_seeded_once(context):
+    async def scenario():
+        calls = []
+
+        async def loader():
+            calls.append(1)
+            return {"pending": 2}
+
+        await metrics_step.ensure_status_baseline(context.state, loader)
+        await metrics_step.ensure_status_baseline(context.state, loader)
+        return calls, await collect(context.state)
+
+    calls, snapshot = run(scenario())
+    assert len(calls) == 1
+    assert snapshot["gauges"][PENDING] == 2
+    assert "baseline" in context.state.groups[METRICS_GROUP]
+
+
+def test_series_key_sorts_and_escapes_labels():
+    assert series_key("x") == "x"
+    assert series_key("x", {"b": 1, "a": 'say "hi"\n'}) == 'x{a="say \\"hi\\"\\n",b="1"}'
+
+
+def test_registry_flush_merges_into_a_shard(context):
+    registry = MetricsRegistry()
+    registry.inc("gemini_requests_total", model="m")
+    registry.transition(None, "pending")
+    registry.transition("pending", "completed")
+    registry.observe("job_generation_duration_seconds", 0.7, model="m")
+
+    async def scenario():
+        await registry.flush(context.state)
+        registry.inc("gemini_requests_total", 2, model="m")
+        await registry.flush(context.state)
+        return await collect(context.state)
+
+    snapshot = run(scenario())
+    assert registry.is_empty()
+    assert snapshot["counters"][series_key("gemini_requests_total", {"model": "m"})] == 3
+    assert snapshot["gauges"] == {PENDING: 0, COMPLETED: 1}
+    hist = snapshot["histograms"][series_key("job_generation_duration_seconds", {"model": "m"})]
+    assert (hist["buckets"][1], hist["count"], hist["sum"]) == (1, 1, 0.7)
+
+
+def test_render_prometheus_text_format():
+    registry = MetricsRegistry()
+    registry.inc("jobs_created_total", 2)
+    registry.observe("job_generation_duration_seconds", 0.4, model="m")
+    registry.observe("job_generation_duration_seconds", 3.0, model="m")
+    registry.observe("job_generation_duration_seconds", 1000.0, model="m")
+    snapshot = {"counters": registry.counters, "gauges": {PENDING: 4.0}, "histograms": registry.histograms}
+
+    lines = render_prometheus(snapshot, {"job_generation_backlog": 4.0}).splitlines()
+    assert lines[:3] == [
+        "# HELP job_generation_backlog Jobs waiting for the generation step (pending)",
+        "# TYPE job_generation_backlog gauge",
+        "job_generation_backlog 4",
+    ]
+    assert "# TYPE jobs_created_total counter" in lines
+    assert "jobs_created_total 2" in lines
+    assert 'jobs_by_status{status="pending"} 4' in lines
+    assert "# TYPE job_generation_duration_seconds histogram" in lines
+    # Buckets are cumulative and end with +Inf == count
+    assert 'job_generation_duration_seconds_bucket{model="m",le="0.5"} 1' in lines
+    assert 'job_generation_duration_seconds_bucket{model="m",le="5"} 2' in lines
+    assert 'job_generation_duration_seconds_bucket{model="m",le="300"} 2' in lines
+    assert 'job_generation_duration_seconds_bucket{model="m",le="+Inf"} 3' in lines
+    assert 'job_generation_duration_seconds_sum{model="m"} 1003.4' in lines
+    assert 'job_generation_duration_seconds_count{model="m"} 3' in lines
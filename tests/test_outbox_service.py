@@ -0,0 +1,132 @@
+from conftest import load_step, run
+from models.records import Job, now_ms
+from services.fair_queue_service import INFLIGHT_GROUP
+from services.outbox_service import OUTBOX_GROUP, enqueue_job, flush_outbox, get_queued_job
+from services.usage_service import USAGE_GROUP, usage_day, usage_key
+
+generate_step = load_step("jobs/generate_description_step.py")
+
+TOPIC = "generate-job-description"
+
+
+def make_job(job_id="job-1", tenant="acme"):
+    return Job(job_id=job_id, role="Engineer", description="d", yoe=3, tenant=tenant)
+
+
+def event_data(job, **extra):
+    return {"job_id": job.job_id, "role": job.role, "description": job.description, "yoe": job.yoe, **extra}
+
+
+class CrashAfterEmit:
+    """Delivers the event, then fails as if the process died before the outbox delete"""
+
+    def __init__(self):
+        self.events = []
+
+    async def __call__(self, event):
+        self.events.append(event)
+        raise RuntimeError("worker died")
+
+
+def test_flush_publishes_record_event_and_clears_entry(context):
+    job = make_job()
+
+    async def scenario():
+        await enqueue_job(context.state, job, TOPIC, event_data(job), cost=100)
+        assert (await get_queued_job(context.state, job.job_id)).job_id == job.job_id
+        return await flush_outbox(context.state, context.emit)
+
+    result = run(scenario())
+    assert result["published"] == 1 and result["backlog"] == 0
+    assert context.emit.topics() == [TOPIC]
+    assert Job.from_state(context.state.groups["jobs"][job.job_id]).status == "pending"
+    assert job.job_id in context.state.groups[INFLIGHT_GROUP]
+    assert not context.state.groups[OUTBOX_GROUP]
+
+
+def test_deferred_entry_waits_for_not_before(context):
+    job = make_job()
+
+    async def scenario():
+        await enqueue_job(context.state, job, TOPIC, event_data(job), not_before=now_ms() + 60_000)
+        return await flush_outbox(context.state, context.emit)
+
+    result = run(scenario())
+    assert result["published"] == 0 and result["deferred"] == 1
+    assert context.emit.events == []
+    assert "jobs" not in context.state.groups
+
+
+def test_redelivery_never_overwrites_progressed_record(context):
+    job = make_job()
+    crashing = CrashAfterEmit()
+
+    async def scenario():
+        await enqueue_job(context.state, job, TOPIC, event_data(job))
+        first = await flush_outbox(context.state, crashing)
+
+        # The first delivery was picked up before the entry could be deleted
+        stored = Job.from_state(await context.state.get("jobs", job.job_id))
+        stored.touch("processing")
+        await context.state.set("jobs", job.job_id, stored.to_state())
+
+        second = await flush_outbox(context.state, context.emit)
+        return first, second
+
+    first, second = run(scenario())
+    assert first["published"] == 0 and len(first["failed"]) == 1
+    assert len(crashing.events) == 1
+    # Published again: the event is delivered twice, the record is kept
+    assert second["published"] == 1
+    assert context.emit.topics() == [TOPIC]
+    assert Job.from_state(context.state.groups["jobs"][job.job_id]).status == "processing"
+    assert not context.state.groups[OUTBOX_GROUP]
+
+
+def test_duplicate_event_for_finished_job_is_ignored(context):
+    job = make_job()
+    job.status = "completed"
+
+    async def scenario():
+        await context.state.set("jobs", job.job_id, job.to_state())
+        await context.state.set(INFLIGHT_GROUP, job.job_id, {"job_id": job.job_id, "tenant": "acme", "since": now_ms()})
+        await generate_step.handler(event_data(job), context)
+
+    run(scenario())
+    stored = Job.from_state(context.state.groups["jobs"][job.job_id])
+    assert stored.status == "completed"
+    assert stored.updated_at == job.updated_at
+    # The republished entry marked it in flight again; the marker is dropped
+    assert job.job_id not in context.state.groups[INFLIGHT_GROUP]
+
+
+def test_duplicate_event_for_processing_job_keeps_in_flight_marker(context):
+    job = make_job()
+    job.status = "processing"
+
+    async def scenario():
+        await context.state.set("jobs", job.job_id, job.to_state())
+        await context.state.set(INFLIGHT_GROUP, job.job_id, {"job_id": job.job_id, "tenant": "acme", "since": now_ms()})
+        await generate_step.handler(event_data(job), context)
+
+    run(scenario())
+    assert Job.from_state(context.state.groups["jobs"][job.job_id]).status == "processing"
+    assert job.job_id in context.state.groups[INFLIGHT_GROUP]
+
+
+def test_event_for_missing_job_returns_its_reservation(context):
+    job = make_job()
+    day = usage_day()
+    key = usage_key("acme", day)
+
+    async def scenario():
+        await context.state.set(USAGE_GROUP, key, {"tenant": "acme", "day": day, "reserved_tokens": 500})
+        await context.state.set(INFLIGHT_GROUP, job.job_id, {"job_id": job.job_id, "tenant": "acme", "since": now_ms()})
+        await generate_step.handler(
+            event_data(job, tenant="acme", usage_day=day, reserved_tokens=500),
+            context
+        )
+
+    run(scenario())
+    assert context.state.groups[USAGE_GROUP][key]["reserved_tokens"] == 0
+    assert job.job_id not in context.state.groups[INFLIGHT_GROUP]
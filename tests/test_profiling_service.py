@@ -0,0 +1,70 @@
+import asyncio
+import os
+import sys
+
+from conftest import run
+from fake_context import FakeContext
+from services.profiling_service import profiled
+
+
+class RecordingLogger:
+    def __init__(self):
+        self.messages = []
+
+    def info(self, message, data=None):
+        self.messages.append(message)
+
+    warn = error = debug = info
+
+
+def make_handler(monkeypatch, tmp_path, mode):
+    monkeypatch.setenv("PROFILE_ENABLED", "true")
+    monkeypatch.setenv("PROFILE_SAMPLE_RATE", "1")
+    monkeypatch.setenv("PROFILE_MODE", mode)
+    monkeypatch.setenv("PROFILE_DIR", str(tmp_path / "profiles"))
+
+    @profiled("Step")
+    async def handler(context):
+        await asyncio.sleep(0.02)
+        return context.trace_id
+
+    return handler
+
+
+def test_overlapping_invocations_profile_only_one(monkeypatch, tmp_path):
+    handler = make_handler(monkeypatch, tmp_path, "trace")
+    contexts = [FakeContext(logger=RecordingLogger(), trace_id=f"t{i}") for i in range(3)]
+
+    async def scenario():
+        return await asyncio.gather(*(handler(context) for context in contexts))
+
+    assert run(scenario()) == ["t0", "t1", "t2"]
+    assert sys.getprofile() is None
+    assert len(os.listdir(tmp_path / "profiles")) == 1
+    messages = [context.logger.messages for context in contexts]
+    assert messages[0] == ["Profile written"]
+    assert messages[1] == messages[2] == ["Profile skipped, another one is running"]
+
+
+def test_guard_is_released_after_each_profile(monkeypatch, tmp_path):
+    handler = make_handler(monkeypatch, tmp_path, "sample")
+    for i in range(2):
+        run(handler(FakeContext(trace_id=f"t{i}")))
+    assert len(os.listdir(tmp_path / "profiles")) == 2
+
+
+def test_guard_is_released_when_the_handler_fails(monkeypatch, tmp_path):
+    monkeypatch.setenv("PROFILE_ENABLED", "true")
+    monkeypatch.setenv("PROFILE_SAMPLE_RATE", "1")
+    monkeypatch.setenv("PROFILE_DIR", str(tmp_path / "profiles"))
+
+    @profiled("Failing")
+    async def failing(context):
+        raise RuntimeError("boom")
+
+    for _ in range(2):
+        try:
+            run(failing(FakeContext()))
+        except RuntimeError:
+            pass
+    assert len(os.listdir(tmp_path / "profiles")) == 2
@@ -0,0 +1,103 @@
+import pytest
+
+from conftest import load_step, run
+from services.usage_service import (
+    USAGE_GROUP,
+    get_usage,
+    next_day_ms,
+    reserve,
+    settle,
+    tenant_from_request,
+    usage_day,
+    usage_key,
+)
+
+create_step = load_step("jobs/create_job_step.py")
+
+NOON = 1_750_000_000_000 // 86_400_000 * 86_400_000 + 43_200_000
+
+
+def headers(**values):
+    return {"headers": {key.replace("_", "-"): value for key, value in values.items()}}
+
+
+def test_tenant_header_is_used_without_a_key():
+    assert tenant_from_request(headers(x_tenant_id="acme")) == "acme"
+    assert tenant_from_request(headers()) == "default"
+
+
+def test_api_key_wins_over_tenant_header():
+    first = tenant_from_request(headers(x_api_key="secret", x_tenant_id="acme"))
+    second = tenant_from_request(headers(x_api_key="secret", x_tenant_id="fresh-budget"))
+    assert first == second == tenant_from_request(headers(x_api_key="secret"))
+    assert first.startswith("key-") and "secret" not in first
+
+
+def test_api_key_tenants_maps_key_ids(monkeypatch):
+    key_id = tenant_from_request(headers(x_api_key="secret"))
+    monkeypatch.setenv("API_KEY_TENANTS", f"{key_id}=acme,key-other=beta")
+    assert tenant_from_request(headers(x_api_key="secret", x_tenant_id="beta")) == "acme"
+
+
+def test_reserve_without_budget_writes_nothing(context):
+    decision = run(reserve(context.state, "acme", 500, at_ms=NOON))
+    assert decision["allowed"] and decision["reserved"] == 0
+    assert USAGE_GROUP not in context.state.groups
+
+
+def test_reserve_then_settle_replaces_estimate_with_usage(context, monkeypatch):
+    monkeypatch.setenv("TOKEN_BUDGET_DAILY", "1000")
+
+    async def scenario():
+        decision = await reserve(context.state, "acme", 600, at_ms=NOON)
+        reserved = await get_usage(context.state, "acme", decision["day"])
+        await settle(context.state, "acme", decision["day"], decision["reserved"], prompt_tokens=100, output_tokens=300)
+        return decision, reserved, await get_usage(context.state, "acme", decision["day"])
+
+    decision, reserved, settled = run(scenario())
+    assert decision["allowed"] and decision["reserved"] == 600
+    assert reserved["reserved_tokens"] == 600
+    assert settled["reserved_tokens"] == 0
+    assert (settled["prompt_tokens"], settled["output_tokens"], settled["jobs"]) == (100, 300, 1)
+
+
+@pytest.mark.parametrize("mode, allowed, not_before", [
+    ("reject", False, None),
+    ("queue", True, next_day_ms(NOON)),
+])
+def test_over_budget_job(context, monkeypatch, mode, allowed, not_before):
+    monkeypatch.setenv("TOKEN_BUDGET_DAILY", "1000")
+    monkeypatch.setenv("TOKEN_BUDGET_MODE", mode)
+
+    async def scenario():
+        await reserve(context.state, "acme", 800, at_ms=NOON)
+        return await reserve(context.state, "acme", 800, at_ms=NOON)
+
+    decision = run(scenario())
+    assert decision["allowed"] is allowed
+    assert decision["not_before"] == not_before
+    if allowed:
+        assert decision["day"] == usage_day(not_before)
+    else:
+        assert decision["retry_after_s"] == 43_200
+        assert context.state.groups[USAGE_GROUP][usage_key("acme", usage_day(NOON))]["rejected"] == 1
+
+
+def test_failed_enqueue_releases_the_reservation(context, monkeypatch):
+    monkeypatch.setenv("TOKEN_BUDGET_DAILY", "100000")
+
+    async def broken_enqueue(*args, **kwargs):
+        raise RuntimeError("state unavailable")
+
+    monkeypatch.setattr(create_step, "enqueue_job", broken_enqueue)
+    request = {"headers": {"x-tenant-id": "acme"}, "body": {
+        "role": "Engineer",
+        "description": "Builds and operates the data platform; owns pipelines, reviews designs and mentors the wider team on quality.",
+        "yoe": 3
+    }}
+
+    response = run(create_step.handler(request, context))
+    assert response["status"] == 400
+    record = context.state.groups[USAGE_GROUP][usage_key("acme", usage_day())]
+    assert record["reserved_tokens"] == 0
+    assert record["jobs"] == 0